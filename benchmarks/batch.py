@@ -0,0 +1,47 @@
+"""Compare the batch property tools with one call per path.
+
+Properties of the same files are fetched from the in-memory fake, which
+answers after a fixed latency: first with one get_file_properties call
+at a time, then with get_file_properties_batch at several concurrencies.
+
+    python benchmarks/batch.py
+"""
+
+import argparse
+import asyncio
+import time
+
+from local import FakeADLS, local_client, serve
+
+
+async def main(args) -> None:
+    fake = FakeADLS(latency=args.latency_ms / 1000)
+    paths = [f"d/f{index}.txt" for index in range(args.files)]
+    for path in paths:
+        fake.add_file("fs", path, b"x")
+
+    async with serve(fake) as url, local_client(url) as (client, _):
+        started = time.perf_counter()
+        for path in paths:
+            await client.get_file_properties("fs", path, use_cache=False)
+        elapsed = time.perf_counter() - started
+        print(f"one at a time: {len(paths) / elapsed:8.0f} paths/s")
+
+        for max_concurrency in args.concurrency:
+            fake.peak = 0
+            started = time.perf_counter()
+            items = await client.get_file_properties_batch("fs", paths, max_concurrency, use_cache=False)
+            elapsed = time.perf_counter() - started
+            errors = sum(1 for item in items if item.error)
+            print(
+                f"batch x{max_concurrency:<4}   {len(paths) / elapsed:8.0f} paths/s, "
+                f"peak {fake.peak} in flight, {errors} errors"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Latency of each request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64])
+    asyncio.run(main(parser.parse_args()))
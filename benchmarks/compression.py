@@ -0,0 +1,110 @@
+"""Compression ratio against transfer time for sample corpora.
+
+Each corpus (CSV rows, JSON log lines, random bytes) is uploaded to and
+downloaded from the in-memory fake with every codec and level, and the
+ratio, single-threaded compression speed and transfer times are printed.
+With --link-mbps the fake paces request and response bodies at that
+rate, to model a network link slower than loopback.
+
+    python benchmarks/compression.py --link-mbps 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+from local import FakeADLS, local_client, serve
+
+from adls2_mcp_server.compression import compress_member
+
+CODECS = [(None, None), ("gzip", 1), ("gzip", 6), ("gzip", 9), ("zstd", 1), ("zstd", 3), ("zstd", 9), ("zstd", 19)]
+
+
+def corpora(scale: float):
+    rnd = random.Random(3)
+    rows = int(1_500_000 * scale)
+    yield "csv", "".join(
+        f"2024-01-{1 + index % 28:02d},id{index:09d},{rnd.random() * 1000:.3f},cat_{index % 7},"
+        f"{'' if index % 10 == 0 else 'x'}\n"
+        for index in range(rows)
+    ).encode()
+
+    lines = []
+    for index in range(int(400_000 * scale)):
+        lines.append(json.dumps({
+            "ts": f"2024-05-01T12:{index // 60 % 60:02d}:{index % 60:02d}.{index % 1000:03d}Z",
+            "level": rnd.choice(["INFO", "INFO", "INFO", "WARN", "ERROR", "DEBUG"]),
+            "service": rnd.choice(["api", "worker", "scheduler"]),
+            "request_id": f"{rnd.getrandbits(64):016x}",
+            "latency_ms": round(rnd.expovariate(1 / 40), 2),
+            "path": rnd.choice(["/v1/items", "/v1/users", "/health", "/v1/orders/{id}"]),
+            "msg": rnd.choice(["request completed", "cache miss", "retrying upstream call", "user not found"]),
+        }))
+    yield "jsonl-logs", ("\n".join(lines) + "\n").encode()
+
+    yield "random", os.urandom(int(32 * 1024 * 1024 * scale))
+
+
+def pace(fake: FakeADLS, rate: float) -> None:
+    """Delay append request bodies and GET response bodies as if sent at rate bytes/s."""
+    dispatch = fake._dispatch
+
+    async def paced(request):
+        if request.method == "PATCH" and request.query.get("action") == "append":
+            await asyncio.sleep(len(await request.read()) / rate)
+        response = await dispatch(request)
+        if request.method == "GET" and response.body is not None:
+            await asyncio.sleep(len(response.body) / rate)
+        return response
+
+    fake._dispatch = paced
+
+
+def compression_speed(encoding: str, level: int, data: bytes) -> float:
+    sample = data[:8 * 1024 * 1024]
+    started = time.perf_counter()
+    compress_member(encoding, level, sample)
+    return len(sample) / (time.perf_counter() - started) / 1e6
+
+
+async def main(args) -> None:
+    fake = FakeADLS()
+    if args.link_mbps:
+        pace(fake, args.link_mbps * 1e6)
+    link = f"{args.link_mbps:.0f} MB/s simulated" if args.link_mbps else "loopback"
+    print(f"link: {link}")
+
+    async with serve(fake) as url, local_client(url) as (client, root):
+        for name, data in corpora(args.scale):
+            (root / name).write_bytes(data)
+            print(f"\n{name}: {len(data) / 1e6:.1f} MB")
+            print(f"  {'codec':8} {'ratio':>6} {'stored MB':>9} {'1-thread MB/s':>13} {'upload s':>8} {'download s':>10}")
+            for encoding, level in CODECS:
+                destination = f"{encoding}{level}/{name}"
+                started = time.perf_counter()
+                uploaded = await client.upload_file(
+                    name, "fs", destination, compression=encoding, compression_level=level
+                )
+                upload = time.perf_counter() - started
+
+                started = time.perf_counter()
+                downloaded = await client.download_file("fs", destination, f"{encoding}{level}-{name}")
+                download = time.perf_counter() - started
+                assert uploaded and downloaded
+                assert (root / f"{encoding}{level}-{name}").read_bytes() == data
+
+                stored = len(fake.filesystems["fs"][destination].data)
+                speed = f"{compression_speed(encoding, level, data):13.0f}" if encoding else f"{'-':>13}"
+                label = f"{encoding}-{level}" if encoding else "none"
+                print(f"  {label:8} {len(data) / stored:6.2f} {stored / 1e6:9.1f} {speed} {upload:8.2f} {download:10.2f}")
+                (root / f"{encoding}{level}-{name}").unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--link-mbps", type=float, default=0.0, help="Simulated link rate in MB/s; 0 for loopback")
+    parser.add_argument("--scale", type=float, default=1.0, help="Corpus size relative to about 50 MB of CSV")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,37 @@
+"""Helpers pointing ADLS2Client at the in-memory fake from the tests."""
+
+import os
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests"))
+
+from fake_adls import FakeADLS, serve, server_ssl_context  # noqa: E402
+
+from adls2_mcp_server import client as client_module  # noqa: E402
+
+__all__ = ["FakeADLS", "serve", "server_ssl_context", "local_client"]
+
+
+@asynccontextmanager
+async def local_client(url: str, **config):
+    """Yield an ADLS2Client sending its requests to url.
+
+    UPLOAD_ROOT and DOWNLOAD_ROOT are set to a temporary directory, which
+    is also yielded.
+    """
+    service_client = client_module.DataLakeServiceClient
+    with tempfile.TemporaryDirectory() as root:
+        os.environ["UPLOAD_ROOT"] = os.environ["DOWNLOAD_ROOT"] = root
+        client_module.DataLakeServiceClient = lambda account_url, **kwargs: service_client(url, **kwargs)
+        config.setdefault("read_only", False)
+        client = client_module.ADLS2Client(
+            client_module.ADLS2Config(storage_account_name="fake", storage_account_key="a2V5", **config)
+        )
+        try:
+            yield client, Path(root)
+        finally:
+            client_module.DataLakeServiceClient = service_client
+            await client.close()
@@ -0,0 +1,64 @@
+"""Request latency through the stock and the pooled transport over TLS.
+
+The in-memory fake is served over HTTPS with a throwaway self-signed
+certificate. Bursts of concurrent get_file_properties requests are sent
+through azure-core's AioHttpTransport and through PooledAioHttpTransport
+with the server's defaults, and the p50 and p99 latencies are printed.
+
+    python benchmarks/transport.py
+"""
+
+import argparse
+import asyncio
+import time
+
+from azure.core.credentials import AzureNamedKeyCredential
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.filedatalake.aio import DataLakeServiceClient
+
+from local import FakeADLS, serve, server_ssl_context
+from adls2_mcp_server.transport import PooledAioHttpTransport
+
+
+async def measure(url: str, transport, args) -> list:
+    latencies = []
+    credential = AzureNamedKeyCredential("fake", "a2V5")
+    async with DataLakeServiceClient(url, credential=credential, transport=transport) as service_client:
+        file_system_client = service_client.get_file_system_client("fs")
+
+        async def one(index: int) -> None:
+            started = time.perf_counter()
+            await file_system_client.get_file_client(f"d/f{index % args.files}").get_file_properties()
+            latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one(index) for index in range(args.burst)))
+        latencies.clear()
+        for _ in range(args.bursts):
+            await asyncio.gather(*(one(index) for index in range(args.burst)))
+            await asyncio.sleep(args.pause_ms / 1000)
+    return sorted(latencies)
+
+
+async def main(args) -> None:
+    fake = FakeADLS()
+    for index in range(args.files):
+        fake.add_file("fs", f"d/f{index}", b"x")
+    transports = {
+        "AioHttpTransport": lambda: AioHttpTransport(connection_verify=False),
+        "PooledAioHttpTransport": lambda: PooledAioHttpTransport(connection_verify=False),
+    }
+    async with serve(fake, server_ssl_context()) as url:
+        for name, create in transports.items():
+            latencies = await measure(url, create(), args)
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(f"{name:24} {len(latencies)} requests, p50 {p50:6.2f} ms, p99 {p99:6.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=64, help="Requests sent together")
+    parser.add_argument("--bursts", type=int, default=40)
+    parser.add_argument("--pause-ms", type=float, default=20.0, help="Pause between bursts")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,127 @@
+"""Compare walk_tree with a single recursive listing on a synthetic tree.
+
+A local HTTP server plays the Data Lake list paths API over a
+year/month/day/hour hierarchy of about 100,000 paths, charging a fixed
+cost per request plus a cost per returned entry. The tree is listed once
+through one recursive get_paths iterator, and then with walk_tree at
+several concurrencies.
+
+    python benchmarks/walk_tree.py
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Tuple
+
+from aiohttp import web
+from azure.storage.filedatalake.aio import FileSystemClient
+
+from adls2_mcp_server.listing import walk_tree
+
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+def build_tree(years: int) -> Dict[str, List[Tuple[str, bool]]]:
+    """Children of each directory: years x 12 months x 28 days x 8 hours, 8 files an hour."""
+    children: Dict[str, List[Tuple[str, bool]]] = {}
+    for year in range(2020, 2020 + years):
+        year_path = f"raw/{year}"
+        children.setdefault("raw", []).append((year_path, True))
+        for month in range(1, 13):
+            month_path = f"{year_path}/{month:02}"
+            children.setdefault(year_path, []).append((month_path, True))
+            for day in range(1, 29):
+                day_path = f"{month_path}/{day:02}"
+                children.setdefault(month_path, []).append((day_path, True))
+                for hour in range(8):
+                    hour_path = f"{day_path}/{hour:02}"
+                    children.setdefault(day_path, []).append((hour_path, True))
+                    children[hour_path] = [(f"{hour_path}/part-{part}.parquet", False) for part in range(8)]
+    return children
+
+
+class ListPathsServer:
+    """Serves list paths requests in pre-order, with a simulated service cost."""
+
+    def __init__(self, children, request_cost: float, entry_cost: float):
+        self.children = children
+        self.request_cost = request_cost
+        self.entry_cost = entry_cost
+        self.requests = 0
+        self._listings: Dict[Tuple[str, bool], List[Tuple[str, bool]]] = {}
+
+    def _preorder(self, path: str):
+        for name, is_directory in self.children.get(path, []):
+            yield name, is_directory
+            if is_directory:
+                yield from self._preorder(name)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        directory = request.query["directory"].strip("/")
+        recursive = request.query.get("recursive") == "true"
+        key = (directory, recursive)
+        if key not in self._listings:
+            self._listings[key] = list(self._preorder(directory)) if recursive else self.children.get(directory, [])
+        listing = self._listings[key]
+
+        start = int(request.query.get("continuation") or 0)
+        end = start + int(request.query.get("maxResults", 5000))
+        page = listing[start:end]
+        await asyncio.sleep(self.request_cost + self.entry_cost * len(page))
+        headers = {"x-ms-continuation": str(end)} if end < len(listing) else {}
+        body = {
+            "paths": [
+                {
+                    "name": name,
+                    "isDirectory": "true" if is_directory else "false",
+                    "contentLength": "10",
+                    "lastModified": LAST_MODIFIED,
+                    "etag": "0x1",
+                }
+                for name, is_directory in page
+            ]
+        }
+        return web.Response(text=json.dumps(body), content_type="application/json", headers=headers)
+
+
+async def main(args) -> None:
+    server = ListPathsServer(build_tree(args.years), args.request_ms / 1000, args.entry_us / 1e6)
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+
+    async with FileSystemClient(f"http://{host}:{port}", "fs") as file_system_client:
+        server.requests = 0
+        started = time.perf_counter()
+        serial = [path.name async for path in file_system_client.get_paths(path="raw", recursive=True)]
+        elapsed = time.perf_counter() - started
+        print(f"single iterator:      {len(serial)} paths in {elapsed:6.2f}s, {server.requests} requests")
+
+        for max_concurrency in args.concurrency:
+            server.requests = 0
+            started = time.perf_counter()
+            entries = await walk_tree(file_system_client, "raw", max_concurrency, args.fanout_depth)
+            elapsed = time.perf_counter() - started
+            same = "same order" if [entry.name for entry in entries] == serial else "DIFFERENT"
+            print(
+                f"walk_tree x{max_concurrency:<3}        {len(entries)} paths in {elapsed:6.2f}s, "
+                f"{server.requests} requests, {same}"
+            )
+
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--years", type=int, default=4, help="Years in the tree, about 24,000 paths each")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 16])
+    parser.add_argument("--fanout-depth", type=int, default=2)
+    parser.add_argument("--request-ms", type=float, default=15.0, help="Simulated cost of each request")
+    parser.add_argument("--entry-us", type=float, default=40.0, help="Simulated cost of each returned entry")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,56 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional
+
+# Default number of per-path requests a batch keeps in flight
+DEFAULT_BATCH_CONCURRENCY = 16
+
+# Largest number of paths accepted in a single batch call
+MAX_BATCH_SIZE = 5000
+
+
+@dataclass
+class BatchItem:
+    """Outcome of one path in a batch operation."""
+    path: str
+    value: Any = None
+    error: str = ""
+
+
+async def run_batch(
+    paths: List[str],
+    operation: Callable[[str], Awaitable[Any]],
+    max_concurrency: Optional[int] = None,
+) -> List[BatchItem]:
+    """Run an operation for every path with bounded concurrency.
+
+    A failure of one path is recorded on its item and does not affect the
+    others. Results are returned in the order of paths.
+
+    Args:
+        paths: Paths to run the operation for
+        operation: Coroutine function called with each path
+        max_concurrency: Maximum number of operations in flight. Defaults to 16.
+
+    Returns:
+        List[BatchItem]: One item per path
+
+    Raises:
+        ValueError: If the batch is too large or max_concurrency is invalid
+    """
+    max_concurrency = max_concurrency or DEFAULT_BATCH_CONCURRENCY
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    if len(paths) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch can contain at most {MAX_BATCH_SIZE} paths")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(path: str) -> BatchItem:
+        async with semaphore:
+            try:
+                return BatchItem(path=path, value=await operation(path))
+            except Exception as e:
+                return BatchItem(path=path, error=str(e) or type(e).__name__)
+
+    return await asyncio.gather(*(run(path) for path in paths))
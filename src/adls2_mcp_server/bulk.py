@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from azure.core.exceptions import ResourceNotFoundError
+
+from adls2_mcp_server.transfer import _ChunkPool
+
+logger = logging.getLogger(__name__)
+
+# Default number of blob operations in flight for per-blob directory operations
+DEFAULT_BULK_CONCURRENCY = 32
+
+# Minimum number of seconds between two progress reports
+PROGRESS_INTERVAL = 0.5
+
+# Seconds between polls of a pending blob copy
+COPY_POLL_INTERVAL = 0.5
+
+# Called with the entries processed so far, the total if known, and the elapsed seconds
+ProgressCallback = Callable[[int, Optional[int], float], Awaitable[None]]
+
+
+class ProgressTracker:
+    """Counts processed entries and reports them at a bounded rate."""
+
+    def __init__(self, callback: Optional[ProgressCallback] = None):
+        self._callback = callback
+        self._started_at = time.monotonic()
+        self._reported_at = 0.0
+        self._reported: Optional[tuple] = None
+        self.processed = 0
+        self.total: Optional[int] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the tracker was created."""
+        return time.monotonic() - self._started_at
+
+    async def advance(self, count: int = 1) -> None:
+        """Count processed entries and report if the last report is old enough."""
+        self.processed += count
+        await self.report(force=False)
+
+    async def report(self, force: bool = True) -> None:
+        """Send a progress report. Failures to report are logged and ignored."""
+        if self._callback is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._reported_at < PROGRESS_INTERVAL:
+            return
+        if (self.processed, self.total) == self._reported:
+            return
+        self._reported_at = now
+        self._reported = (self.processed, self.total)
+        try:
+            await self._callback(self.processed, self.total, self.elapsed)
+        except Exception as e:
+            logger.debug(f"Error reporting progress: {e}")
+
+
+async def delete_blobs(container_client, directory: str, max_concurrency: int, tracker: ProgressTracker) -> int:
+    """Delete a directory on a flat namespace account blob by blob.
+
+    The blobs under the directory are deleted concurrently while they are
+    listed. The directory's own marker blob goes last, so an interrupted
+    delete leaves the directory in place and can simply be retried.
+
+    Args:
+        container_client: Async ContainerClient of the filesystem
+        directory: Path of the directory to delete
+        max_concurrency: Maximum number of deletes in flight
+        tracker: Progress tracker for the operation
+
+    Returns:
+        int: Number of blobs deleted
+
+    Raises:
+        ResourceNotFoundError: If nothing exists at or under the directory
+    """
+    directory = directory.strip("/")
+
+    async def delete(name: str) -> None:
+        try:
+            await container_client.delete_blob(name, delete_snapshots="include")
+        except ResourceNotFoundError:
+            pass
+        await tracker.advance()
+
+    async with _ChunkPool(max_concurrency) as pool:
+        async for blob in container_client.list_blobs(name_starts_with=directory + "/"):
+            await pool.acquire()
+            pool.start(delete(blob.name))
+    tracker.total = pool.started + 1
+
+    try:
+        await container_client.delete_blob(directory, delete_snapshots="include")
+    except ResourceNotFoundError:
+        # A directory made only of blob name prefixes has no marker blob
+        if not pool.started:
+            raise
+        tracker.total = pool.started
+    else:
+        await tracker.advance()
+    await tracker.report()
+    return tracker.processed
+
+
+async def _copy_blob(container_client, source: str, destination: str) -> None:
+    """Copy a blob within the container and wait for the copy to finish."""
+    target = container_client.get_blob_client(destination)
+    copy = await target.start_copy_from_url(container_client.get_blob_client(source).url)
+    status = copy.get("copy_status")
+    while status == "pending":
+        await asyncio.sleep(COPY_POLL_INTERVAL)
+        status = (await target.get_blob_properties()).copy.status
+    if status != "success":
+        raise RuntimeError(f"Copy of {source} to {destination} ended with status {status}")
+
+
+async def move_blobs(
+    container_client,
+    source: str,
+    destination: str,
+    max_concurrency: int,
+    tracker: ProgressTracker,
+) -> int:
+    """Rename a directory on a flat namespace account blob by blob.
+
+    Each blob under the source is copied to the destination and then
+    deleted, concurrently while the source is listed. The source's marker
+    blob is moved last, so an interrupted rename leaves the source in place
+    with the blobs not yet moved, and can simply be retried.
+
+    Args:
+        container_client: Async ContainerClient of the filesystem
+        source: Current path of the directory
+        destination: New path for the directory
+        max_concurrency: Maximum number of blob moves in flight
+        tracker: Progress tracker for the operation
+
+    Returns:
+        int: Number of blobs moved
+
+    Raises:
+        ResourceNotFoundError: If nothing exists at or under the source
+        ValueError: If the destination is the source or inside it
+    """
+    source = source.strip("/")
+    destination = destination.strip("/")
+    if destination == source or destination.startswith(source + "/"):
+        # The moved blobs would be listed again under the source
+        raise ValueError(f"Cannot move directory {source} into itself")
+
+    async def move(name: str) -> None:
+        await _copy_blob(container_client, name, destination + name[len(source):])
+        try:
+            await container_client.delete_blob(name, delete_snapshots="include")
+        except ResourceNotFoundError:
+            pass
+        await tracker.advance()
+
+    async with _ChunkPool(max_concurrency) as pool:
+        async for blob in container_client.list_blobs(name_starts_with=source + "/"):
+            await pool.acquire()
+            pool.start(move(blob.name))
+    tracker.total = pool.started + 1
+
+    try:
+        await move(source)
+    except ResourceNotFoundError:
+        if not pool.started:
+            raise
+        tracker.total = pool.started
+    await tracker.report()
+    return tracker.processed
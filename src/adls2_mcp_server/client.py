@@ -1,14 +1,93 @@
+import asyncio
 import logging
 import os
-from dataclasses import dataclass
-from typing import List, Optional, Dict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Dict
 from pathlib import Path
 import json
 
-from azure.identity import DefaultAzureCredential
-from azure.storage.filedatalake import DataLakeServiceClient
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceModifiedError, ResourceNotFoundError
+from azure.storage.blob.aio import BlobServiceClient
+from azure.storage.filedatalake.aio import DataLakeServiceClient
 from dotenv import load_dotenv
 
+from adls2_mcp_server.batch import BatchItem, run_batch
+from adls2_mcp_server.bulk import (
+    DEFAULT_BULK_CONCURRENCY,
+    ProgressCallback,
+    ProgressTracker,
+    delete_blobs,
+    move_blobs,
+)
+from adls2_mcp_server.cache import TTLCache
+from adls2_mcp_server.compression import resolve_compression
+from adls2_mcp_server.credentials import STORAGE_SCOPE, create_credential
+from adls2_mcp_server.hashing import MD5, IntegrityError, resolve_hashes
+from adls2_mcp_server.listing import (
+    DEFAULT_LIST_CONCURRENCY,
+    ListingCache,
+    PathEntry,
+    PathFilter,
+    PathListing,
+    walk_tree,
+)
+from adls2_mcp_server.parquet import DEFAULT_MAX_FOOTER_SIZE, DEFAULT_MAX_ROW_GROUPS, describe, read_metadata
+from adls2_mcp_server.ranged import (
+    DEFAULT_READ_LIMIT,
+    DEFAULT_READ_MAX_SCAN_BYTES,
+    RangeRead,
+    RangeReader,
+    resolve_read_options,
+)
+from adls2_mcp_server.scan import (
+    DEFAULT_SCAN_LIMIT,
+    DEFAULT_SCAN_MAX_BYTES,
+    DEFAULT_SCAN_MAX_ROWS,
+    DEFAULT_TOP_K,
+    FileScanner,
+    resolve_format,
+    scan,
+)
+from adls2_mcp_server.scheduler import (
+    DEFAULT_MAX_BANDWIDTH,
+    DEFAULT_MAX_FILES,
+    DEFAULT_MAX_INFLIGHT_BYTES,
+    TransferJob,
+    TransferReport,
+    TransferScheduler,
+)
+from adls2_mcp_server.sync import MANIFEST_NAME, SyncManifest, plan_sync
+from adls2_mcp_server.throttle import (
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_RETRY_BACKOFF,
+    DEFAULT_RETRY_BACKOFF_MAX,
+    DEFAULT_RETRY_TOTAL,
+    AdaptiveConcurrency,
+    RequestStats,
+    ThrottledTransport,
+    ThrottlingRetryPolicy,
+)
+from adls2_mcp_server.transport import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_POOL_SIZE_PER_HOST,
+    DEFAULT_READ_TIMEOUT,
+    PooledAioHttpTransport,
+    SharedTransport,
+)
+from adls2_mcp_server.transfer import (
+    JOURNAL_SUFFIX,
+    PARTIAL_SUFFIX,
+    TransferLimiter,
+    TransferResult,
+    download_chunked,
+    resolve_transfer_options,
+    upload_chunked,
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -17,6 +96,32 @@ class ADLS2Config:
     storage_account_name: str
     read_only: bool = True
     storage_account_key: Optional[str] = None
+    storage_accounts: List[str] = field(default_factory=list)
+    account_idle_timeout: float = 900.0
+    credential_type: Optional[str] = None
+    token_cache_persistence: bool = True
+    token_cache_allow_unencrypted: bool = False
+    metadata_cache_ttl: float = 30.0
+    metadata_cache_size: int = 4096
+    listing_cache_ttl: float = 60.0
+    listing_cache_max_entries: int = 200_000
+    transfer_max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES
+    transfer_max_bandwidth: float = DEFAULT_MAX_BANDWIDTH
+    http_pool_size: int = DEFAULT_POOL_SIZE
+    http_pool_size_per_host: int = DEFAULT_POOL_SIZE_PER_HOST
+    http_keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT
+    http_connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+    http_read_timeout: float = DEFAULT_READ_TIMEOUT
+    path_client_cache_size: int = 1024
+    retry_total: int = DEFAULT_RETRY_TOTAL
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF
+    retry_backoff_max: float = DEFAULT_RETRY_BACKOFF_MAX
+    max_requests_per_account: int = DEFAULT_MAX_REQUESTS
+    read_max_bytes: int = DEFAULT_READ_LIMIT
+    read_max_scan_bytes: int = DEFAULT_READ_MAX_SCAN_BYTES
+    parquet_cache_size: int = 64
+    parquet_max_footer_bytes: int = DEFAULT_MAX_FOOTER_SIZE
+    scan_max_bytes: int = DEFAULT_SCAN_LIMIT
 
     @classmethod
     def from_env(cls) -> "ADLS2Config":
@@ -30,26 +135,167 @@ class ADLS2Config:
         return cls(
             storage_account_name=storage_account_name,
             storage_account_key=os.environ.get("AZURE_STORAGE_ACCOUNT_KEY"),
-            read_only=os.environ.get("READ_ONLY_MODE", "true").lower() == "true"
+            storage_accounts=[
+                account.strip().lower()
+                for account in os.environ.get("AZURE_STORAGE_ACCOUNTS", "").split(",")
+                if account.strip()
+            ],
+            account_idle_timeout=float(os.environ.get("ACCOUNT_IDLE_TIMEOUT", cls.account_idle_timeout)),
+            credential_type=os.environ.get("AZURE_CREDENTIAL_TYPE") or None,
+            token_cache_persistence=os.environ.get("AZURE_TOKEN_CACHE_PERSISTENCE", "true").lower() == "true",
+            token_cache_allow_unencrypted=os.environ.get("AZURE_TOKEN_CACHE_ALLOW_UNENCRYPTED", "false").lower() == "true",
+            read_only=os.environ.get("READ_ONLY_MODE", "true").lower() == "true",
+            metadata_cache_ttl=float(os.environ.get("METADATA_CACHE_TTL", cls.metadata_cache_ttl)),
+            metadata_cache_size=int(os.environ.get("METADATA_CACHE_SIZE", cls.metadata_cache_size)),
+            listing_cache_ttl=float(os.environ.get("LISTING_CACHE_TTL", cls.listing_cache_ttl)),
+            listing_cache_max_entries=int(os.environ.get("LISTING_CACHE_MAX_ENTRIES", cls.listing_cache_max_entries)),
+            transfer_max_inflight_bytes=int(
+                os.environ.get("TRANSFER_MAX_INFLIGHT_BYTES", cls.transfer_max_inflight_bytes)
+            ),
+            transfer_max_bandwidth=float(os.environ.get("TRANSFER_MAX_BANDWIDTH", cls.transfer_max_bandwidth)),
+            http_pool_size=int(os.environ.get("HTTP_POOL_SIZE", cls.http_pool_size)),
+            http_pool_size_per_host=int(os.environ.get("HTTP_POOL_SIZE_PER_HOST", cls.http_pool_size_per_host)),
+            http_keepalive_timeout=float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", cls.http_keepalive_timeout)),
+            http_connect_timeout=float(os.environ.get("HTTP_CONNECT_TIMEOUT", cls.http_connect_timeout)),
+            http_read_timeout=float(os.environ.get("HTTP_READ_TIMEOUT", cls.http_read_timeout)),
+            path_client_cache_size=int(os.environ.get("PATH_CLIENT_CACHE_SIZE", cls.path_client_cache_size)),
+            retry_total=int(os.environ.get("RETRY_TOTAL", cls.retry_total)),
+            retry_backoff=float(os.environ.get("RETRY_BACKOFF", cls.retry_backoff)),
+            retry_backoff_max=float(os.environ.get("RETRY_BACKOFF_MAX", cls.retry_backoff_max)),
+            max_requests_per_account=int(os.environ.get("MAX_REQUESTS_PER_ACCOUNT", cls.max_requests_per_account)),
+            read_max_bytes=int(os.environ.get("READ_MAX_BYTES", cls.read_max_bytes)),
+            read_max_scan_bytes=int(os.environ.get("READ_MAX_SCAN_BYTES", cls.read_max_scan_bytes)),
+            parquet_cache_size=int(os.environ.get("PARQUET_CACHE_SIZE", cls.parquet_cache_size)),
+            parquet_max_footer_bytes=int(os.environ.get("PARQUET_MAX_FOOTER_BYTES", cls.parquet_max_footer_bytes)),
+            scan_max_bytes=int(os.environ.get("SCAN_MAX_BYTES", cls.scan_max_bytes)),
         )
 
+def create_transport(config: ADLS2Config) -> PooledAioHttpTransport:
+    """Create an HTTP transport sized by the HTTP_* settings of a configuration."""
+    return PooledAioHttpTransport(
+        pool_size=config.http_pool_size,
+        pool_size_per_host=config.http_pool_size_per_host,
+        keepalive_timeout=config.http_keepalive_timeout,
+        connect_timeout=config.http_connect_timeout,
+        read_timeout=config.http_read_timeout,
+    )
+
+def _format_properties(file_path: str, properties) -> Dict[str, str]:
+    """Flatten FileProperties into the string dict returned by the tools."""
+    return {
+        "name": file_path,
+        "size": str(properties.size),
+        "creation_time": properties.creation_time.isoformat() if properties.creation_time else "",
+        "last_modified": properties.last_modified.isoformat() if properties.last_modified else "",
+        "content_type": properties.content_settings.content_type if properties.content_settings else "",
+        "etag": properties.etag if properties.etag else ""
+    }
+
+def _local_md5(result: TransferResult) -> Optional[bytes]:
+    """The MD5 of the local side of a transfer, if the transfer computed it."""
+    if result.encoding or MD5 not in result.digests:
+        return None
+    return bytes.fromhex(result.digests[MD5])
+
+
+def _within(root: Path, path: Path) -> Optional[Path]:
+    """The resolved path, or None if it lies outside root.
+
+    Resolving collapses .. segments and follows symlinks, so neither leads
+    out of root, and is_relative_to compares whole path components, so a
+    sibling such as /data2 is not inside /data.
+    """
+    resolved = path.resolve()
+    return resolved if resolved.is_relative_to(root.resolve()) else None
+
+
+def _local_tree(source_path: Path, destination: str):
+    """Collect the upload jobs and empty directories under a local directory.
+
+    Transfer journals, partial downloads and sync manifests are skipped, and
+    so are symlinks to files outside the directory.
+    """
+    jobs = []
+    empty_directories = []
+    for root, dirs, files in os.walk(source_path):
+        relative = Path(root).relative_to(source_path).as_posix()
+        remote_root = "/".join(part for part in (destination, relative) if part and part != ".")
+        names = [
+            name for name in files
+            if not name.endswith((JOURNAL_SUFFIX, JOURNAL_SUFFIX + ".tmp", PARTIAL_SUFFIX))
+            and name not in (MANIFEST_NAME, MANIFEST_NAME + ".tmp")
+        ]
+        if not names and not dirs and remote_root:
+            empty_directories.append(remote_root)
+        for name in names:
+            local_path = Path(root) / name
+            if _within(source_path, local_path) is None:
+                logger.warning(f"Skipping {local_path}: it resolves outside {source_path}")
+                continue
+            stat = local_path.stat()
+            jobs.append(TransferJob(
+                local_path=local_path,
+                remote_path=f"{remote_root}/{name}" if remote_root else name,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            ))
+    return jobs, empty_directories
+
 class ADLS2Client:
     """Azure Data Lake Storage Gen2 client wrapper"""
 
-    def __init__(self, config: Optional[ADLS2Config] = None):
+    def __init__(
+        self,
+        config: Optional[ADLS2Config] = None,
+        credential=None,
+        transport=None,
+        transfer_limiter: Optional[TransferLimiter] = None,
+    ):
         """ Initialize the ADLS2 client.
 
         Args:
             config: ADLS2Config instance. If None, loads from environment
+            credential: Credential to use instead of creating one. It is
+                not closed with the client.
+            transport: Transport shared with other clients. It is not
+                closed with the client.
+            transfer_limiter: Limiter shared with other clients' transfers
         """
         self._config = config or ADLS2Config.from_env()
 
         # Initialize the client
-        self.client = self._create_client()
+        self._credential = credential
+        self._owns_credential = credential is None
+        self._request_stats = RequestStats()
+        self._request_concurrency = AdaptiveConcurrency(self._config.max_requests_per_account)
+        self.client = self._create_client(transport)
         self._read_only = self._config.read_only
         self.upload_root = os.getenv("UPLOAD_ROOT", "./uploads")
         self.download_root = os.getenv("DOWNLOAD_ROOT", "./downloads")
 
+        # File properties cache, keyed by (filesystem, path)
+        self._properties_cache = TTLCache(self._config.metadata_cache_size, self._config.metadata_cache_ttl)
+
+        # Full directory listings, patched in place by this client's writes
+        self._listing_cache = ListingCache(self._config.listing_cache_max_entries, self._config.listing_cache_ttl)
+        self._refresh_tasks: Dict[tuple, asyncio.Task] = {}
+
+        # Decoded Parquet footers, keyed by (filesystem, path, etag)
+        self._parquet_cache = TTLCache(self._config.parquet_cache_size)
+
+        # Sub-clients are cheap to keep and comparatively costly to build per call
+        self._file_system_clients: Dict[str, object] = {}
+        self._path_clients = TTLCache(self._config.path_client_cache_size)
+
+        # Looked up on first use by directory operations
+        self._hns_enabled: Optional[bool] = None
+        self._blob_service_client: Optional[BlobServiceClient] = None
+
+        # Shared by every transfer so the caps hold across concurrent tool calls
+        self._transfer_limiter = transfer_limiter or TransferLimiter(
+            self._config.transfer_max_inflight_bytes, self._config.transfer_max_bandwidth or None
+        )
+
     @property
     def read_only(self) -> bool:
         """Whether the client is in read-only mode."""
@@ -60,11 +306,213 @@ class ADLS2Client:
         """The configuration for the client."""
         return self._config
     
-    def _create_client(self) -> DataLakeServiceClient:
-        """Create the DataLakeServiceClient."""
+    @property
+    def request_stats(self) -> Dict[str, float]:
+        """Counters of the requests sent to the account, and the current limit on requests in flight."""
+        return {
+            **asdict(self._request_stats),
+            "concurrency_limit": int(self._request_concurrency.limit),
+            "in_flight": self._request_concurrency.in_flight,
+        }
+
+    @property
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit/miss counters of the file properties, listing and Parquet footer caches."""
+        return {
+            "properties": self._properties_cache.stats(),
+            "listings": self._listing_cache.stats(),
+            "parquet": self._parquet_cache.stats(),
+        }
+
+    @property
+    def properties_cache(self) -> TTLCache:
+        """The file properties cache."""
+        return self._properties_cache
+
+    @property
+    def listing_cache(self) -> ListingCache:
+        """The directory listing cache."""
+        return self._listing_cache
+
+    def _invalidate_path(self, filesystem: str, path: str) -> None:
+        """Drop cached properties for a path and everything under it."""
+        path = path.strip("/")
+        self._properties_cache.invalidate_where(
+            lambda key: key[0] == filesystem and (not path or key[1] == path or key[1].startswith(path + "/"))
+        )
+
+    async def _get_properties(self, filesystem: str, file_path: str, use_cache: bool = True):
+        """Get the FileProperties of a file, using the properties cache.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            use_cache: If False, always fetch from the service. The result
+                still refreshes the cache.
+        """
+        key = (filesystem, file_path.strip("/"))
+
+        if use_cache:
+            properties = self._properties_cache.get(key)
+            if properties is not None:
+                return properties
+
+        file_client = self._get_file_client(filesystem, file_path)
+        properties = await file_client.get_file_properties()
+        self._properties_cache.set(key, properties)
+        return properties
+
+    async def _update_metadata(self, filesystem: str, file_path: str, updates: Dict[str, str]) -> None:
+        """Merge updates into the metadata of a file.
+
+        The write is conditional on the ETag of the properties it was based
+        on. If cached properties turn out to be stale, they are re-read from
+        the service and the write is retried once.
+        """
+        file_client = self._get_file_client(filesystem, file_path)
+
+        try:
+            for use_cache in (True, False):
+                properties = await self._get_properties(filesystem, file_path, use_cache=use_cache)
+                metadata = dict(properties.metadata) if properties.metadata else {}
+                metadata.update(updates)
+                try:
+                    await file_client.set_metadata(
+                        metadata, etag=properties.etag, match_condition=MatchConditions.IfNotModified
+                    )
+                    return
+                except ResourceModifiedError:
+                    if not use_cache:
+                        raise
+        finally:
+            self._invalidate_path(filesystem, file_path)
+
+    async def _read_pinned(self, filesystem: str, file_path: str, read, use_cache: bool = True):
+        """Run read on a RangeReader pinned to the file's current ETag.
+
+        The ETag comes from the properties cache unless use_cache is False.
+        If it turns out to be stale, the pinned reads fail and read is run
+        once more against freshly fetched properties.
+        """
+        file_client = self._get_file_client(filesystem, file_path)
+        for use_cache in ((True, False) if use_cache else (False,)):
+            properties = await self._get_properties(filesystem, file_path, use_cache=use_cache)
+            try:
+                return await read(RangeReader(file_client, properties.size, properties.etag))
+            except ResourceModifiedError:
+                if not use_cache:
+                    raise
+
+    def _create_client(self, shared_transport=None) -> DataLakeServiceClient:
+        """Create the async DataLakeServiceClient.
+
+        The client uses an aiohttp transport and async credentials so that SDK
+        calls are awaited on the event loop instead of blocking it. The
+        transport's connection pool is sized and kept alive according to the
+        HTTP_* settings; see PooledAioHttpTransport. A shared transport is
+        used through a SharedTransport, so closing this client leaves it open.
+
+        Requests are sent under the account's adaptive concurrency limit and
+        transient failures are retried with jittered backoff; see
+        ThrottledTransport and ThrottlingRetryPolicy.
+        """
         account_url = f"https://{self._config.storage_account_name}.dfs.core.windows.net"
-        credential = DefaultAzureCredential()
-        return DataLakeServiceClient(account_url=account_url, credential=credential)
+        if self._credential is None:
+            self._credential = create_credential(
+                self._config.storage_account_name,
+                self._config.storage_account_key,
+                self._config.credential_type,
+                self._config.token_cache_persistence,
+                self._config.token_cache_allow_unencrypted,
+            )
+        if shared_transport is not None:
+            transport = SharedTransport(shared_transport)
+        else:
+            transport = create_transport(self._config)
+        self._transport = ThrottledTransport(
+            transport, self._request_concurrency, self._request_stats, self._config.storage_account_name
+        )
+        return DataLakeServiceClient(
+            account_url=account_url,
+            credential=self._credential,
+            transport=self._transport,
+            retry_policy=self._create_retry_policy(),
+        )
+
+    def _create_retry_policy(self) -> ThrottlingRetryPolicy:
+        return ThrottlingRetryPolicy(
+            self._request_stats,
+            retry_total=self._config.retry_total,
+            backoff=self._config.retry_backoff,
+            backoff_max=self._config.retry_backoff_max,
+        )
+
+    def _get_blob_service_client(self) -> BlobServiceClient:
+        """Return the client of the account's blob endpoint, created on first use.
+
+        It sends through this client's transport, so its requests share the
+        connection pool, the adaptive concurrency limit and the request stats.
+        """
+        if self._blob_service_client is None:
+            self._blob_service_client = BlobServiceClient(
+                account_url=self.client.url.replace(".dfs.", ".blob.", 1),
+                credential=self._credential,
+                transport=SharedTransport(self._transport),
+                retry_policy=self._create_retry_policy(),
+            )
+        return self._blob_service_client
+
+    def _get_file_system_client(self, filesystem: str):
+        """Return the cached FileSystemClient for a filesystem."""
+        file_system_client = self._file_system_clients.get(filesystem)
+        if file_system_client is None:
+            file_system_client = self.client.get_file_system_client(filesystem)
+            self._file_system_clients[filesystem] = file_system_client
+        return file_system_client
+
+    def _get_file_client(self, filesystem: str, file_path: str):
+        """Return a cached DataLakeFileClient for a file."""
+        key = ("file", filesystem, file_path)
+        file_client = self._path_clients.get(key)
+        if file_client is None:
+            file_client = self._get_file_system_client(filesystem).get_file_client(file_path)
+            self._path_clients.set(key, file_client)
+        return file_client
+
+    def _get_directory_client(self, filesystem: str, directory: str):
+        """Return a cached DataLakeDirectoryClient for a directory."""
+        key = ("directory", filesystem, directory)
+        directory_client = self._path_clients.get(key)
+        if directory_client is None:
+            directory_client = self._get_file_system_client(filesystem).get_directory_client(directory)
+            self._path_clients.set(key, directory_client)
+        return directory_client
+
+    async def warm_up(self) -> None:
+        """Acquire a first token so the first tool call does not wait for it.
+
+        Does nothing for shared key credentials. Failures are logged and left
+        for the first request to report.
+        """
+        if not hasattr(self._credential, "get_token"):
+            return
+        try:
+            await self._credential.get_token(STORAGE_SCOPE)
+            logger.debug("Acquired storage token")
+        except Exception as e:
+            logger.warning(f"Could not acquire a storage token ahead of the first request: {e}")
+
+    async def close(self) -> None:
+        """Cancel background listing refreshes, then close the service client and credential."""
+        tasks = list(self._refresh_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._blob_service_client is not None:
+            await self._blob_service_client.close()
+        await self.client.close()
+        if self._owns_credential and hasattr(self._credential, "close"):
+            await self._credential.close()
     
     async def create_container(self, container: str) -> bool:
         """Create a new container (filesystem) in the storage account.
@@ -79,7 +527,7 @@ class ADLS2Client:
             Exception: If there is an error creating the container
         """
         try:
-            _ = self.client.create_file_system(file_system=container)
+            _ = await self.client.create_file_system(file_system=container)
             return True
         except Exception as e:
             logger.error(f"Error creating container {container}: {e}")
@@ -92,7 +540,7 @@ class ADLS2Client:
             List[str]: List of filesystem names
         """
         try:
-            return [container.name for container in self.client.list_file_systems()]
+            return [container.name async for container in self.client.list_file_systems()]
         except Exception as e:
             logger.error(f"Error listing filesystems: {e}")
             return []
@@ -110,8 +558,10 @@ class ADLS2Client:
             Exception: If there is an error deleting the filesystem
         """
         try:
-            file_system_client = self.client.get_file_system_client(name)
-            file_system_client.delete_file_system()
+            file_system_client = self._get_file_system_client(name)
+            await file_system_client.delete_file_system()
+            self._properties_cache.invalidate_where(lambda key: key[0] == name)
+            self._listing_cache.clear_filesystem(name)
             return True
         except Exception as e:
             logger.error(f"Error deleting filesystem {name}: {e}")
@@ -128,175 +578,893 @@ class ADLS2Client:
             bool: True if directory was created successfully, False otherwise
         """
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            directory_client = file_system_client.create_directory(directory)
+            file_system_client = self._get_file_system_client(filesystem)
+            directory_client = await file_system_client.create_directory(directory)
+            self._listing_cache.add(
+                filesystem,
+                PathEntry(name=directory.strip("/"), is_directory=True, last_modified=datetime.now(timezone.utc)),
+            )
             return True
         except Exception as e:
             logger.error(f"Error creating directory {directory}: {e}")
             return False
 
-    async def delete_directory(self, filesystem: str, directory: str) -> bool:
+    async def _is_hns_enabled(self) -> bool:
+        """Whether the account has a hierarchical namespace, looked up once.
+
+        The lookup needs account-level permission, which container-scoped
+        SAS tokens and narrow RBAC roles lack. If it fails, the account is
+        taken to have a hierarchical namespace from then on, so directory
+        operations make the single call they made before flat namespace
+        support.
+        """
+        if self._hns_enabled is None:
+            try:
+                info = await self._get_blob_service_client().get_account_information()
+            except Exception as e:
+                logger.warning(f"Could not look up whether the account has a hierarchical namespace, assuming it does: {e}")
+                self._hns_enabled = True
+            else:
+                self._hns_enabled = bool(info.get("is_hns_enabled"))
+        return self._hns_enabled
+
+    async def delete_directory(
+        self,
+        filesystem: str,
+        directory: str,
+        progress: Optional[ProgressCallback] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> bool:
         """Delete a directory from the specified filesystem.
+
+        On hierarchical namespace accounts the directory is deleted with a
+        single recursive delete, whose continuation tokens the SDK follows.
+        On flat namespace accounts its blobs are deleted in parallel; see
+        delete_blobs.
         
         Args:
             filesystem: Name of the filesystem
             directory: Path of the directory to delete
+            progress: Called with the entries deleted so far, the total once
+                known, and the elapsed seconds
+            max_concurrency: Maximum number of blob deletes in flight on flat
+                namespace accounts. Defaults to 32.
             
         Returns:
             bool: True if directory was deleted successfully, False otherwise
         """
+        tracker = ProgressTracker(progress)
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            directory_client = file_system_client.get_directory_client(directory)
-            directory_client.delete_directory()
+            try:
+                if await self._is_hns_enabled():
+                    directory_client = self._get_directory_client(filesystem, directory)
+                    await directory_client.delete_directory()
+                    await tracker.advance()
+                else:
+                    await delete_blobs(
+                        self._get_blob_service_client().get_container_client(filesystem),
+                        directory,
+                        max_concurrency or DEFAULT_BULK_CONCURRENCY,
+                        tracker,
+                    )
+            except Exception:
+                self._listing_cache.invalidate(filesystem, directory)
+                raise
+            finally:
+                self._invalidate_path(filesystem, directory)
+            self._listing_cache.remove(filesystem, directory)
+            await tracker.report()
+            logger.info(f"Deleted directory {directory} ({tracker.processed} entries) in {tracker.elapsed:.1f}s")
             return True
         except Exception as e:
-            logger.error(f"Error deleting directory {directory}: {e}")
+            logger.error(f"Error deleting directory {directory} after {tracker.processed} entries: {e}")
             return False
 
-    async def rename_directory(self, filesystem: str, source_path: str, destination_path: str) -> bool:
+    async def rename_directory(
+        self,
+        filesystem: str,
+        source_path: str,
+        destination_path: str,
+        progress: Optional[ProgressCallback] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> bool:
         """Rename/move a directory within the specified filesystem.
+
+        On hierarchical namespace accounts the rename is repeated with the
+        continuation token the service returns until it completes. On flat
+        namespace accounts its blobs are copied and deleted in parallel; see
+        move_blobs.
         
         Args:
             filesystem: Name of the filesystem
             source_path: Current path of the directory
             destination_path: New path for the directory
+            progress: Called with the entries (or, on hierarchical namespace
+                accounts, rename calls) processed so far, the total once known,
+                and the elapsed seconds
+            max_concurrency: Maximum number of blob moves in flight on flat
+                namespace accounts. Defaults to 32.
             
         Returns:
             bool: True if directory was renamed successfully, False otherwise
         """
+        tracker = ProgressTracker(progress)
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            directory_client = file_system_client.get_directory_client(source_path)
-            new_name = f"{file_system_client.file_system_name}/{destination_path}"
-            directory_client.rename_directory(new_name)
+            file_system_client = self._get_file_system_client(filesystem)
+            try:
+                if await self._is_hns_enabled():
+                    directory_client = self._get_directory_client(filesystem, source_path)
+                    new_name = f"{file_system_client.file_system_name}/{destination_path}"
+                    state = {}
+
+                    def capture(response, deserialized, headers):
+                        state["continuation"] = headers.get("x-ms-continuation")
+
+                    while True:
+                        await directory_client.rename_directory(
+                            new_name, continuation=state.get("continuation"), cls=capture
+                        )
+                        await tracker.advance()
+                        if not state["continuation"]:
+                            break
+                else:
+                    await move_blobs(
+                        self._get_blob_service_client().get_container_client(filesystem),
+                        source_path,
+                        destination_path,
+                        max_concurrency or DEFAULT_BULK_CONCURRENCY,
+                        tracker,
+                    )
+            except Exception:
+                self._listing_cache.invalidate(filesystem, source_path)
+                self._listing_cache.invalidate(filesystem, destination_path)
+                raise
+            finally:
+                self._invalidate_path(filesystem, source_path)
+                self._invalidate_path(filesystem, destination_path)
+            self._listing_cache.move(filesystem, source_path, destination_path)
+            await tracker.report()
+            logger.info(
+                f"Renamed directory {source_path} to {destination_path} "
+                f"({tracker.processed} entries) in {tracker.elapsed:.1f}s"
+            )
             return True
         except Exception as e:
-            logger.error(f"Error renaming directory {source_path} to {destination_path}: {e}")
+            logger.error(
+                f"Error renaming directory {source_path} to {destination_path} after {tracker.processed} entries: {e}"
+            )
             return False
 
-    async def directory_get_paths(self, filesystem: str, directory: str = "/", recursive: bool = True) -> List[str]:
+    async def _list_entries(
+        self,
+        filesystem: str,
+        directory: str,
+        recursive: bool,
+        max_concurrency: int,
+        path_filter: Optional[PathFilter] = None,
+    ) -> List[PathEntry]:
+        """List every entry under a directory, without the listing cache."""
+        file_system_client = self._get_file_system_client(filesystem)
+
+        if recursive and max_concurrency > 1:
+            return await walk_tree(file_system_client, directory, max_concurrency, path_filter=path_filter)
+
+        directory_client = self._get_directory_client(filesystem, directory)
+        entries = []
+        async for path in directory_client.get_paths(recursive=recursive):
+            entry = PathEntry.from_properties(path)
+            if path_filter is None or path_filter.matches(entry):
+                entries.append(entry)
+        return entries
+
+    async def _fetch_listing(self, filesystem: str, directory: str, recursive: bool, max_concurrency: int) -> List[PathEntry]:
+        """List every entry under a directory and store it in the listing cache."""
+        generation = self._listing_cache.generation
+        entries = await self._list_entries(filesystem, directory, recursive, max_concurrency)
+        self._listing_cache.set(ListingCache.key(filesystem, directory, recursive), entries, generation)
+        return entries
+
+    def _refresh_listing(self, filesystem: str, directory: str, recursive: bool, max_concurrency: int) -> None:
+        """Refresh a stale cached listing in the background."""
+        key = ListingCache.key(filesystem, directory, recursive)
+        if key in self._refresh_tasks:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._fetch_listing(filesystem, directory, recursive, max_concurrency)
+            except Exception as e:
+                logger.warning(f"Error refreshing listing of directory {directory}: {e}")
+            finally:
+                del self._refresh_tasks[key]
+
+        self._refresh_tasks[key] = asyncio.create_task(refresh())
+
+    async def directory_get_paths(
+        self,
+        filesystem: str,
+        directory: str = "/",
+        recursive: bool = True,
+        max_results: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        path_filter: Optional[PathFilter] = None,
+        refresh: bool = False,
+    ) -> PathListing:
         """Get files and directories under the specified path.
+
+        If max_results or continuation_token is given, a single page is fetched
+        using the service-side paging and its continuation token is returned.
+        Otherwise every path under the directory is listed; recursive listings
+        fan out over subtrees with up to max_concurrency listings in flight.
+        Entries not matching path_filter are dropped as each page is received.
+        A filtered page may therefore hold fewer than max_results entries.
+
+        Full listings are served from the listing cache when possible. A stale
+        cached listing is returned immediately and refreshed in the background.
+        An unfiltered listing that misses the cache is stored in it.
         
         Args:
             filesystem: Name of the filesystem
             directory: Path of the directory to list. Defaults to "/".
             recursive: If True, list paths recursively. Defaults to True.
+            max_results: Maximum number of paths in the page. Defaults to the service limit.
+            continuation_token: Token returned by a previous call to fetch the next page
+            max_concurrency: Maximum number of subtree listings in flight for full
+                recursive listings. 1 uses a single serial listing. Defaults to 8.
+            path_filter: Only return entries matching this filter
+            refresh: If True, re-list from the service and update the cache
             
         Returns:
-            List[str]: List of file and directory under the path
+            PathListing: Entries under the directory with their size, last
+            modified time and ETag, and the token for the next page, if any
         """
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            directory_client = file_system_client.get_directory_client(directory)
-            
-            paths = []
-            paths_iter = directory_client.get_paths(recursive=recursive)
-            
-            for path in paths_iter:
-                paths.append(path.name)
+            listing = PathListing()
+            paged = max_results is not None or continuation_token is not None
+            max_concurrency = max_concurrency or DEFAULT_LIST_CONCURRENCY
+
+            if not paged:
+                entries = None
+                if not refresh:
+                    entries, stale = self._listing_cache.get(ListingCache.key(filesystem, directory, recursive))
+                    if stale:
+                        self._refresh_listing(filesystem, directory, recursive, max_concurrency)
+
+                if entries is None and path_filter is not None and not refresh:
+                    # Filter while listing rather than buffering the full listing
+                    listing.entries = await self._list_entries(
+                        filesystem, directory, recursive, max_concurrency, path_filter
+                    )
+                    return listing
+
+                if entries is None:
+                    entries = await self._fetch_listing(filesystem, directory, recursive, max_concurrency)
+
+                if path_filter is not None:
+                    entries = [entry for entry in entries if path_filter.matches(entry)]
+                listing.entries = entries
+                return listing
+
+            directory_client = self._get_directory_client(filesystem, directory)
+            paths_iter = directory_client.get_paths(recursive=recursive, max_results=max_results)
+            pages = paths_iter.by_page(continuation_token=continuation_token)
+            async for page in pages:
+                async for path in page:
+                    entry = PathEntry.from_properties(path)
+                    if path_filter is None or path_filter.matches(entry):
+                        listing.entries.append(entry)
+                break
+            listing.continuation_token = pages.continuation_token or None
                 
-            return paths
+            return listing
         except Exception as e:
             logger.error(f"Error getting paths for directory {directory}: {e}")
-            return []
+            return PathListing()
 
-    async def upload_file(self, upload_file: str, filesystem: str, destination: str) -> bool:
+    def _record_upload(self, filesystem: str, destination: str, result: TransferResult) -> None:
+        """Add an uploaded file to the cached listings."""
+        self._listing_cache.add(
+            filesystem,
+            PathEntry(
+                name=destination.strip("/"),
+                size=result.size,
+                last_modified=result.last_modified,
+                etag=result.etag.strip('"'),
+            ),
+        )
+
+    async def upload_file(
+        self,
+        upload_file: str,
+        filesystem: str,
+        destination: str,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        hashes: Optional[List[str]] = None,
+    ) -> Optional[TransferResult]:
         """Upload a file to ADLS2.
+
+        The file is streamed in chunks that are appended in parallel, so memory
+        use is bounded by chunk_size * max_concurrency rather than the file size.
+        An interrupted upload is resumed from its checkpoint journal when the
+        call is retried with the same arguments.
+
+        With compression, the chunks are compressed on the way and the file is
+        stored with its Content-Encoding set, so download_file and HTTP clients
+        decompress it transparently.
+
+        The bytes sent are hashed as they stream, and the file is stored with
+        their MD5 as its Content-MD5.
         
         Args:
             upload_file: Path to the file to upload (relative to UPLOAD_ROOT)
             filesystem: Name of the filesystem
             destination: Destination path in ADLS2
+            chunk_size: Size of each uploaded block in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of blocks in flight. Defaults to 4.
+            compression: Compress the file with gzip or zstd. Defaults to no compression.
+            compression_level: Compression level. Defaults to 6 for gzip and 3 for zstd.
+            hashes: Digests to compute on top of MD5: sha256, crc64, xxh64 or xxh3_128.
             
         Returns:
-            bool: True if file was uploaded successfully, False otherwise
+            TransferResult with the bytes uploaded and their digests, or None if the upload failed
             
         Raises:
-            Exception: If there is an error uploading the file
+            ValueError: If the transfer, compression or hash options are invalid
         """
+        chunk_size, max_concurrency = resolve_transfer_options(chunk_size, max_concurrency)
+        compression, compression_level = resolve_compression(compression, compression_level)
+        hashes = resolve_hashes(hashes)
         try:
-            # Construct full source path
-            source_path = Path(self.upload_root) / upload_file
-            
-            # Verify file exists and is within upload_root
+            # Construct full source path, verifying it is within upload_root
+            source_path = _within(Path(self.upload_root), Path(self.upload_root) / upload_file)
+            if source_path is None:
+                logger.error(f"Source file must be within UPLOAD_ROOT: {self.upload_root}")
+                return None
+
+            # Verify file exists
             if not source_path.exists():
                 logger.error(f"Source file does not exist: {source_path}")
-                return False
-                
-            if not str(source_path.absolute()).startswith(str(Path(self.upload_root).absolute())):
-                logger.error(f"Source file must be within UPLOAD_ROOT: {self.upload_root}")
-                return False
+                return None
 
             # Get file system client and create file client
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(destination)
+            file_client = self._get_file_client(filesystem, destination)
 
-            # Upload the file
-            with open(source_path, "rb") as file:
-                file_client.upload_data(file.read(), overwrite=True)
+            # Stream the file in parallel chunks
+            try:
+                result = await upload_chunked(
+                    file_client,
+                    source_path,
+                    chunk_size,
+                    max_concurrency,
+                    self._transfer_limiter,
+                    compression,
+                    compression_level,
+                    hashes,
+                )
+            finally:
+                self._invalidate_path(filesystem, destination)
 
-            return True
+            self._record_upload(filesystem, destination, result)
+            return result
         except Exception as e:
             logger.error(f"Error uploading file {upload_file} to {destination}: {e}")
-            return False
+            return None
 
-    async def download_file(self, filesystem: str, source: str, download_path: str) -> bool:
+    async def download_file(
+        self,
+        filesystem: str,
+        source: str,
+        download_path: str,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        decompress: bool = True,
+        hashes: Optional[List[str]] = None,
+        verify: bool = True,
+    ) -> Optional[TransferResult]:
         """Download a file from ADLS2.
+
+        Byte ranges are fetched in parallel and written to a temporary file
+        that is renamed into place once complete, so memory use is bounded by
+        chunk_size * max_concurrency rather than the file size. An interrupted
+        download is resumed from its checkpoint journal when the call is
+        retried with the same arguments and the source ETag is unchanged.
+
+        A file stored with a gzip or zstd Content-Encoding is decompressed as
+        its ranges arrive. Such a download is not resumable.
+
+        The bytes received are hashed as they stream and, if the file has a
+        Content-MD5, checked against it before the download is put in place.
         
         Args:
             filesystem: Name of the filesystem
             source: Source path in ADLS2
             download_path: Path where to save the file (relative to DOWNLOAD_ROOT)
+            chunk_size: Size of each ranged read in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of ranges in flight. Defaults to 4.
+            decompress: Decompress a compressed file. Defaults to True.
+            hashes: Digests to compute on top of MD5: sha256, crc64, xxh64 or xxh3_128.
+            verify: Check the MD5 against the file's Content-MD5. Defaults to True.
             
         Returns:
-            bool: True if file was downloaded successfully, False otherwise
+            TransferResult with the bytes downloaded, their digests and whether
+            they were verified, or None if the download failed
             
         Raises:
-            Exception: If there is an error downloading the file
+            ValueError: If the transfer or hash options are invalid
+            IntegrityError: If the data received does not match the Content-MD5
         """
+        chunk_size, max_concurrency = resolve_transfer_options(chunk_size, max_concurrency)
+        hashes = resolve_hashes(hashes)
         try:
-            # Construct full destination path
-            dest_path = Path(self.download_root) / download_path
-            
+            # Construct full destination path, verifying it is within download_root
+            dest_path = _within(Path(self.download_root), Path(self.download_root) / download_path)
+            if dest_path is None:
+                logger.error(f"Destination path must be within DOWNLOAD_ROOT: {self.download_root}")
+                return None
+
             # Create parent directories if they don't exist
             dest_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Verify destination path is within download_root
-            if not str(dest_path.absolute()).startswith(str(Path(self.download_root).absolute())):
-                logger.error(f"Destination path must be within DOWNLOAD_ROOT: {self.download_root}")
-                return False
 
             # Get file system client and file client
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(source)
+            file_client = self._get_file_client(filesystem, source)
 
-            # Download the file
-            download = file_client.download_file()
-            with open(dest_path, "wb") as file:
-                file.write(download.readall())
-
-            return True
+            # Download the file in parallel ranges
+            return await download_chunked(
+                file_client,
+                dest_path,
+                chunk_size,
+                max_concurrency,
+                self._transfer_limiter,
+                decompress,
+                hashes,
+                verify,
+            )
+        except IntegrityError:
+            raise
         except Exception as e:
             logger.error(f"Error downloading file {source} to {download_path}: {e}")
-            return False
+            return None
+
+    async def _remote_files(self, filesystem: str, directory: str) -> Dict[str, PathEntry]:
+        """Freshly list everything under a directory, keyed by path.
+
+        A directory that does not exist yet has no entries.
+        """
+        try:
+            entries = await self._fetch_listing(filesystem, directory or "/", True, DEFAULT_LIST_CONCURRENCY)
+        except ResourceNotFoundError:
+            return {}
+        return {entry.name: entry for entry in entries}
+
+    def _remote_md5(self, filesystem: str):
+        """Build a lookup of the Content-MD5 of a remote file, for plan_sync."""
+        async def remote_md5(file_path: str) -> Optional[bytes]:
+            properties = await self._get_properties(filesystem, file_path, use_cache=False)
+            return properties.content_settings.content_md5 if properties.content_settings else None
+
+        return remote_md5
+
+    async def upload_directory(
+        self,
+        local_directory: str,
+        filesystem: str,
+        destination: str,
+        max_files: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        sync: bool = False,
+    ) -> Optional[TransferReport]:
+        """Upload a local directory tree to ADLS2.
+
+        Every file under the directory is uploaded to the same relative path
+        under destination, and empty local directories are created remotely.
+        Files are transferred concurrently; see TransferScheduler.
+
+        With sync, files that already match their remote copy are skipped;
+        see plan_sync. Remote files without a local counterpart are kept.
+
+        Args:
+            local_directory: Directory to upload (relative to UPLOAD_ROOT)
+            filesystem: Name of the filesystem
+            destination: Destination directory in ADLS2
+            max_files: Maximum number of files in flight. Defaults to 16.
+            chunk_size: Chunk size for large files in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of chunks in flight per file. Defaults to 4.
+            sync: If True, only upload new or changed files. Defaults to False.
+
+        Returns:
+            TransferReport for the upload, or None if it could not be started
+        """
+        try:
+            source_path = _within(Path(self.upload_root), Path(self.upload_root) / local_directory)
+            if source_path is None:
+                logger.error(f"Source directory must be within UPLOAD_ROOT: {self.upload_root}")
+                return None
+
+            if not source_path.is_dir():
+                logger.error(f"Source directory does not exist: {source_path}")
+                return None
+
+            destination = destination.strip("/")
+            jobs, empty_directories = await asyncio.to_thread(_local_tree, source_path, destination)
+
+            file_system_client = self._get_file_system_client(filesystem)
+            skipped = 0
+            manifest = None
+            if sync:
+                remote = await self._remote_files(filesystem, destination)
+                manifest = await asyncio.to_thread(
+                    SyncManifest.load, source_path / MANIFEST_NAME, f"{filesystem}/{destination}"
+                )
+                manifest.retain(job.local_path.relative_to(source_path).as_posix() for job in jobs)
+                jobs, skipped = await plan_sync(
+                    jobs, source_path, remote, manifest, self._remote_md5(filesystem), DEFAULT_MAX_FILES
+                )
+                empty_directories = [directory for directory in empty_directories if directory not in remote]
+
+            for directory in empty_directories:
+                await file_system_client.get_directory_client(directory).create_directory()
+                self._listing_cache.add(
+                    filesystem,
+                    PathEntry(name=directory, is_directory=True, last_modified=datetime.now(timezone.utc)),
+                )
+
+            chunk_size, max_concurrency = resolve_transfer_options(chunk_size, max_concurrency)
+            scheduler = TransferScheduler(
+                file_system_client,
+                self._transfer_limiter,
+                chunk_size,
+                max_concurrency,
+                max_files or DEFAULT_MAX_FILES,
+            )
+
+            def completed(job: TransferJob, result: TransferResult) -> None:
+                self._invalidate_path(filesystem, job.remote_path)
+                self._record_upload(filesystem, job.remote_path, result)
+                if manifest is not None:
+                    stat = job.local_path.stat()
+                    if stat.st_size == job.size and stat.st_mtime_ns == job.mtime_ns:
+                        manifest.record(
+                            job.local_path.relative_to(source_path).as_posix(), stat, result.etag, _local_md5(result)
+                        )
+
+            try:
+                report = await scheduler.upload(jobs, completed)
+            finally:
+                if manifest is not None:
+                    await asyncio.to_thread(manifest.save)
+            report.files_skipped = skipped
+            for remote_path in report.errors:
+                self._invalidate_path(filesystem, remote_path)
+
+            logger.info(
+                f"Uploaded {report.files_transferred} files ({report.bytes_transferred} bytes) "
+                f"from {source_path} in {report.elapsed_seconds:.1f}s, {report.files_skipped} unchanged"
+            )
+            return report
+        except Exception as e:
+            logger.error(f"Error uploading directory {local_directory} to {destination}: {e}")
+            return None
+
+    async def download_directory(
+        self,
+        filesystem: str,
+        source: str,
+        download_path: str,
+        max_files: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        sync: bool = False,
+    ) -> Optional[TransferReport]:
+        """Download an ADLS2 directory tree.
+
+        Every file under source is downloaded to the same relative path under
+        download_path, and remote directories are created locally. Files are
+        transferred concurrently; see TransferScheduler.
+
+        With sync, files that already match their local copy are skipped;
+        see plan_sync. Local files without a remote counterpart are kept.
+
+        Args:
+            filesystem: Name of the filesystem
+            source: Source directory in ADLS2
+            download_path: Local directory to download into (relative to DOWNLOAD_ROOT)
+            max_files: Maximum number of files in flight. Defaults to 16.
+            chunk_size: Chunk size for large files in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of chunks in flight per file. Defaults to 4.
+            sync: If True, only download new or changed files. Defaults to False.
+
+        Returns:
+            TransferReport for the download, or None if it could not be started
+        """
+        try:
+            dest_path = _within(Path(self.download_root), Path(self.download_root) / download_path)
+            if dest_path is None:
+                logger.error(f"Destination path must be within DOWNLOAD_ROOT: {self.download_root}")
+                return None
+
+            source = source.strip("/")
+            entries = await self._fetch_listing(filesystem, source or "/", True, DEFAULT_LIST_CONCURRENCY)
+
+            jobs = []
+            directories = [dest_path]
+            for entry in entries:
+                relative = entry.name[len(source) + 1:] if source else entry.name
+                local_path = _within(dest_path, dest_path / relative)
+                if local_path is None:
+                    logger.warning(f"Skipping {entry.name}: it resolves outside {dest_path}")
+                    continue
+                if entry.is_directory:
+                    directories.append(local_path)
+                else:
+                    jobs.append(TransferJob(local_path=local_path, remote_path=entry.name, size=entry.size))
+
+            for directory in directories:
+                await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+
+            skipped = 0
+            manifest = None
+            if sync:
+                remote = {entry.name: entry for entry in entries}
+                manifest = await asyncio.to_thread(
+                    SyncManifest.load, dest_path / MANIFEST_NAME, f"{filesystem}/{source}"
+                )
+                manifest.retain(job.local_path.relative_to(dest_path).as_posix() for job in jobs)
+                jobs, skipped = await plan_sync(
+                    jobs, dest_path, remote, manifest, self._remote_md5(filesystem), DEFAULT_MAX_FILES
+                )
+
+            def completed(job: TransferJob, result: TransferResult) -> None:
+                if manifest is not None:
+                    manifest.record(
+                        job.local_path.relative_to(dest_path).as_posix(),
+                        job.local_path.stat(),
+                        result.etag,
+                        _local_md5(result),
+                    )
+
+            chunk_size, max_concurrency = resolve_transfer_options(chunk_size, max_concurrency)
+            scheduler = TransferScheduler(
+                self._get_file_system_client(filesystem),
+                self._transfer_limiter,
+                chunk_size,
+                max_concurrency,
+                max_files or DEFAULT_MAX_FILES,
+            )
+            try:
+                report = await scheduler.download(jobs, completed)
+            finally:
+                if manifest is not None:
+                    await asyncio.to_thread(manifest.save)
+            report.files_skipped = skipped
+
+            logger.info(
+                f"Downloaded {report.files_transferred} files ({report.bytes_transferred} bytes) "
+                f"to {dest_path} in {report.elapsed_seconds:.1f}s, {report.files_skipped} unchanged"
+            )
+            return report
+        except Exception as e:
+            logger.error(f"Error downloading directory {source} to {download_path}: {e}")
+            return None
+
+    async def read_file_range(
+        self,
+        filesystem: str,
+        file_path: str,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        head_lines: Optional[int] = None,
+        tail_lines: Optional[int] = None,
+        start_line: Optional[int] = None,
+        line_count: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Optional[RangeRead]:
+        """Read part of a file with ranged reads, without downloading it.
+
+        Exactly one kind of read is selected by the arguments: a byte
+        range, the first or last lines, or a window of lines. With none, the
+        start of the file is read. Only the bytes needed are fetched, except
+        that a line window is found by reading through the lines before it.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            offset: Byte offset to read from. Negative offsets count from the end of the file.
+            length: Number of bytes to read. Defaults to the rest of the file, up to max_bytes.
+            head_lines: Number of lines to read from the start of the file
+            tail_lines: Number of lines to read from the end of the file
+            start_line: First line of a window of lines, numbered from 1
+            line_count: Number of lines in the window. Defaults to 1.
+            max_bytes: Maximum number of bytes returned. Defaults to 64 KiB,
+                and cannot exceed READ_MAX_BYTES.
+
+        Returns:
+            RangeRead with the bytes read, or None if the file cannot be read
+
+        Raises:
+            ValueError: If the arguments select no single kind of read or are out of range
+        """
+        kind, max_bytes = resolve_read_options(
+            offset, length, head_lines, tail_lines, start_line, line_count, max_bytes, self._config.read_max_bytes
+        )
+        async def read(reader: RangeReader) -> RangeRead:
+            if kind == "head":
+                return await reader.read_lines(1, head_lines, max_bytes, self._config.read_max_scan_bytes)
+            if kind == "tail":
+                return await reader.read_tail(tail_lines, max_bytes)
+            if kind == "lines":
+                return await reader.read_lines(
+                    start_line or 1, line_count or 1, max_bytes, self._config.read_max_scan_bytes
+                )
+            return await reader.read_bytes(offset or 0, length, max_bytes)
+
+        try:
+            return await self._read_pinned(filesystem, file_path, read)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error reading range of file {file_path}: {e}")
+            return None
+
+    async def get_parquet_info(
+        self,
+        filesystem: str,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        max_row_groups: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """Describe a Parquet file from its footer, without downloading it.
+
+        Only the footer is read: the last 64 KiB of the file, and a second
+        ranged read if the footer is longer. Decoded footers are cached by
+        ETag, so a file that has not changed is not read again. The ETag
+        comes from the properties cache, so a file rewritten within
+        METADATA_CACHE_TTL may still be described from its old footer.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            columns: Names of the columns to describe, dotted for nested
+                columns. Defaults to all.
+            max_row_groups: Maximum number of row groups listed. Defaults to 100.
+            use_cache: If False, bypass the properties and footer caches. Defaults to True.
+
+        Returns:
+            Dict with the file size and ETag, the row count, the schema with
+            file-wide column statistics and the row groups, or None if the
+            file cannot be read
+
+        Raises:
+            ValueError: If the file is not Parquet, or a column is unknown
+        """
+        max_row_groups = DEFAULT_MAX_ROW_GROUPS if max_row_groups is None else max_row_groups
+        if max_row_groups < 0:
+            raise ValueError("max_row_groups must not be negative")
+
+        async def read(reader: RangeReader) -> Dict[str, Any]:
+            key = (filesystem, file_path.strip("/"), reader.etag)
+            metadata = self._parquet_cache.get(key) if use_cache else None
+            cached = metadata is not None
+            if metadata is None:
+                metadata = await read_metadata(reader, max_footer_size=self._config.parquet_max_footer_bytes)
+                self._parquet_cache.set(key, metadata)
+            return {
+                "size": reader.size,
+                "etag": reader.etag,
+                "cached": cached,
+                "bytes_fetched": reader.bytes_fetched,
+                **describe(metadata, columns, max_row_groups),
+            }
 
-    async def file_exists(self, filesystem: str, file_path: str) -> bool:
+        try:
+            return await self._read_pinned(filesystem, file_path, read, use_cache)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error reading Parquet footer of file {file_path}: {e}")
+            return None
+
+    async def scan_file(
+        self,
+        filesystem: str,
+        file_path: str,
+        file_format: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        header: bool = True,
+        columns: Optional[List[str]] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sample_rows: int = 0,
+        collect_stats: bool = True,
+        top_k: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Stream a CSV or JSONL file through ranged reads, sampling rows and computing column statistics.
+
+        The file is never downloaded whole: chunks are read in order and
+        parsed as they arrive, with memory bounded whatever the file size.
+        The scan stops early at max_rows rows or max_bytes bytes.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            file_format: "csv" or "jsonl". Defaults to a guess from the extension.
+            delimiter: CSV field delimiter. Defaults to a tab for .tsv files and a comma otherwise.
+            header: Whether the first CSV line holds the column names. Defaults to True.
+            columns: Columns to sample and describe. Defaults to all.
+            max_rows: Number of rows after which the scan stops. Defaults to 1,000,000.
+            max_bytes: Number of bytes after which the scan stops. Defaults to
+                256 MiB, and cannot exceed SCAN_MAX_BYTES.
+            sample_rows: Number of leading rows to return
+            collect_stats: Whether to compute row and column statistics. Defaults to True.
+            top_k: Number of most frequent values reported per column. Defaults to 10.
+
+        Returns:
+            Dict with the rows scanned, the sample, per-column null counts,
+            distinct counts, top values and numeric min/max/mean, and whether
+            the whole file was scanned; or None if the file cannot be read
+
+        Raises:
+            ValueError: If the format cannot be determined or a budget is out of range
+        """
+        file_format, delimiter = resolve_format(file_path, file_format, delimiter)
+        max_rows = DEFAULT_SCAN_MAX_ROWS if max_rows is None else max_rows
+        max_bytes = min(DEFAULT_SCAN_MAX_BYTES, self._config.scan_max_bytes) if max_bytes is None else max_bytes
+        top_k = DEFAULT_TOP_K if top_k is None else top_k
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        if max_bytes < 1 or max_bytes > self._config.scan_max_bytes:
+            raise ValueError(f"max_bytes must be between 1 and {self._config.scan_max_bytes}")
+        if sample_rows < 0 or top_k < 0:
+            raise ValueError("sample_rows and top_k must not be negative")
+
+        async def read(reader: RangeReader) -> Dict[str, Any]:
+            scanner = FileScanner(
+                file_format, delimiter, header, columns, max_rows, sample_rows, collect_stats, top_k
+            )
+            progress = await scan(reader, scanner, max_bytes)
+            result = {
+                "format": file_format,
+                "size": reader.size,
+                "etag": reader.etag,
+                "rows": scanner.rows,
+                "parse_errors": scanner.parse_errors,
+                "columns": scanner.column_names(),
+                "columns_truncated": scanner.columns_truncated,
+                **progress,
+            }
+            if sample_rows:
+                result["sample"] = scanner.sample
+            if collect_stats:
+                result["column_stats"] = scanner.column_stats()
+            return result
+
+        try:
+            return await self._read_pinned(filesystem, file_path, read)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error scanning file {file_path}: {e}")
+            return None
+
+    async def file_exists(self, filesystem: str, file_path: str, use_cache: bool = True) -> bool:
         """Check if a file exists in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             file_path: Path to the file relative to filesystem root
+            use_cache: If False, bypass the properties cache. Defaults to True.
             
         Returns:
             bool: True if file exists, False otherwise
         """
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(file_path)
-            
             # Try to get file properties to check existence
-            file_client.get_file_properties()
+            await self._get_properties(filesystem, file_path, use_cache=use_cache)
             return True
         except Exception as e:
             logger.debug(f"File {file_path} does not exist in filesystem {filesystem}: {e}")
@@ -314,25 +1482,28 @@ class ADLS2Client:
             bool: True if file was renamed successfully, False otherwise
         """
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(source_path)
+            file_client = self._get_file_client(filesystem, source_path)
             
             # Construct new name with filesystem prefix as required by Azure SDK
-            new_name = f"{file_system_client.file_system_name}/{destination_path}"
+            new_name = f"{file_client.file_system_name}/{destination_path}"
             
             # Rename the file
-            file_client.rename_file(new_name)
+            await file_client.rename_file(new_name)
+            self._invalidate_path(filesystem, source_path)
+            self._invalidate_path(filesystem, destination_path)
+            self._listing_cache.move(filesystem, source_path, destination_path)
             return True
         except Exception as e:
             logger.error(f"Error renaming file {source_path} to {destination_path}: {e}")
             return False
 
-    async def get_file_properties(self, filesystem: str, file_path: str) -> Optional[Dict[str, str]]:
+    async def get_file_properties(self, filesystem: str, file_path: str, use_cache: bool = True) -> Optional[Dict[str, str]]:
         """Get properties of a file in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             file_path: Path to the file relative to filesystem root
+            use_cache: If False, bypass the properties cache. Defaults to True.
             
         Returns:
             Dict containing file properties or None if file doesn't exist or error occurs
@@ -345,43 +1516,109 @@ class ADLS2Client:
             - etag: Entity tag for the file
         """
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(file_path)
-            
-            properties = file_client.get_file_properties()
-            
-            return {
-                "name": file_path,
-                "size": str(properties.size),
-                "creation_time": properties.creation_time.isoformat() if properties.creation_time else "",
-                "last_modified": properties.last_modified.isoformat() if properties.last_modified else "",
-                "content_type": properties.content_settings.content_type if properties.content_settings else "",
-                "etag": properties.etag if properties.etag else ""
-            }
+            properties = await self._get_properties(filesystem, file_path, use_cache=use_cache)
+            return _format_properties(file_path, properties)
         except Exception as e:
             logger.error(f"Error getting properties for file {file_path}: {e}")
             return None
 
-    async def get_file_metadata(self, filesystem: str, file_path: str) -> Optional[Dict[str, str]]:
+    async def get_file_metadata(self, filesystem: str, file_path: str, use_cache: bool = True) -> Optional[Dict[str, str]]:
         """Get metadata of a file in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             file_path: Path to the file relative to filesystem root
+            use_cache: If False, bypass the properties cache. Defaults to True.
             
         Returns:
             Dict containing file metadata or None if file doesn't exist or error occurs
         """
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(file_path)
-            
-            properties = file_client.get_file_properties()
+            properties = await self._get_properties(filesystem, file_path, use_cache=use_cache)
             return dict(properties.metadata) if properties.metadata else {}
         except Exception as e:
             logger.error(f"Error getting metadata for file {file_path}: {e}")
             return None
 
+    async def file_exists_batch(
+        self,
+        filesystem: str,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> List[BatchItem]:
+        """Check whether each of several files exists.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_paths: Paths of the files relative to filesystem root
+            max_concurrency: Maximum number of checks in flight. Defaults to 16.
+            use_cache: If False, bypass the properties cache. Defaults to True.
+
+        Returns:
+            List[BatchItem]: Per-path results whose value is True or False.
+            A missing file is not an error; any other failure is reported
+            on its item.
+        """
+        async def exists(file_path: str) -> bool:
+            try:
+                await self._get_properties(filesystem, file_path, use_cache=use_cache)
+                return True
+            except ResourceNotFoundError:
+                return False
+
+        return await run_batch(file_paths, exists, max_concurrency)
+
+    async def get_file_properties_batch(
+        self,
+        filesystem: str,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> List[BatchItem]:
+        """Get properties of several files concurrently.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_paths: Paths of the files relative to filesystem root
+            max_concurrency: Maximum number of requests in flight. Defaults to 16.
+            use_cache: If False, bypass the properties cache. Defaults to True.
+
+        Returns:
+            List[BatchItem]: Per-path results whose value is the properties
+            dict returned by get_file_properties
+        """
+        async def properties(file_path: str) -> Dict[str, str]:
+            return _format_properties(
+                file_path, await self._get_properties(filesystem, file_path, use_cache=use_cache)
+            )
+
+        return await run_batch(file_paths, properties, max_concurrency)
+
+    async def get_file_metadata_batch(
+        self,
+        filesystem: str,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> List[BatchItem]:
+        """Get metadata of several files concurrently.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_paths: Paths of the files relative to filesystem root
+            max_concurrency: Maximum number of requests in flight. Defaults to 16.
+            use_cache: If False, bypass the properties cache. Defaults to True.
+
+        Returns:
+            List[BatchItem]: Per-path results whose value is the metadata dict
+        """
+        async def metadata(file_path: str) -> Dict[str, str]:
+            properties = await self._get_properties(filesystem, file_path, use_cache=use_cache)
+            return dict(properties.metadata) if properties.metadata else {}
+
+        return await run_batch(file_paths, metadata, max_concurrency)
+
     async def set_file_metadata(self, filesystem: str, file_path: str, key: str, value: str) -> bool:
         """Set a single metadata key-value pair for a file.
         
@@ -398,18 +1635,8 @@ class ADLS2Client:
             return False
 
         try:
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(file_path)
-            
-            # Get existing metadata
-            properties = file_client.get_file_properties()
-            metadata = dict(properties.metadata) if properties.metadata else {}
-            
-            # Update metadata
-            metadata[key] = value
-            
-            # Set metadata
-            file_client.set_metadata(metadata)
+            # Merge into the existing metadata
+            await self._update_metadata(filesystem, file_path, {key: value})
             return True
         except Exception as e:
             logger.error(f"Error setting metadata for file {file_path}: {e}")
@@ -436,18 +1663,8 @@ class ADLS2Client:
                 logger.error("Metadata JSON must be an object")
                 return False
 
-            file_system_client = self.client.get_file_system_client(filesystem)
-            file_client = file_system_client.get_file_client(file_path)
-            
-            # Get existing metadata
-            properties = file_client.get_file_properties()
-            metadata = dict(properties.metadata) if properties.metadata else {}
-            
-            # Update metadata with new values
-            metadata.update(new_metadata)
-            
-            # Set metadata
-            file_client.set_metadata(metadata)
+            # Merge new values into the existing metadata
+            await self._update_metadata(filesystem, file_path, new_metadata)
             return True
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON format for metadata: {e}")
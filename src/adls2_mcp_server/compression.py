@@ -0,0 +1,181 @@
+import zlib
+from typing import BinaryIO, Optional, Tuple
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+# Content encodings files can be compressed with, with their default and
+# allowed compression levels
+ENCODINGS = (GZIP, ZSTD)
+DEFAULT_LEVELS = {GZIP: 6, ZSTD: 3}
+LEVEL_RANGES = {GZIP: (0, 9), ZSTD: (1, 22)}
+
+# Metadata key recording the size of a compressed file before compression
+UNCOMPRESSED_SIZE_KEY = "uncompressed_size"
+
+# Largest piece of decompressed output held in memory at once
+DECOMPRESS_OUTPUT_SIZE = 1024 * 1024
+
+# Compressed bytes fed to the zstd decompressor per step. zstd can expand
+# input about 32,000-fold, so this bounds the output of a step to 32 MiB.
+ZSTD_INPUT_SIZE = 1024
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError(
+            "zstd compression needs the zstandard package; install it with pip install 'adls2-mcp-server[zstd]'"
+        ) from None
+    return zstandard
+
+
+def resolve_compression(compression: Optional[str], level: Optional[int]) -> Tuple[Optional[str], Optional[int]]:
+    """Apply defaults to and validate compression options.
+
+    Args:
+        compression: gzip, zstd, or None for no compression
+        level: Compression level, or None for the encoding's default
+
+    Returns:
+        Tuple[Optional[str], Optional[int]]: The resolved (encoding, level),
+        or (None, None) for no compression
+
+    Raises:
+        ValueError: If an option is out of range, or zstd is asked for
+            without the zstandard package installed
+    """
+    if not compression:
+        if level is not None:
+            raise ValueError("compression_level needs compression")
+        return None, None
+
+    encoding = compression.lower()
+    if encoding not in ENCODINGS:
+        raise ValueError(f"compression must be one of {', '.join(ENCODINGS)}")
+    if encoding == ZSTD:
+        _zstandard()
+
+    low, high = LEVEL_RANGES[encoding]
+    level = DEFAULT_LEVELS[encoding] if level is None else level
+    if level < low or level > high:
+        raise ValueError(f"compression_level for {encoding} must be between {low} and {high}")
+    return encoding, level
+
+
+def decodable(content_encoding: Optional[str]) -> Optional[str]:
+    """The encoding of a Content-Encoding header, or None if it is not one this module decompresses."""
+    encoding = (content_encoding or "").strip().lower()
+    return encoding if encoding in ENCODINGS else None
+
+
+def compress_member(encoding: str, level: int, data: bytes) -> bytes:
+    """Compress data as one self-contained gzip member or zstd frame.
+
+    Members concatenated in order form a valid stream of their encoding,
+    so the chunks of a file can be compressed independently, in parallel,
+    and still decompress as a whole with standard tools.
+    """
+    if encoding == GZIP:
+        return zlib.compress(data, level, wbits=31)
+    return _zstandard().ZstdCompressor(level=level).compress(data)
+
+
+class _GzipWriter:
+    """Decompresses a gzip stream fed in pieces, writing the output to a file."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._decompressor = zlib.decompressobj(wbits=31)
+        self._started = False
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        while data:
+            if self._decompressor.eof:
+                # The previous member has ended and another one follows
+                self._decompressor = zlib.decompressobj(wbits=31)
+            self._started = True
+            # Output is limited per step, so a highly compressed piece does
+            # not expand in memory all at once
+            output = self._decompressor.decompress(data, DECOMPRESS_OUTPUT_SIZE)
+            self._file.write(output)
+            self.size += len(output)
+            if self._decompressor.eof:
+                data = self._decompressor.unused_data
+            else:
+                data = self._decompressor.unconsumed_tail
+                while not data and len(output) == DECOMPRESS_OUTPUT_SIZE:
+                    output = self._decompressor.decompress(b"", DECOMPRESS_OUTPUT_SIZE)
+                    self._file.write(output)
+                    self.size += len(output)
+
+    def close(self) -> None:
+        if self._started and not self._decompressor.eof:
+            raise ValueError("The gzip stream ends in the middle of a member")
+
+
+class _ZstdWriter:
+    """Decompresses a zstd stream fed in pieces, writing the output to a file."""
+
+    def __init__(self, file: BinaryIO):
+        zstandard = _zstandard()
+        self._file = file
+        self._error = zstandard.ZstdError
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._frame = self._decompressor.decompressobj(write_size=DECOMPRESS_OUTPUT_SIZE)
+        self._started = False
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        position = 0
+        while position < len(data):
+            if self._frame.eof:
+                # The previous frame has ended and another one follows
+                self._frame = self._decompressor.decompressobj(write_size=DECOMPRESS_OUTPUT_SIZE)
+            self._started = True
+            # A decompressobj returns all the output of its input at once,
+            # so input is fed in small steps to bound the output held in
+            # memory, as a few bytes of zstd can expand to a whole block
+            piece = data[position:position + ZSTD_INPUT_SIZE]
+            position += len(piece)
+            try:
+                output = self._frame.decompress(piece)
+            except self._error as e:
+                raise ValueError(f"Invalid zstd stream: {e}") from None
+            self._file.write(output)
+            self.size += len(output)
+            if self._frame.eof:
+                position -= len(self._frame.unused_data)
+
+    def close(self) -> None:
+        if self._started and not self._frame.eof:
+            raise ValueError("The zstd stream ends in the middle of a frame")
+
+
+def decompressing_writer(encoding: str, file: BinaryIO):
+    """A writer that decompresses what is written to it into file.
+
+    The writer has write(data) and close() methods and a size attribute
+    counting the decompressed bytes written. Corrupt data raises from
+    write; a stream that ends early raises from close.
+    """
+    if encoding == GZIP:
+        return _GzipWriter(file)
+    if encoding == ZSTD:
+        return _ZstdWriter(file)
+    raise ValueError(f"Cannot decompress content encoded as {encoding}")
+
+
+def decompress_to_file(encoding: str, data: bytes, path) -> int:
+    """Decompress a whole compressed file held in memory into path.
+
+    Returns:
+        int: Number of decompressed bytes written
+    """
+    with open(path, "wb") as file:
+        writer = decompressing_writer(encoding, file)
+        writer.write(data)
+        writer.close()
+    return writer.size
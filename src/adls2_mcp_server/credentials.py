@@ -0,0 +1,98 @@
+import logging
+from typing import Optional
+
+from azure.core.credentials import AzureNamedKeyCredential
+from azure.identity import TokenCachePersistenceOptions
+from azure.identity.aio import (
+    AzureCliCredential,
+    AzureDeveloperCliCredential,
+    AzurePowerShellCredential,
+    DefaultAzureCredential,
+    EnvironmentCredential,
+    ManagedIdentityCredential,
+    WorkloadIdentityCredential,
+)
+
+logger = logging.getLogger(__name__)
+
+# Scope of the tokens used for storage requests
+STORAGE_SCOPE = "https://storage.azure.com/.default"
+
+# Name of the persistent token cache shared by the server's processes
+TOKEN_CACHE_NAME = "adls2-mcp-server"
+
+SHARED_KEY = "shared_key"
+
+_TOKEN_CREDENTIALS = {
+    "default": DefaultAzureCredential,
+    "environment": EnvironmentCredential,
+    "managed_identity": ManagedIdentityCredential,
+    "workload_identity": WorkloadIdentityCredential,
+    "cli": AzureCliCredential,
+    "developer_cli": AzureDeveloperCliCredential,
+    "powershell": AzurePowerShellCredential,
+}
+
+# Credential types whose tokens can be kept in a persistent cache. The
+# others either keep their own cache (the CLIs) or cannot use one.
+_PERSISTENT_CACHE_TYPES = {"environment", "workload_identity"}
+
+CREDENTIAL_TYPES = (SHARED_KEY, *_TOKEN_CREDENTIALS)
+
+
+def resolve_credential_type(account_key: Optional[str] = None, credential_type: Optional[str] = None) -> str:
+    """Normalize a credential type, choosing one when it is not set.
+
+    Without an explicit type, the account key is used when one is set and
+    DefaultAzureCredential otherwise.
+    """
+    return (credential_type or (SHARED_KEY if account_key else "default")).lower().replace("-", "_")
+
+
+def create_credential(
+    account_name: str,
+    account_key: Optional[str] = None,
+    credential_type: Optional[str] = None,
+    persist_token_cache: bool = True,
+    allow_unencrypted_token_cache: bool = False,
+):
+    """Create the credential used to authenticate storage requests.
+
+    The type is chosen by resolve_credential_type. Pinning a type skips the
+    default credential chain and its probes.
+
+    Args:
+        account_name: Storage account name
+        account_key: Storage account key, if any
+        credential_type: One of CREDENTIAL_TYPES, or None to choose automatically
+        persist_token_cache: Keep tokens in a persistent cache where the
+            credential type supports it
+        allow_unencrypted_token_cache: Fall back to an unencrypted cache file
+            when no secure storage is available
+
+    Returns:
+        An AzureNamedKeyCredential or an async token credential
+
+    Raises:
+        ValueError: If the credential type is unknown or its settings are missing
+    """
+    credential_type = resolve_credential_type(account_key, credential_type)
+
+    if credential_type == SHARED_KEY:
+        if not account_key:
+            raise ValueError("AZURE_CREDENTIAL_TYPE is shared_key but AZURE_STORAGE_ACCOUNT_KEY is not set")
+        logger.info("Authenticating with the storage account key")
+        return AzureNamedKeyCredential(account_name, account_key)
+
+    if credential_type not in _TOKEN_CREDENTIALS:
+        raise ValueError(
+            f"Unknown AZURE_CREDENTIAL_TYPE {credential_type!r}, expected one of {', '.join(CREDENTIAL_TYPES)}"
+        )
+
+    kwargs = {}
+    if persist_token_cache and credential_type in _PERSISTENT_CACHE_TYPES:
+        kwargs["cache_persistence_options"] = TokenCachePersistenceOptions(
+            name=TOKEN_CACHE_NAME, allow_unencrypted_storage=allow_unencrypted_token_cache
+        )
+    logger.info(f"Authenticating with the {credential_type} credential")
+    return _TOKEN_CREDENTIALS[credential_type](**kwargs)
@@ -0,0 +1,114 @@
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+MD5 = "md5"
+
+# Digests that can be computed on top of MD5, which every transfer computes
+# for Content-MD5
+HASH_ALGORITHMS = ("sha256", "crc64", "xxh64", "xxh3_128")
+
+
+class IntegrityError(ValueError):
+    """Raised when transferred data does not match the digest stored with it."""
+
+
+class _Crc64:
+    """The CRC64 Azure Storage uses for transactional checksums."""
+
+    def __init__(self):
+        from azure.storage.extensions import checksums
+
+        self._crc64 = checksums.crc64
+        self._value = 0
+
+    def update(self, data: bytes) -> None:
+        self._value = self._crc64.compute(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:016x}"
+
+
+def _new_hash(algorithm: str):
+    if algorithm == "crc64":
+        try:
+            return _Crc64()
+        except ImportError:
+            raise ValueError(
+                "crc64 needs the azure-storage-extensions package; install it with pip install azure-storage-extensions"
+            ) from None
+    if algorithm in ("xxh64", "xxh3_128"):
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError(f"{algorithm} needs the xxhash package; install it with pip install xxhash") from None
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def resolve_hashes(hashes: Optional[List[str]]) -> List[str]:
+    """Validate the digests asked for on top of MD5.
+
+    Args:
+        hashes: Names from HASH_ALGORITHMS, or None for none
+
+    Returns:
+        List[str]: The distinct algorithms, lower-cased, without md5
+
+    Raises:
+        ValueError: If an algorithm is unknown or its package is not installed
+    """
+    algorithms = []
+    for name in hashes or []:
+        algorithm = name.lower()
+        if algorithm == MD5 or algorithm in algorithms:
+            continue
+        if algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"hashes must be among {', '.join((MD5,) + HASH_ALGORITHMS)}")
+        _new_hash(algorithm)
+        algorithms.append(algorithm)
+    return algorithms
+
+
+class StreamHasher:
+    """MD5 and other digests of a byte stream, fed in order as it is transferred.
+
+    Updates release the GIL for large blocks in hashlib, so they are meant
+    to run in a worker thread alongside the transfer.
+    """
+
+    def __init__(self, algorithms: Iterable[str] = ()):
+        self._md5 = hashlib.md5()
+        self._hashes = [self._md5] + [_new_hash(algorithm) for algorithm in algorithms]
+        self._names = [MD5] + list(algorithms)
+
+    def update(self, data: bytes) -> None:
+        """Add the next bytes of the stream."""
+        for digest in self._hashes:
+            digest.update(data)
+
+    def md5(self) -> bytes:
+        """The MD5 digest of the stream so far, as Content-MD5 holds it."""
+        return self._md5.digest()
+
+    def hexdigests(self) -> Dict[str, str]:
+        """Every digest of the stream so far, in hex."""
+        return {name: digest.hexdigest() for name, digest in zip(self._names, self._hashes)}
+
+
+def verify_md5(name: str, expected: Optional[bytes], hasher: StreamHasher) -> Optional[bool]:
+    """Check a stream's MD5 against the Content-MD5 stored with it.
+
+    Returns:
+        Optional[bool]: True if the digests match, None if none was stored
+
+    Raises:
+        IntegrityError: If the digests differ
+    """
+    if not expected:
+        return None
+    actual = hasher.md5()
+    if bytes(expected) != actual:
+        raise IntegrityError(
+            f"Content-MD5 mismatch for {name}: stored {bytes(expected).hex()}, received {actual.hex()}"
+        )
+    return True
@@ -0,0 +1,424 @@
+import asyncio
+import fnmatch
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+# Defaults for the parallel tree walker. The top fanout_depth levels are
+# listed one level at a time, and each subtree below them is listed with a
+# single recursive listing, with at most max_concurrency listings in flight.
+DEFAULT_LIST_CONCURRENCY = 8
+DEFAULT_FANOUT_DEPTH = 2
+
+
+@dataclass
+class PathEntry:
+    """A file or directory returned by a listing."""
+    name: str
+    is_directory: bool = False
+    size: int = 0
+    last_modified: Optional[datetime] = None
+    etag: str = ""
+
+    def __post_init__(self):
+        self.last_modified = _as_utc(self.last_modified)
+
+    @classmethod
+    def from_properties(cls, path) -> "PathEntry":
+        """Create an entry from the SDK's PathProperties."""
+        return cls(
+            name=path.name,
+            is_directory=bool(path.is_directory),
+            size=path.content_length or 0,
+            last_modified=path.last_modified,
+            etag=path.etag or "",
+        )
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive timestamps from the service as UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, assuming UTC when no offset is given.
+
+    Raises:
+        ValueError: If the value is not a valid ISO 8601 timestamp
+    """
+    if not value:
+        return None
+    return _as_utc(datetime.fromisoformat(value))
+
+
+@dataclass
+class PathFilter:
+    """Predicates applied to listing entries as pages are received.
+
+    A glob pattern without a "/" is matched against the last path segment,
+    otherwise against the full path. Size bounds are inclusive and
+    modified_since/modified_before bound the last modified time.
+    """
+    pattern: Optional[str] = None
+    regex: Optional[str] = None
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    modified_since: Optional[datetime] = None
+    modified_before: Optional[datetime] = None
+    files_only: bool = False
+    dirs_only: bool = False
+
+    def __post_init__(self):
+        if self.files_only and self.dirs_only:
+            raise ValueError("files_only and dirs_only cannot both be set")
+        self._regex = re.compile(self.regex) if self.regex else None
+        self.modified_since = _as_utc(self.modified_since)
+        self.modified_before = _as_utc(self.modified_before)
+
+    def matches(self, entry: PathEntry) -> bool:
+        """Whether the entry passes every configured predicate."""
+        if self.files_only and entry.is_directory:
+            return False
+        if self.dirs_only and not entry.is_directory:
+            return False
+        if self.pattern is not None:
+            target = entry.name if "/" in self.pattern else entry.name.rsplit("/", 1)[-1]
+            if not fnmatch.fnmatchcase(target, self.pattern):
+                return False
+        if self._regex is not None and not self._regex.search(entry.name):
+            return False
+        if self.min_size is not None and entry.size < self.min_size:
+            return False
+        if self.max_size is not None and entry.size > self.max_size:
+            return False
+        if self.modified_since is not None or self.modified_before is not None:
+            if entry.last_modified is None:
+                return False
+            if self.modified_since is not None and entry.last_modified < self.modified_since:
+                return False
+            if self.modified_before is not None and entry.last_modified >= self.modified_before:
+                return False
+        return True
+
+
+@dataclass
+class PathListing:
+    """One page of a directory listing.
+
+    continuation_token is set when more paths remain; pass it back to
+    directory_get_paths to fetch the next page.
+    """
+    entries: List[PathEntry] = field(default_factory=list)
+    continuation_token: Optional[str] = None
+
+    @property
+    def paths(self) -> List[str]:
+        """Names of the listed paths."""
+        return [entry.name for entry in self.entries]
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Per-path details as parallel arrays aligned with paths.
+
+        A columnar layout keeps large listings compact compared to one
+        dict per path.
+        """
+        return {
+            "is_directory": [entry.is_directory for entry in self.entries],
+            "size": [entry.size for entry in self.entries],
+            "last_modified": [
+                entry.last_modified.isoformat() if entry.last_modified else "" for entry in self.entries
+            ],
+            "etag": [entry.etag for entry in self.entries],
+        }
+
+
+async def walk_tree(
+    file_system_client,
+    directory: str,
+    max_concurrency: int = DEFAULT_LIST_CONCURRENCY,
+    fanout_depth: int = DEFAULT_FANOUT_DEPTH,
+    path_filter: Optional[PathFilter] = None,
+) -> List[PathEntry]:
+    """Recursively list a directory by fanning out subtree listings.
+
+    A single recursive listing is one serial stream of pages. On wide
+    hierarchies (for example year/month/day partitions) it is faster to list
+    the top levels non-recursively and then list the subtrees below them
+    concurrently. Entries are returned in pre-order: every directory is
+    followed by its contents.
+
+    Args:
+        file_system_client: Async FileSystemClient to list from
+        directory: Path of the directory to list
+        max_concurrency: Maximum number of listings in flight
+        fanout_depth: Number of levels listed non-recursively before subtrees
+            are listed recursively
+        path_filter: Only entries matching this filter are returned. Filtered
+            out directories are still walked.
+
+    Returns:
+        List[PathEntry]: All matching entries under the directory
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    def keep(entry: PathEntry) -> bool:
+        return path_filter is None or path_filter.matches(entry)
+
+    async def list_level(path: Optional[str]) -> List[PathEntry]:
+        async with semaphore:
+            return [
+                PathEntry.from_properties(properties)
+                async for properties in file_system_client.get_paths(path=path, recursive=False)
+            ]
+
+    async def list_subtree(path: str) -> List[PathEntry]:
+        async with semaphore:
+            entries = []
+            async for properties in file_system_client.get_paths(path=path, recursive=True):
+                entry = PathEntry.from_properties(properties)
+                if keep(entry):
+                    entries.append(entry)
+            return entries
+
+    async def walk(path: Optional[str], depth: int) -> List[PathEntry]:
+        level = await list_level(path)
+        subtrees = iter(await asyncio.gather(
+            *(
+                walk(entry.name, depth + 1) if depth + 1 < fanout_depth else list_subtree(entry.name)
+                for entry in level if entry.is_directory
+            )
+        ))
+
+        entries = []
+        for entry in level:
+            if keep(entry):
+                entries.append(entry)
+            if entry.is_directory:
+                entries.extend(next(subtrees))
+        return entries
+
+    return await walk(directory.strip("/") or None, 0)
+
+
+def _is_under(path: str, directory: str) -> bool:
+    """Whether path is directory itself or anywhere below it."""
+    return not directory or path == directory or path.startswith(directory + "/")
+
+
+def _parent(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+ListingKey = Tuple[str, str, bool]
+
+# Number of recent writes remembered to decide whether a listing fetched
+# while they happened is still current
+WRITE_LOG_SIZE = 1024
+
+
+class ListingCache:
+    """Size-bounded cache of full, unfiltered directory listings.
+
+    Listings are keyed by (filesystem, directory, recursive) and evicted in
+    least recently used order once the total number of cached entries
+    exceeds max_entries. Writes made through this server patch the cached
+    listings they affect in place instead of invalidating everything.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries across all listings. 0 disables the cache.
+            ttl: Seconds after which a listing is stale and should be refreshed
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Incremented on every patch, with the patched path logged, so a
+        # refresh started before a write to its directory does not
+        # overwrite the patched listing with older results
+        self.generation = 0
+        self._writes: "deque[Tuple[str, str]]" = deque(maxlen=WRITE_LOG_SIZE)
+        # Each listing maps entry names to entries, in listing order
+        self._listings: "OrderedDict[ListingKey, Tuple[float, Dict[str, PathEntry]]]" = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def key(filesystem: str, directory: str, recursive: bool) -> ListingKey:
+        return (filesystem, directory.strip("/"), recursive)
+
+    def get(self, key: ListingKey) -> Tuple[Optional[List[PathEntry]], bool]:
+        """Return the cached entries for key and whether they are stale."""
+        cached = self._listings.get(key)
+        if cached is None:
+            self.misses += 1
+            return None, False
+        self._listings.move_to_end(key)
+        self.hits += 1
+        return list(cached[1].values()), time.monotonic() - cached[0] > self.ttl
+
+    def set(self, key: ListingKey, entries: List[PathEntry], generation: Optional[int] = None) -> None:
+        """Store a full listing.
+
+        Args:
+            key: Listing key
+            entries: Every entry of the listing
+            generation: Generation observed before the listing was fetched. The
+                listing is discarded if a write since may have changed it.
+        """
+        if self.max_entries <= 0 or len(entries) > self.max_entries:
+            return
+        if generation is not None and self._written_since(key, generation):
+            return
+        self._drop(key)
+        self._listings[key] = (time.monotonic(), {entry.name: entry for entry in entries})
+        self._size += len(entries)
+        self._evict()
+
+    def _patched(self, filesystem: str, path: str) -> None:
+        """Record a write to path, or to everything in the filesystem if path is empty."""
+        self.generation += 1
+        self._writes.append((filesystem, path))
+
+    def _written_since(self, key: ListingKey, generation: int) -> bool:
+        """Whether a write since generation may have changed the listing for key."""
+        writes = self.generation - generation
+        if writes <= 0:
+            return False
+        if writes > len(self._writes):
+            # The log no longer reaches back that far
+            return True
+        filesystem, directory, _ = key
+        return any(
+            written_filesystem == filesystem and (_is_under(path, directory) or _is_under(directory, path))
+            for written_filesystem, path in list(self._writes)[-writes:]
+        )
+
+    def _evict(self) -> None:
+        """Drop least recently used listings until the cache is within max_entries."""
+        while self._size > self.max_entries and self._listings:
+            _, (_, evicted) = self._listings.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _drop(self, key: ListingKey) -> None:
+        cached = self._listings.pop(key, None)
+        if cached is not None:
+            self._size -= len(cached[1])
+
+    def _covering(self, filesystem: str, path: str) -> List[ListingKey]:
+        """Keys of the cached listings that would include path."""
+        keys = []
+        for key in self._listings:
+            key_filesystem, directory, recursive = key
+            if key_filesystem != filesystem or path == directory:
+                continue
+            if _parent(path) == directory or (recursive and _is_under(path, directory)):
+                keys.append(key)
+        return keys
+
+    def add(self, filesystem: str, entry: PathEntry) -> None:
+        """Insert or replace an entry, adding missing parent directories."""
+        self._patched(filesystem, entry.name)
+        parent = _parent(entry.name)
+        if parent:
+            self._add_directory(filesystem, parent, entry.last_modified)
+        for key in self._covering(filesystem, entry.name):
+            entries = self._listings[key][1]
+            if entry.name not in entries:
+                self._size += 1
+            entries[entry.name] = entry
+        self._evict()
+
+    def _add_directory(self, filesystem: str, path: str, last_modified: Optional[datetime]) -> None:
+        """Add an implicitly created directory to the listings that miss it."""
+        parent = _parent(path)
+        if parent:
+            self._add_directory(filesystem, parent, last_modified)
+        for key in self._covering(filesystem, path):
+            entries = self._listings[key][1]
+            if path not in entries:
+                entries[path] = PathEntry(name=path, is_directory=True, last_modified=last_modified)
+                self._size += 1
+
+    def remove(self, filesystem: str, path: str) -> List[PathEntry]:
+        """Remove a path and everything under it.
+
+        Listings of directories at or under path are dropped.
+
+        Returns:
+            List[PathEntry]: The removed entries that were cached
+        """
+        path = path.strip("/")
+        self._patched(filesystem, path)
+        removed: Dict[str, PathEntry] = {}
+        for key in list(self._listings):
+            if key[0] != filesystem:
+                continue
+            if _is_under(key[1], path):
+                self._drop(key)
+                continue
+            entries = self._listings[key][1]
+            for name in [name for name in entries if _is_under(name, path)]:
+                removed[name] = entries.pop(name)
+                self._size -= 1
+        return list(removed.values())
+
+    def move(self, filesystem: str, source: str, destination: str) -> None:
+        """Rename a path and everything under it in the cached listings.
+
+        Listings that would include the destination but cannot be patched
+        completely, because the moved entries were not fully cached, are
+        dropped instead.
+        """
+        source = source.strip("/")
+        destination = destination.strip("/")
+        subtree_known = any(
+            key[0] == filesystem and key[2] and source != key[1] and _is_under(source, key[1])
+            for key in self._listings
+        )
+        moved = self.remove(filesystem, source)
+        top = next((entry for entry in moved if entry.name == source), None)
+
+        for key in self._covering(filesystem, destination):
+            if top is None or (key[2] and top.is_directory and not subtree_known):
+                self._drop(key)
+
+        for entry in moved:
+            self.add(filesystem, replace(entry, name=destination + entry.name[len(source):]))
+
+    def invalidate(self, filesystem: str, path: str) -> None:
+        """Drop every listing that includes path or lies under it.
+
+        Used when a write may have partially applied, so the listings it
+        touched cannot be patched reliably.
+        """
+        path = path.strip("/")
+        self._patched(filesystem, path)
+        keys = set(self._covering(filesystem, path))
+        keys.update(key for key in self._listings if key[0] == filesystem and _is_under(key[1], path))
+        for key in keys:
+            self._drop(key)
+
+    def clear_filesystem(self, filesystem: str) -> None:
+        """Drop every listing of a filesystem."""
+        self._patched(filesystem, "")
+        for key in [key for key in self._listings if key[0] == filesystem]:
+            self._drop(key)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "listings": len(self._listings),
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
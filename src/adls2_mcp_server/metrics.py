@@ -0,0 +1,234 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Default number of seconds between two writes of the Prometheus file
+DEFAULT_EXPORT_INTERVAL = 15.0
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# A collected value: metric name, labels and value
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Histogram:
+    """Counts of observed values in fixed buckets, with their count, sum and maximum."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket, capped at the maximum."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and estimated percentiles, in seconds."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+class MetricsRegistry:
+    """In-process counters and latency histograms.
+
+    Recording is a dict lookup and a few additions, cheap enough for every
+    tool call and storage request. Values owned by other objects, such as
+    cache hit counts, are read through collectors when a snapshot is taken.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in a histogram."""
+        series = self._histograms.setdefault(name, {})
+        key = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        """Add to a counter."""
+        series = self._counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + amount
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callable that yields (name, labels, value) samples on collection.
+
+        Following the Prometheus naming convention, samples whose name ends
+        in _total are exported as counters and the others as gauges.
+        """
+        self._collectors.append(collector)
+
+    def _collect(self) -> Dict[str, Dict[Labels, float]]:
+        collected: Dict[str, Dict[Labels, float]] = {}
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    collected.setdefault(name, {})[_labels(labels)] = value
+            except Exception as e:
+                logger.warning(f"Error collecting metrics: {e}")
+        return collected
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain data, with histogram times in milliseconds."""
+        metrics: Dict[str, Any] = {"uptime_seconds": time.time() - self.started_at}
+        for name, series in self._histograms.items():
+            metrics[name] = []
+            for labels, histogram in list(series.items()):
+                summary = {key: value * 1000 for key, value in histogram.summary().items() if key != "count"}
+                metrics[name].append({**dict(labels), "count": histogram.count, **summary})
+        for name, series in list(self._counters.items()) + list(self._collect().items()):
+            metrics[name] = [{**dict(labels), "value": value} for labels, value in list(series.items())]
+        return metrics
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, series in self._histograms.items():
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in list(series.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', str(bound)))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, series in self._counters.items():
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in list(series.items()))
+        for name, series in self._collect().items():
+            lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.extend(f"{name}{_format_labels(labels)} {value}" for labels, value in series.items())
+        lines.append("# TYPE adls2_uptime_seconds gauge")
+        lines.append(f"adls2_uptime_seconds {time.time() - self.started_at}")
+        return "\n".join(lines) + "\n"
+
+
+# Metrics of this server process
+METRICS = MetricsRegistry()
+
+
+def instrument_tool(name: str, fn: Callable) -> Callable:
+    """Wrap an async tool function to record its latency and errors.
+
+    A call counts as an error if it raises, or if it returns a dict with a
+    non-empty error or success set to False.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await fn(*args, **kwargs)
+            failed = isinstance(result, dict) and (bool(result.get("error")) or result.get("success") is False)
+            return result
+        finally:
+            METRICS.observe("adls2_tool_duration_seconds", time.perf_counter() - started, tool=name)
+            METRICS.inc("adls2_tool_calls_total", tool=name)
+            if failed:
+                METRICS.inc("adls2_tool_errors_total", tool=name)
+
+    return wrapper
+
+
+def _write_atomically(path: str, text: str) -> None:
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        file.write(text)
+    os.replace(temp_path, path)
+
+
+async def export_to_file(registry: MetricsRegistry, path: str, interval: float = DEFAULT_EXPORT_INTERVAL) -> None:
+    """Rewrite a Prometheus text file every interval seconds until cancelled.
+
+    The file is replaced atomically, as the node_exporter textfile collector
+    expects. A last write is made on cancellation.
+    """
+    try:
+        while True:
+            await asyncio.to_thread(_write_atomically, path, registry.render_prometheus())
+            await asyncio.sleep(interval)
+    except asyncio.CancelledError:
+        await asyncio.to_thread(_write_atomically, path, registry.render_prometheus())
+        raise
+    except Exception as e:
+        logger.error(f"Error writing metrics to {path}: {e}")
+
+
+async def serve_prometheus(registry: MetricsRegistry, host: str, port: int):
+    """Serve the metrics at http://host:port/metrics.
+
+    Returns:
+        The aiohttp AppRunner, to be cleaned up on shutdown
+    """
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=registry.render_prometheus(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Serving metrics at http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,522 @@
+import logging
+import struct
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Magic bytes at the start and end of a Parquet file, and at the end of one
+# whose footer is encrypted
+MAGIC = b"PAR1"
+ENCRYPTED_MAGIC = b"PARE"
+
+# Length of the trailer: the 4-byte footer length and the magic bytes
+TRAILER_SIZE = 8
+
+# Bytes read from the end of the file in the first request. A footer that
+# fits, which is most of them, then costs a single request.
+DEFAULT_FOOTER_READ_SIZE = 64 * 1024
+
+# Default cap on the footer length. The length comes from the file itself,
+# so without a cap a corrupt or hostile trailer could make one call read and
+# hold gigabytes.
+DEFAULT_MAX_FOOTER_SIZE = 32 * 1024 * 1024
+
+# Default number of row groups described in a response
+DEFAULT_MAX_ROW_GROUPS = 100
+
+PHYSICAL_TYPES = [
+    "BOOLEAN", "INT32", "INT64", "INT96", "FLOAT", "DOUBLE", "BYTE_ARRAY", "FIXED_LEN_BYTE_ARRAY",
+]
+REPETITIONS = ["REQUIRED", "OPTIONAL", "REPEATED"]
+CONVERTED_TYPES = [
+    "UTF8", "MAP", "MAP_KEY_VALUE", "LIST", "ENUM", "DECIMAL", "DATE", "TIME_MILLIS", "TIME_MICROS",
+    "TIMESTAMP_MILLIS", "TIMESTAMP_MICROS", "UINT_8", "UINT_16", "UINT_32", "UINT_64", "INT_8", "INT_16",
+    "INT_32", "INT_64", "JSON", "BSON", "INTERVAL",
+]
+CODECS = ["UNCOMPRESSED", "SNAPPY", "GZIP", "LZO", "BROTLI", "LZ4", "ZSTD", "LZ4_RAW"]
+LOGICAL_TYPES = {
+    1: "STRING", 2: "MAP", 3: "LIST", 4: "ENUM", 5: "DECIMAL", 6: "DATE", 7: "TIME", 8: "TIMESTAMP",
+    10: "INTEGER", 11: "UNKNOWN", 12: "JSON", 13: "BSON", 14: "UUID", 15: "FLOAT16", 16: "VARIANT",
+    17: "GEOMETRY", 18: "GEOGRAPHY",
+}
+TIME_UNITS = {1: "MILLIS", 2: "MICROS", 3: "NANOS"}
+
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Thrift compact protocol type codes
+_STOP, _TRUE, _FALSE, _BYTE, _I16, _I32, _I64, _DOUBLE, _BINARY, _LIST, _SET, _MAP, _STRUCT = range(13)
+
+
+class ParquetError(ValueError):
+    """The file is not a Parquet file, or its footer cannot be read."""
+
+
+class _CompactReader:
+    """Decodes Thrift compact protocol structs into dicts keyed by field id.
+
+    Parquet metadata is a handful of Thrift structs. Decoding them
+    generically, and picking fields by id afterwards, avoids depending on
+    a Thrift or Parquet library to read a footer.
+    """
+
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._position = 0
+
+    def _byte(self) -> int:
+        value = self._data[self._position]
+        self._position += 1
+        return value
+
+    def _varint(self) -> int:
+        result = shift = 0
+        while True:
+            byte = self._byte()
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def _zigzag(self) -> int:
+        value = self._varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def _value(self, kind: int) -> Any:
+        if kind == _TRUE:
+            return True
+        if kind == _FALSE:
+            return False
+        if kind == _BYTE:
+            return struct.unpack("b", bytes([self._byte()]))[0]
+        if kind in (_I16, _I32, _I64):
+            return self._zigzag()
+        if kind == _DOUBLE:
+            value = struct.unpack_from("<d", self._data, self._position)[0]
+            self._position += 8
+            return value
+        if kind == _BINARY:
+            length = self._varint()
+            value = bytes(self._data[self._position:self._position + length])
+            self._position += length
+            return value
+        if kind in (_LIST, _SET):
+            header = self._byte()
+            size = header >> 4
+            if size == 15:
+                size = self._varint()
+            element = header & 0x0F
+            if element in (_TRUE, _FALSE):
+                return [self._byte() == _TRUE for _ in range(size)]
+            return [self._value(element) for _ in range(size)]
+        if kind == _MAP:
+            size = self._varint()
+            if not size:
+                return {}
+            types = self._byte()
+            return {self._value(types >> 4): self._value(types & 0x0F) for _ in range(size)}
+        if kind == _STRUCT:
+            return self.read_struct()
+        raise ParquetError(f"Unknown Thrift compact type {kind}")
+
+    def read_struct(self) -> Dict[int, Any]:
+        """Read a struct as a dict from field id to value."""
+        fields: Dict[int, Any] = {}
+        field_id = 0
+        while True:
+            header = self._byte()
+            kind = header & 0x0F
+            if kind == _STOP:
+                return fields
+            delta = header >> 4
+            field_id = field_id + delta if delta else self._zigzag()
+            fields[field_id] = self._value(kind)
+
+
+def _enum(names: List[str], value: Optional[int]) -> Optional[str]:
+    if value is None:
+        return None
+    return names[value] if 0 <= value < len(names) else str(value)
+
+
+def _text(value: Optional[bytes]) -> Optional[str]:
+    return value.decode("utf-8", errors="replace") if value is not None else None
+
+
+@dataclass
+class ParquetColumn:
+    """A leaf column of the schema."""
+    name: str
+    physical_type: str
+    logical_type: Optional[str] = None
+    repetition: Optional[str] = None
+    type_length: Optional[int] = None
+    scale: Optional[int] = None
+    time_unit: Optional[str] = None
+
+
+@dataclass
+class ParquetColumnChunk:
+    """A column within one row group."""
+    name: str
+    codec: str
+    num_values: int
+    compressed_size: int
+    uncompressed_size: int
+    min: Any = None
+    max: Any = None
+    null_count: Optional[int] = None
+    distinct_count: Optional[int] = None
+
+
+@dataclass
+class ParquetRowGroup:
+    """A row group and its column chunks."""
+    num_rows: int
+    total_byte_size: int
+    compressed_size: int
+    columns: List[ParquetColumnChunk] = field(default_factory=list)
+
+
+@dataclass
+class ParquetMetadata:
+    """The decoded footer of a Parquet file."""
+    version: int
+    num_rows: int
+    created_by: Optional[str]
+    columns: List[ParquetColumn]
+    row_groups: List[ParquetRowGroup]
+    key_value_metadata: Dict[str, str] = field(default_factory=dict)
+    footer_size: int = 0
+
+
+def _logical_type(element: Dict[int, Any]) -> Optional[str]:
+    """Describe the logical type of a schema element, falling back to its converted type."""
+    logical = element.get(10)
+    if logical:
+        kind, details = next(iter(logical.items()))
+        name = LOGICAL_TYPES.get(kind, str(kind))
+        if name == "DECIMAL":
+            return f"DECIMAL({details.get(2)},{details.get(1)})"
+        if name in ("TIME", "TIMESTAMP"):
+            unit = _time_unit(element) or "?"
+            return f"{name}({unit}{', UTC' if details.get(1) else ''})"
+        if name == "INTEGER":
+            return f"{'INT' if details.get(2) else 'UINT'}{details.get(1)}"
+        return name
+    converted = _enum(CONVERTED_TYPES, element.get(6))
+    if converted == "DECIMAL":
+        return f"DECIMAL({element.get(8)},{element.get(7)})"
+    return converted
+
+
+def _time_unit(element: Dict[int, Any]) -> Optional[str]:
+    """The unit of a TIME or TIMESTAMP schema element."""
+    logical = element.get(10) or {}
+    details = logical.get(7) or logical.get(8)
+    if details:
+        return TIME_UNITS.get(next(iter(details.get(2) or {0: None})))
+    converted = _enum(CONVERTED_TYPES, element.get(6)) or ""
+    if converted.startswith(("TIME_", "TIMESTAMP_")):
+        return converted.rsplit("_", 1)[1]
+    return None
+
+
+def _scale(element: Dict[int, Any]) -> Optional[int]:
+    """The scale of a DECIMAL schema element."""
+    decimal = (element.get(10) or {}).get(5)
+    return decimal.get(1) if decimal else element.get(7)
+
+
+def _leaf_columns(schema: List[Dict[int, Any]]) -> List[ParquetColumn]:
+    """Flatten the depth-first schema list into its leaf columns, named by dotted path."""
+    columns: List[ParquetColumn] = []
+    position = 1
+
+    def walk(prefix: str, count: int) -> None:
+        nonlocal position
+        for _ in range(count):
+            element = schema[position]
+            position += 1
+            name = prefix + _text(element.get(4))
+            children = element.get(5)
+            if children:
+                walk(name + ".", children)
+            else:
+                columns.append(ParquetColumn(
+                    name=name,
+                    physical_type=_enum(PHYSICAL_TYPES, element.get(1)),
+                    logical_type=_logical_type(element),
+                    repetition=_enum(REPETITIONS, element.get(3)),
+                    type_length=element.get(2),
+                    scale=_scale(element),
+                    time_unit=_time_unit(element),
+                ))
+
+    if schema:
+        walk("", schema[0].get(5) or 0)
+    return columns
+
+
+def _decode_stat(value: Optional[bytes], column: ParquetColumn) -> Any:
+    """Decode a min or max statistic to a value that orders like the column.
+
+    Unrecognized types are left as bytes, which order like unsigned bytes.
+    """
+    if value is None:
+        return None
+    physical = column.physical_type
+    logical = column.logical_type or ""
+    try:
+        if physical == "BOOLEAN":
+            return bool(value[0])
+        if physical in ("INT32", "INT64"):
+            number = int.from_bytes(value, "little", signed=not logical.startswith("UINT"))
+            if logical.startswith("DECIMAL"):
+                return Decimal(number).scaleb(-(column.scale or 0))
+            if logical == "DATE":
+                return date(1970, 1, 1) + timedelta(days=number)
+            if logical.startswith("TIMESTAMP"):
+                per_second = {"MILLIS": 10**3, "MICROS": 10**6, "NANOS": 10**9}.get(column.time_unit, 10**6)
+                moment = _UNIX_EPOCH + timedelta(microseconds=number * 10**6 // per_second)
+                return moment if "UTC" in logical else moment.replace(tzinfo=None)
+            return number
+        if physical == "FLOAT":
+            return struct.unpack("<f", value)[0]
+        if physical == "DOUBLE":
+            return struct.unpack("<d", value)[0]
+        if logical.startswith("DECIMAL"):
+            return Decimal(int.from_bytes(value, "big", signed=True)).scaleb(-(column.scale or 0))
+        if physical == "BYTE_ARRAY" and logical in ("STRING", "UTF8", "ENUM", "JSON"):
+            return value.decode("utf-8")
+    except (ValueError, OverflowError, struct.error, IndexError):
+        pass
+    return value
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert a decoded statistic for a JSON response."""
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _column_chunk(chunk: Dict[int, Any], column: ParquetColumn) -> ParquetColumnChunk:
+    meta = chunk.get(3) or {}
+    stats = meta.get(12) or {}
+    low, high = stats.get(6), stats.get(5)
+    if low is None and high is None and column.physical_type not in ("BYTE_ARRAY", "FIXED_LEN_BYTE_ARRAY"):
+        # Deprecated fields, only trustworthy for signed numeric orderings
+        low, high = stats.get(2), stats.get(1)
+    return ParquetColumnChunk(
+        name=column.name,
+        codec=_enum(CODECS, meta.get(4)),
+        num_values=meta.get(5, 0),
+        compressed_size=meta.get(7, 0),
+        uncompressed_size=meta.get(6, 0),
+        min=_decode_stat(low, column),
+        max=_decode_stat(high, column),
+        null_count=stats.get(3),
+        distinct_count=stats.get(4),
+    )
+
+
+def parse_metadata(data: bytes) -> ParquetMetadata:
+    """Decode a Thrift compact FileMetaData block.
+
+    Args:
+        data: The footer, without its trailer
+
+    Returns:
+        ParquetMetadata: The schema, row groups and key-value metadata
+
+    Raises:
+        ParquetError: If the block cannot be decoded
+    """
+    try:
+        fields = _CompactReader(data).read_struct()
+    except (IndexError, struct.error) as e:
+        raise ParquetError(f"Malformed Parquet footer: {e}") from e
+
+    columns = _leaf_columns(fields.get(2) or [])
+    row_groups = []
+    for group in fields.get(4) or []:
+        chunks = group.get(1) or []
+        row_groups.append(ParquetRowGroup(
+            num_rows=group.get(3, 0),
+            total_byte_size=group.get(2, 0),
+            compressed_size=group.get(6) or sum((chunk.get(3) or {}).get(7, 0) for chunk in chunks),
+            columns=[_column_chunk(chunk, column) for chunk, column in zip(chunks, columns)],
+        ))
+    return ParquetMetadata(
+        version=fields.get(1, 0),
+        num_rows=fields.get(3, 0),
+        created_by=_text(fields.get(6)),
+        columns=columns,
+        row_groups=row_groups,
+        key_value_metadata={_text(pair.get(1)): _text(pair.get(2)) for pair in fields.get(5) or []},
+        footer_size=len(data),
+    )
+
+
+def parse_trailer(trailer: bytes) -> int:
+    """Return the footer length from the last 8 bytes of a Parquet file.
+
+    Raises:
+        ParquetError: If the file is not Parquet or its footer is encrypted
+    """
+    magic = trailer[-4:]
+    if magic == ENCRYPTED_MAGIC:
+        raise ParquetError("Parquet files with an encrypted footer are not supported")
+    if len(trailer) < TRAILER_SIZE or magic != MAGIC:
+        raise ParquetError("Not a Parquet file: missing PAR1 magic bytes at the end")
+    return struct.unpack("<I", trailer[-8:-4])[0]
+
+
+async def read_metadata(
+    reader,
+    read_size: int = DEFAULT_FOOTER_READ_SIZE,
+    max_footer_size: int = DEFAULT_MAX_FOOTER_SIZE,
+) -> ParquetMetadata:
+    """Read and decode the footer of a Parquet file.
+
+    The last read_size bytes are read first, in the hope that they hold
+    the whole footer. If the footer is longer, the rest of it is read with
+    a second request.
+
+    Args:
+        reader: RangeReader of the file
+        read_size: Number of bytes to read from the end in the first request
+        max_footer_size: Largest footer read, in bytes
+
+    Returns:
+        ParquetMetadata: The decoded footer
+
+    Raises:
+        ParquetError: If the file is not Parquet, or its footer is malformed
+            or longer than max_footer_size
+    """
+    if reader.size < len(MAGIC) + TRAILER_SIZE:
+        raise ParquetError(f"Not a Parquet file: only {reader.size} bytes long")
+
+    tail_offset = max(0, reader.size - max(read_size, TRAILER_SIZE))
+    tail = await reader.read(tail_offset, reader.size - tail_offset)
+    footer_size = parse_trailer(tail)
+    if footer_size > reader.size - len(MAGIC) - TRAILER_SIZE:
+        raise ParquetError(f"Parquet footer length {footer_size} exceeds the file size")
+    if footer_size > max_footer_size:
+        raise ParquetError(f"Parquet footer length {footer_size} exceeds the limit of {max_footer_size} bytes")
+
+    footer_end = len(tail) - TRAILER_SIZE
+    if footer_size <= footer_end:
+        footer = tail[footer_end - footer_size:footer_end]
+    else:
+        footer_offset = reader.size - TRAILER_SIZE - footer_size
+        footer = await reader.read(footer_offset, footer_size - footer_end) + tail[:footer_end]
+    return parse_metadata(footer)
+
+
+def _summarize_columns(metadata: ParquetMetadata, names: Optional[set]) -> List[Dict[str, Any]]:
+    """File-wide statistics of each column, combined across row groups."""
+    summaries: Dict[str, Dict[str, Any]] = {}
+    for column in metadata.columns:
+        if names is None or column.name in names:
+            summaries[column.name] = {
+                "name": column.name,
+                "physical_type": column.physical_type,
+                "logical_type": column.logical_type,
+                "repetition": column.repetition,
+                "min": None,
+                "max": None,
+                "null_count": 0,
+                "compressed_size": 0,
+                "uncompressed_size": 0,
+            }
+    complete: Dict[str, Tuple[bool, bool]] = {name: (True, True) for name in summaries}
+    for group in metadata.row_groups:
+        for chunk in group.columns:
+            summary = summaries.get(chunk.name)
+            if summary is None:
+                continue
+            summary["compressed_size"] += chunk.compressed_size
+            summary["uncompressed_size"] += chunk.uncompressed_size
+            if chunk.null_count is None or summary["null_count"] is None:
+                summary["null_count"] = None
+            else:
+                summary["null_count"] += chunk.null_count
+            has_min, has_max = complete[chunk.name]
+            try:
+                if chunk.min is None:
+                    has_min = False
+                elif summary["min"] is None or chunk.min < summary["min"]:
+                    summary["min"] = chunk.min
+                if chunk.max is None:
+                    has_max = False
+                elif summary["max"] is None or chunk.max > summary["max"]:
+                    summary["max"] = chunk.max
+            except TypeError:
+                has_min = has_max = False
+            complete[chunk.name] = (has_min, has_max)
+    for name, (has_min, has_max) in complete.items():
+        # A bound missing from any row group is unknown for the file
+        summaries[name]["min"] = _jsonable(summaries[name]["min"]) if has_min else None
+        summaries[name]["max"] = _jsonable(summaries[name]["max"]) if has_max else None
+    return list(summaries.values())
+
+
+def describe(
+    metadata: ParquetMetadata,
+    columns: Optional[List[str]] = None,
+    max_row_groups: int = DEFAULT_MAX_ROW_GROUPS,
+) -> Dict[str, Any]:
+    """Describe a Parquet footer as plain data for a tool response.
+
+    Args:
+        metadata: The decoded footer
+        columns: Names of the columns to describe, or None for all
+        max_row_groups: Maximum number of row groups listed individually
+
+    Returns:
+        Dict with the row count, the schema with file-wide column
+        statistics, and the first max_row_groups row groups
+
+    Raises:
+        ParquetError: If a column is not in the schema
+    """
+    names = set(columns) if columns else None
+    if names:
+        unknown = names - {column.name for column in metadata.columns}
+        if unknown:
+            raise ParquetError(f"Unknown columns: {', '.join(sorted(unknown))}")
+    row_groups = []
+    for group in metadata.row_groups[:max_row_groups]:
+        row_groups.append({
+            "num_rows": group.num_rows,
+            "total_byte_size": group.total_byte_size,
+            "compressed_size": group.compressed_size,
+            "columns": [
+                {**asdict(chunk), "min": _jsonable(chunk.min), "max": _jsonable(chunk.max)}
+                for chunk in group.columns
+                if names is None or chunk.name in names
+            ],
+        })
+    return {
+        "version": metadata.version,
+        "created_by": metadata.created_by,
+        "num_rows": metadata.num_rows,
+        "num_columns": len(metadata.columns),
+        "num_row_groups": len(metadata.row_groups),
+        "footer_size": metadata.footer_size,
+        "columns": _summarize_columns(metadata, names),
+        "row_groups": row_groups,
+        "row_groups_truncated": len(metadata.row_groups) > max_row_groups,
+        "key_value_metadata_keys": list(metadata.key_value_metadata),
+    }
@@ -0,0 +1,157 @@
+import logging
+import re
+import threading
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+from adls2_mcp_server.client import ADLS2Client, ADLS2Config, create_transport
+from adls2_mcp_server.credentials import SHARED_KEY, create_credential, resolve_credential_type
+from adls2_mcp_server.transfer import TransferLimiter
+
+logger = logging.getLogger(__name__)
+
+# Storage account names are 3 to 24 lowercase letters and digits
+_ACCOUNT_NAME = re.compile(r"^[a-z0-9]{3,24}$")
+
+# Entry of AZURE_STORAGE_ACCOUNTS that allows any account
+ANY_ACCOUNT = "*"
+
+
+class ClientPool:
+    """ADLS2 clients by storage account, created on first use.
+
+    All clients send through one connection pool and share one transfer
+    limiter. The account key only belongs to the default account; every
+    other account authenticates with a token credential that is created
+    once and shared, so a single token serves all of them.
+
+    A client unused for account_idle_timeout seconds is dropped, along with
+    its caches. Pooled clients own neither their transport nor their token
+    credential, so calls still running on a dropped client finish normally.
+    """
+
+    def __init__(self, config: Optional[ADLS2Config] = None):
+        """Initialize the pool.
+
+        Args:
+            config: Configuration of the default account, whose settings
+                apply to all accounts. If None, loads from environment
+        """
+        self._config = config or ADLS2Config.from_env()
+        self._clients: Dict[str, ADLS2Client] = {}
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._transport = create_transport(self._config)
+        self._token_credential = None
+        self._transfer_limiter = TransferLimiter(
+            self._config.transfer_max_inflight_bytes, self._config.transfer_max_bandwidth or None
+        )
+
+    @property
+    def read_only(self) -> bool:
+        """Whether the clients are in read-only mode."""
+        return self._config.read_only
+
+    @property
+    def default_account(self) -> str:
+        """The account used when a tool call names none."""
+        return self._config.storage_account_name
+
+    @property
+    def accounts(self) -> List[str]:
+        """The accounts with a live client."""
+        return list(self._clients)
+
+    def request_stats(self) -> Dict[str, Dict[str, float]]:
+        """Request counters of the accounts with a live client."""
+        return {account: client.request_stats for account, client in list(self._clients.items())}
+
+    def cache_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Cache counters of the accounts with a live client."""
+        return {account: client.cache_stats for account, client in list(self._clients.items())}
+
+    def _check_account(self, account: str) -> None:
+        """Reject accounts that are malformed or not allowed."""
+        if not _ACCOUNT_NAME.match(account):
+            raise ValueError(f"Invalid storage account name {account!r}")
+        allowed = self._config.storage_accounts
+        if account != self.default_account and ANY_ACCOUNT not in allowed and account not in allowed:
+            raise ValueError(f"Storage account {account!r} is not listed in AZURE_STORAGE_ACCOUNTS")
+
+    def _credential_for(self, account: str):
+        """Return the credential for an account, creating the shared one if needed."""
+        account_key = self._config.storage_account_key if account == self.default_account else None
+        credential_type = resolve_credential_type(account_key, self._config.credential_type)
+        if credential_type == SHARED_KEY:
+            if not account_key:
+                raise ValueError(f"No account key for storage account {account!r}, and AZURE_CREDENTIAL_TYPE is shared_key")
+            return create_credential(account, account_key, credential_type)
+
+        if self._token_credential is None:
+            self._token_credential = create_credential(
+                account,
+                credential_type=credential_type,
+                persist_token_cache=self._config.token_cache_persistence,
+                allow_unencrypted_token_cache=self._config.token_cache_allow_unencrypted,
+            )
+        return self._token_credential
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop the clients idle for longer than the idle timeout."""
+        timeout = self._config.account_idle_timeout
+        if timeout <= 0:
+            return
+        for account, last_used in list(self._last_used.items()):
+            if now - last_used > timeout:
+                logger.info(f"Dropping idle client for storage account {account}")
+                del self._clients[account]
+                del self._last_used[account]
+
+    def get(self, account: Optional[str] = None) -> ADLS2Client:
+        """Return the client of an account, creating it on first use.
+
+        Args:
+            account: Storage account name. Defaults to the default account.
+
+        Returns:
+            ADLS2Client: The account's client
+
+        Raises:
+            ValueError: If the account is malformed, not allowed, or has no usable credential
+        """
+        account = (account or self.default_account).strip().lower()
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            client = self._clients.get(account)
+            if client is None:
+                self._check_account(account)
+                config = self._config
+                if account != self.default_account:
+                    config = replace(config, storage_account_name=account, storage_account_key=None)
+                client = ADLS2Client(
+                    config,
+                    credential=self._credential_for(account),
+                    transport=self._transport,
+                    transfer_limiter=self._transfer_limiter,
+                )
+                self._clients[account] = client
+                logger.info(f"Created client for storage account {account}")
+            self._last_used[account] = now
+            return client
+
+    async def warm_up(self) -> None:
+        """Create the default account's client and acquire its first token."""
+        await self.get().warm_up()
+
+    async def close(self) -> None:
+        """Close every client, then the shared transport and credential."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._last_used.clear()
+        for client in clients:
+            await client.close()
+        await self._transport.close()
+        if self._token_credential is not None and hasattr(self._token_credential, "close"):
+            await self._token_credential.close()
@@ -0,0 +1,303 @@
+import base64
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default number of bytes a single read returns, and the default cap on it
+DEFAULT_READ_MAX_BYTES = 64 * 1024
+DEFAULT_READ_LIMIT = 1024 * 1024
+
+# Default number of bytes read through to find the start of a line window
+DEFAULT_READ_MAX_SCAN_BYTES = 64 * 1024 * 1024
+
+# Size of the first ranged read when looking for line breaks. Each further
+# read doubles, up to MAX_LINE_CHUNK_SIZE.
+LINE_CHUNK_SIZE = 16 * 1024
+MAX_LINE_CHUNK_SIZE = 4 * 1024 * 1024
+
+BASE64 = "base64"
+
+
+@dataclass
+class RangeRead:
+    """Bytes read from a remote file, and where they came from."""
+    data: bytes
+    offset: int
+    size: int
+    etag: str
+    lines: Optional[int] = None
+    truncated: bool = False
+    bytes_fetched: int = 0
+
+
+class RangeReader:
+    """Ranged reads of one version of a remote file.
+
+    Every read is conditional on the ETag the reader was opened with, so
+    the pieces of a read never come from different versions of the file.
+    """
+
+    def __init__(self, file_client, size: int, etag: str):
+        """Initialize the reader.
+
+        Args:
+            file_client: Async DataLakeFileClient of the file
+            size: Size of the file in bytes
+            etag: ETag of the version to read
+        """
+        self._file_client = file_client
+        self.size = size
+        self.etag = etag
+        self.bytes_fetched = 0
+
+    async def read(self, offset: int, length: int) -> bytes:
+        """Read up to length bytes at offset, less at the end of the file."""
+        length = min(length, self.size - offset)
+        if length <= 0:
+            return b""
+        # Imported here so that loading the tools does not load the Azure SDK
+        from azure.core import MatchConditions
+
+        download = await self._file_client.download_file(
+            offset=offset,
+            length=length,
+            etag=self.etag,
+            match_condition=MatchConditions.IfNotModified,
+            decompress=False,
+        )
+        data = await download.readall()
+        self.bytes_fetched += len(data)
+        return data
+
+    def _result(self, data: bytes, offset: int, lines: Optional[int] = None, truncated: bool = False) -> RangeRead:
+        return RangeRead(
+            data=data,
+            offset=offset,
+            size=self.size,
+            etag=self.etag,
+            lines=lines,
+            truncated=truncated,
+            bytes_fetched=self.bytes_fetched,
+        )
+
+    async def read_bytes(self, offset: int, length: Optional[int], max_bytes: int) -> RangeRead:
+        """Read a byte range.
+
+        Args:
+            offset: Offset of the range. A negative offset counts from the end of the file.
+            length: Length of the range, or None to read to the end of the file
+            max_bytes: Maximum number of bytes returned
+
+        Returns:
+            RangeRead: The bytes, truncated if the range is longer than max_bytes
+        """
+        if offset < 0:
+            offset = max(0, self.size + offset)
+        offset = min(offset, self.size)
+        available = self.size - offset if length is None else min(length, self.size - offset)
+        data = await self.read(offset, min(available, max_bytes))
+        return self._result(data, offset, truncated=available > max_bytes)
+
+    async def read_lines(self, start_line: int, count: int, max_bytes: int, max_scan_bytes: int) -> RangeRead:
+        """Read count lines, starting at the line numbered start_line from 1.
+
+        The file is read in growing chunks from the start until the window
+        is complete, so reaching a window deep into a file costs reading
+        everything before it. That read is capped by max_scan_bytes.
+
+        Args:
+            start_line: Number of the first line to return, from 1
+            count: Number of lines to return
+            max_bytes: Maximum number of bytes returned
+            max_scan_bytes: Maximum number of bytes read to find the window
+
+        Returns:
+            RangeRead: The lines, truncated at the last line break within
+            max_bytes or max_scan_bytes
+
+        Raises:
+            ValueError: If the start of the window lies beyond max_scan_bytes
+        """
+        skip = start_line - 1
+        position = 0
+        start = 0 if skip == 0 else None
+        buffer = bytearray()
+        chunk_size = LINE_CHUNK_SIZE
+        while position < self.size:
+            if position >= max_scan_bytes:
+                if start is None:
+                    raise ValueError(f"Line {start_line} is not within the first {max_scan_bytes} bytes")
+                break
+            data = await self.read(position, min(chunk_size, max_scan_bytes - position))
+            chunk_size = min(chunk_size * 2, MAX_LINE_CHUNK_SIZE)
+            chunk_start = position
+            position += len(data)
+
+            if start is None:
+                # Count line breaks until the one ending the line before the window
+                index = -1
+                while skip:
+                    index = data.find(b"\n", index + 1)
+                    if index < 0:
+                        break
+                    skip -= 1
+                if skip:
+                    continue
+                start = chunk_start + index + 1
+                data = data[index + 1:]
+
+            buffer += data
+            if buffer.count(b"\n") >= count or len(buffer) > max_bytes:
+                break
+
+        if start is None:
+            return self._result(b"", self.size, lines=0)
+
+        end = _nth_line_end(buffer, count)
+        truncated = False
+        if end > max_bytes:
+            end = _last_line_end(buffer, max_bytes)
+            truncated = True
+        elif end == len(buffer) and position < self.size and buffer.count(b"\n") < count:
+            # The scan cap was hit before the window was complete
+            end = _last_line_end(buffer, end)
+            truncated = True
+        data = bytes(buffer[:end])
+        return self._result(data, start, lines=_line_count(data), truncated=truncated)
+
+    async def read_tail(self, count: int, max_bytes: int) -> RangeRead:
+        """Read the last count lines of the file.
+
+        The file is read backwards in growing chunks from its end until
+        enough line breaks have been seen. A line break at the very end of
+        the file does not start another line.
+
+        Args:
+            count: Number of lines to return
+            max_bytes: Maximum number of bytes returned
+
+        Returns:
+            RangeRead: The lines, truncated to their last max_bytes
+        """
+        buffer = b""
+        position = self.size
+        chunk_size = LINE_CHUNK_SIZE
+        while position > 0:
+            length = min(chunk_size, position, max_bytes + 1 - len(buffer))
+            if length <= 0:
+                break
+            chunk_size = min(chunk_size * 2, MAX_LINE_CHUNK_SIZE)
+            position -= length
+            buffer = await self.read(position, length) + buffer
+            body = buffer[:-1] if buffer.endswith(b"\n") else buffer
+            if body.count(b"\n") >= count:
+                break
+
+        body_end = len(buffer) - 1 if buffer.endswith(b"\n") else len(buffer)
+        start = 0 if position == 0 else None
+        index = body_end
+        for _ in range(count):
+            index = buffer.rfind(b"\n", 0, index)
+            if index < 0:
+                break
+        else:
+            start = index + 1
+        truncated = start is None or len(buffer) - start > max_bytes
+        if truncated:
+            # Keep the last max_bytes, without the partial line they start with
+            cut = len(buffer) - max_bytes
+            first_break = buffer.find(b"\n", cut - 1)
+            start = first_break + 1 if 0 <= first_break < body_end else cut
+        data = buffer[start:]
+        return self._result(data, position + start, lines=_line_count(data), truncated=truncated)
+
+
+def _nth_line_end(data: bytes, count: int) -> int:
+    """Offset just past the count-th line break, or the length of data if there are fewer."""
+    index = -1
+    for _ in range(count):
+        index = data.find(b"\n", index + 1)
+        if index < 0:
+            return len(data)
+    return index + 1
+
+
+def _last_line_end(data: bytes, limit: int) -> int:
+    """Offset just past the last line break within the first limit bytes, or limit if there is none."""
+    index = data.rfind(b"\n", 0, limit)
+    return index + 1 if index >= 0 else limit
+
+
+def _line_count(data: bytes) -> int:
+    """Number of lines in data, counting an unterminated last line."""
+    return data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+
+
+def resolve_read_options(
+    offset: Optional[int],
+    length: Optional[int],
+    head_lines: Optional[int],
+    tail_lines: Optional[int],
+    start_line: Optional[int],
+    line_count: Optional[int],
+    max_bytes: Optional[int],
+    limit: int = DEFAULT_READ_LIMIT,
+) -> Tuple[str, int]:
+    """Check that the options of a range read select exactly one kind of read.
+
+    Args:
+        offset: Byte offset of a byte range read
+        length: Length of a byte range read
+        head_lines: Number of lines to read from the start
+        tail_lines: Number of lines to read from the end
+        start_line: First line of a line window, from 1
+        line_count: Number of lines in the line window
+        max_bytes: Maximum number of bytes returned, or None for the default
+        limit: Largest max_bytes allowed
+
+    Returns:
+        Tuple[str, int]: The kind of read, "bytes", "head", "tail" or
+        "lines", and the resolved max_bytes
+
+    Raises:
+        ValueError: If the options are inconsistent or out of range
+    """
+    max_bytes = max_bytes or min(DEFAULT_READ_MAX_BYTES, limit)
+    if max_bytes < 1 or max_bytes > limit:
+        raise ValueError(f"max_bytes must be between 1 and {limit}")
+
+    kinds = [
+        kind
+        for kind, selected in (
+            ("bytes", offset is not None or length is not None),
+            ("head", head_lines is not None),
+            ("tail", tail_lines is not None),
+            ("lines", start_line is not None or line_count is not None),
+        )
+        if selected
+    ]
+    if len(kinds) > 1:
+        raise ValueError("Pass only one of offset/length, head_lines, tail_lines or start_line/line_count")
+    kind = kinds[0] if kinds else "bytes"
+
+    if length is not None and length < 0:
+        raise ValueError("length must not be negative")
+    for name, value in (("head_lines", head_lines), ("tail_lines", tail_lines), ("line_count", line_count)):
+        if value is not None and value < 1:
+            raise ValueError(f"{name} must be at least 1")
+    if start_line is not None and start_line < 1:
+        raise ValueError("start_line must be at least 1")
+    return kind, max_bytes
+
+
+def encode_data(data: bytes, encoding: str) -> str:
+    """Encode bytes for a tool response, as base64 or text in the given encoding.
+
+    Text that does not decode cleanly, such as a multi-byte character cut
+    by the end of a range, gets replacement characters.
+    """
+    if encoding.lower() == BASE64:
+        return base64.b64encode(data).decode("ascii")
+    return data.decode(encoding, errors="replace")
@@ -0,0 +1,498 @@
+import asyncio
+import csv
+import json
+import logging
+import math
+import os
+from collections import Counter
+from itertools import zip_longest
+from typing import Any, Dict, Iterable, List, Optional
+
+from adls2_mcp_server.ranged import RangeReader
+
+logger = logging.getLogger(__name__)
+
+CSV = "csv"
+JSONL = "jsonl"
+
+# Formats guessed from file extensions, with the CSV delimiter they imply
+_EXTENSIONS = {
+    ".csv": (CSV, ","),
+    ".tsv": (CSV, "\t"),
+    ".jsonl": (JSONL, None),
+    ".ndjson": (JSONL, None),
+}
+
+# Defaults for the scan budgets
+DEFAULT_SCAN_MAX_ROWS = 1_000_000
+DEFAULT_SCAN_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_SCAN_LIMIT = 1024 * 1024 * 1024
+DEFAULT_SAMPLE_ROWS = 10
+MAX_SAMPLE_ROWS = 1000
+DEFAULT_TOP_K = 10
+
+# Size of the first ranged read of a scan. Each further read doubles, up to
+# MAX_SCAN_CHUNK_SIZE, so small samples stay cheap and long scans use few requests.
+SCAN_CHUNK_SIZE = 64 * 1024
+MAX_SCAN_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Columns tracked per scan. Memory per column is bounded, so this bounds the scan's.
+MAX_COLUMNS = 256
+
+# Distinct values counted exactly per column before counts are pruned to
+# the most frequent and distinct values are estimated
+MIN_VALUE_CAPACITY = 1000
+
+# Characters a record may span. Longer records count as parse errors; for
+# CSV, a quote left open for longer is taken to be malformed, and the lines
+# it swallowed are dropped.
+MAX_RECORD_LENGTH = 1024 * 1024
+
+# The csv module rejects fields over 128 KiB by default
+if csv.field_size_limit() < MAX_RECORD_LENGTH:
+    csv.field_size_limit(MAX_RECORD_LENGTH)
+
+# Values longer than this are counted by their prefix
+MAX_VALUE_LENGTH = 256
+
+# HyperLogLog precision: 2 ** 12 registers, about 1.6% standard error
+_HLL_BITS = 12
+_HLL_REGISTERS = 1 << _HLL_BITS
+
+
+def resolve_format(file_path: str, file_format: Optional[str], delimiter: Optional[str]):
+    """Choose the format and CSV delimiter of a file, from its extension if not given.
+
+    Returns:
+        Tuple of the format, CSV or JSONL, and the delimiter
+
+    Raises:
+        ValueError: If the format is unknown or cannot be guessed
+    """
+    guessed, guessed_delimiter = _EXTENSIONS.get(os.path.splitext(file_path)[1].lower(), (None, None))
+    file_format = (file_format or guessed or "").lower()
+    if file_format == "ndjson":
+        file_format = JSONL
+    if file_format not in (CSV, JSONL):
+        raise ValueError(f"Cannot tell the format of {file_path}; pass format 'csv' or 'jsonl'")
+    return file_format, delimiter or guessed_delimiter or ","
+
+
+class _Distinct:
+    """HyperLogLog estimate of the number of distinct values."""
+
+    def __init__(self):
+        self._registers = bytearray(_HLL_REGISTERS)
+
+    def update(self, values: Iterable[str]) -> None:
+        """Add values to the estimate."""
+        # str hashes are salted per process, which is fine for one scan
+        registers = self._registers
+        for value in values:
+            hashed = hash(value) & 0xFFFFFFFFFFFFFFFF
+            index = hashed & (_HLL_REGISTERS - 1)
+            rank = (64 - _HLL_BITS) - (hashed >> _HLL_BITS).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def estimate(self) -> int:
+        m = _HLL_REGISTERS
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class ColumnStats:
+    """Constant-memory statistics of one column.
+
+    Values are added a batch at a time, so counting and number conversion
+    run in C rather than once per value in Python. Value counts are exact
+    until more than capacity distinct values have been seen. From then on
+    the counts are pruned to the most frequent half whenever they exceed
+    capacity after a batch, which keeps the frequent values and their
+    approximate counts, and the distinct count is estimated with a
+    HyperLogLog seeded with the values counted until then.
+    """
+
+    def __init__(self, capacity: int):
+        self.non_null = 0
+        self.numeric = True
+        self.numeric_count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sum = 0.0
+        self._capacity = capacity
+        self._counts: Counter = Counter()
+        self._distinct: Optional[_Distinct] = None
+
+    def add(self, values: List[Any]) -> None:
+        """Count a batch of non-null values."""
+        if not values:
+            return
+        self.non_null += len(values)
+        if self.numeric:
+            numbers = _numbers(values)
+            if numbers is None:
+                self.numeric = False
+            else:
+                self.numeric_count += len(numbers)
+                self.sum += math.fsum(numbers)
+                low, high = min(numbers), max(numbers)
+                self.min = low if self.min is None else min(self.min, low)
+                self.max = high if self.max is None else max(self.max, high)
+
+        if not all(type(value) is str for value in values):
+            values = [value if isinstance(value, str) else json.dumps(value, sort_keys=True) for value in values]
+        if max(map(len, values)) > MAX_VALUE_LENGTH:
+            values = [value[:MAX_VALUE_LENGTH] for value in values]
+        counts = self._counts
+        if self._distinct is not None:
+            self._distinct.update(values)
+            counts.update(values)
+        else:
+            counts.update(values)
+            if len(counts) > self._capacity:
+                # Every distinct value seen so far is still in counts
+                self._distinct = _Distinct()
+                self._distinct.update(counts)
+        if len(counts) > self._capacity:
+            self._counts = Counter(dict(counts.most_common(self._capacity // 2)))
+
+    def result(self, rows: int, top_k: int) -> Dict[str, Any]:
+        """The statistics, with the top_k most frequent values."""
+        top = self._counts.most_common(top_k)
+        stats = {
+            "non_null": self.non_null,
+            "null_count": rows - self.non_null,
+            "distinct": self._distinct.estimate() if self._distinct else len(self._counts),
+            "distinct_exact": self._distinct is None,
+            "top_values": [{"value": value, "count": count} for value, count in top],
+            "top_values_exact": self._distinct is None,
+        }
+        if self.numeric and self.numeric_count:
+            stats.update(min=self.min, max=self.max, mean=self.sum / self.numeric_count)
+        return stats
+
+
+def _numbers(values: List[Any]) -> Optional[List[float]]:
+    """The values as floats, or None if any is not a finite number or numeric string."""
+    try:
+        numbers = [float(value) for value in values if type(value) is not bool]
+    except (TypeError, ValueError):
+        return None
+    if len(numbers) < len(values) or not math.isfinite(math.fsum(numbers)):
+        return None
+    return numbers
+
+
+class FileScanner:
+    """Parses a CSV or JSONL file fed chunk by chunk, keeping samples and statistics.
+
+    Chunks are split into records at line breaks; for CSV, a line break
+    inside a quoted field does not end the record. The bytes after the
+    last record boundary are kept for the next chunk, up to
+    MAX_RECORD_LENGTH; a longer line is dropped up to its end, so memory
+    stays bounded whatever the line lengths. feed is synchronous and
+    CPU-bound, meant to run in a worker thread while the next chunk is
+    fetched.
+    """
+
+    def __init__(
+        self,
+        file_format: str,
+        delimiter: str = ",",
+        header: bool = True,
+        columns: Optional[List[str]] = None,
+        max_rows: int = DEFAULT_SCAN_MAX_ROWS,
+        sample_rows: int = 0,
+        collect_stats: bool = True,
+        top_k: int = DEFAULT_TOP_K,
+    ):
+        """Initialize the scanner.
+
+        Args:
+            file_format: CSV or JSONL
+            delimiter: CSV field delimiter
+            header: Whether the first CSV record holds the column names
+            columns: Columns to keep, or None for all
+            max_rows: Number of rows after which the scan stops
+            sample_rows: Number of leading rows to keep as a sample
+            collect_stats: Whether to compute column statistics
+            top_k: Number of most frequent values reported per column
+        """
+        self.file_format = file_format
+        self.delimiter = delimiter
+        self.header = header
+        self.max_rows = max_rows
+        self.sample_rows = sample_rows
+        self.collect_stats = collect_stats
+        self.top_k = top_k
+        self.rows = 0
+        self.parse_errors = 0
+        # Whether records were left unparsed once the row budget was reached
+        self.rows_left = False
+        self.sample: List[Dict[str, Any]] = []
+        self.columns_truncated = False
+        self._wanted = set(columns) if columns else None
+        self._names: Optional[List[str]] = None
+        self._stats: Dict[str, ColumnStats] = {}
+        self._capacity = max(MIN_VALUE_CAPACITY, 20 * top_k)
+        self._remainder = b""
+        self._skipping = False
+        self._started = False
+        self._pending: List[str] = []
+        self._pending_length = 0
+        self._quotes = 0
+
+    @property
+    def done(self) -> bool:
+        """Whether the row budget has been reached."""
+        return self.rows >= self.max_rows
+
+    def feed(self, data: bytes) -> bool:
+        """Parse the complete records in data and the bytes left from earlier chunks.
+
+        Returns:
+            bool: True once the row budget has been reached
+        """
+        if not self._started:
+            self._started = True
+            if data.startswith(b"\xef\xbb\xbf"):
+                data = data[3:]
+        if self._skipping:
+            # The rest of an overlong line
+            newline = data.find(b"\n")
+            if newline < 0:
+                return self.done
+            self._skipping = False
+            data = data[newline + 1:]
+        else:
+            data = self._remainder + data
+        end = data.rfind(b"\n") + 1
+        self._remainder = data[end:]
+        if end:
+            lines = data[:end].decode("utf-8", errors="replace").split("\n")
+            self._parse_lines([line + "\n" for line in lines[:-1]])
+        if len(self._remainder) > MAX_RECORD_LENGTH:
+            self._remainder = b""
+            self._skipping = True
+            self._drop_record()
+        return self.done
+
+    def finish(self) -> None:
+        """Parse what is left at the end of the file."""
+        if self._remainder:
+            self._parse_lines([self._remainder.decode("utf-8", errors="replace")])
+        self._remainder = b""
+        if self._pending:
+            self._parse_records(["".join(self._pending)])
+        self._pending = []
+
+    def _drop_record(self) -> None:
+        """Count the record being read as a parse error and discard it."""
+        if self.done:
+            self.rows_left = True
+        else:
+            self.parse_errors += 1
+        self._pending = []
+        self._pending_length = 0
+        self._quotes = 0
+
+    def _parse_lines(self, lines: List[str]) -> None:
+        if self.file_format == JSONL:
+            self._parse_records(lines)
+            return
+        # A record ends at a line break only outside quotes, that is after
+        # an even number of quote characters
+        records = []
+        for line in lines:
+            self._pending.append(line)
+            self._pending_length += len(line)
+            self._quotes += line.count('"')
+            if self._pending_length > MAX_RECORD_LENGTH:
+                self._drop_record()
+                continue
+            if self._quotes % 2:
+                continue
+            records.append("".join(self._pending))
+            self._pending = []
+            self._pending_length = 0
+            self._quotes = 0
+        self._parse_records(records)
+
+    def _parse_records(self, records: List[str]) -> None:
+        budget = self.max_rows - self.rows
+        if budget <= 0:
+            if any(record.strip() for record in records):
+                self.rows_left = True
+            return
+        if self.file_format == JSONL:
+            rows = []
+            for line in records:
+                if not line.strip():
+                    continue
+                if len(rows) >= budget:
+                    self.rows_left = True
+                    break
+                if len(line) > MAX_RECORD_LENGTH:
+                    self.parse_errors += 1
+                    continue
+                try:
+                    value = json.loads(line)
+                except ValueError:
+                    self.parse_errors += 1
+                    continue
+                rows.append(value if isinstance(value, dict) else {"value": value})
+            self._add_objects(rows)
+            return
+
+        rows = []
+        reader = csv.reader(records, delimiter=self.delimiter)
+        while True:
+            # The reader moves on to the next record after an error
+            try:
+                fields = next(reader)
+            except StopIteration:
+                break
+            except csv.Error:
+                self.parse_errors += 1
+                continue
+            if not fields:
+                continue
+            if len(rows) >= budget:
+                self.rows_left = True
+                break
+            if self._names is None:
+                if self.header:
+                    self._names = fields
+                    continue
+                self._names = [f"column_{index + 1}" for index in range(len(fields))]
+            rows.append(fields)
+        self._add_records(rows)
+
+    def _add_records(self, rows: List[List[str]]) -> None:
+        """Count CSV rows, with empty fields as nulls."""
+        if not rows:
+            return
+        self.rows += len(rows)
+        width = max(map(len, rows))
+        if width > len(self._names):
+            self._names = self._names + [f"column_{index + 1}" for index in range(len(self._names), width)]
+        names = self._names
+        wanted = self._wanted
+        for fields in rows[:self.sample_rows - len(self.sample)]:
+            self.sample.append({
+                name: value if value != "" else None
+                for name, value in zip(names, fields)
+                if wanted is None or name in wanted
+            })
+        if not self.collect_stats:
+            return
+        # Transpose the batch so that each column is counted in one call
+        for name, values in zip(names, zip_longest(*rows, fillvalue="")):
+            if wanted is not None and name not in wanted:
+                continue
+            column = self._column(name)
+            if column is not None:
+                column.add([value for value in values if value])
+
+    def _add_objects(self, rows: List[Dict[str, Any]]) -> None:
+        """Count JSONL rows, with missing keys and nulls as nulls."""
+        if not rows:
+            return
+        self.rows += len(rows)
+        wanted = self._wanted
+        for row in rows[:self.sample_rows - len(self.sample)]:
+            self.sample.append(row if wanted is None else {name: row[name] for name in row if name in wanted})
+        if not self.collect_stats:
+            return
+        columns: Dict[str, List[Any]] = {}
+        for row in rows:
+            for name, value in row.items():
+                values = columns.get(name)
+                if values is None:
+                    values = columns[name] = []
+                values.append(value)
+        for name, values in columns.items():
+            if wanted is not None and name not in wanted:
+                continue
+            column = self._column(name)
+            if column is not None:
+                column.add([value for value in values if value is not None])
+
+    def _column(self, name: str) -> Optional[ColumnStats]:
+        """Statistics of a column, created on first sight, or None past MAX_COLUMNS."""
+        column = self._stats.get(name)
+        if column is None:
+            if len(self._stats) >= MAX_COLUMNS:
+                self.columns_truncated = True
+                return None
+            column = self._stats[name] = ColumnStats(self._capacity)
+        return column
+
+    def column_names(self) -> List[str]:
+        """Names of the columns seen, in order of appearance."""
+        if self._names is not None and self.file_format == CSV:
+            return [name for name in self._names if self._wanted is None or name in self._wanted]
+        return list(self._stats) if self.collect_stats else list(dict.fromkeys(k for row in self.sample for k in row))
+
+    def column_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of each column."""
+        return {name: column.result(self.rows, self.top_k) for name, column in self._stats.items()}
+
+
+async def scan(reader: RangeReader, scanner: FileScanner, max_bytes: int) -> Dict[str, Any]:
+    """Stream a file through a scanner until it ends or a budget is reached.
+
+    Chunks are read in order, each with one ranged read, starting at
+    SCAN_CHUNK_SIZE and doubling up to MAX_SCAN_CHUNK_SIZE. The next chunk
+    is fetched while the current one is parsed in a worker thread, so at
+    most two chunks are held in memory.
+
+    Args:
+        reader: RangeReader of the file
+        scanner: Scanner to feed
+        max_bytes: Number of bytes after which the scan stops
+
+    Returns:
+        Dict with the bytes scanned, whether the whole file was scanned,
+        and why the scan stopped otherwise
+    """
+    end = min(reader.size, max_bytes)
+    chunk_size = SCAN_CHUNK_SIZE
+    position = 0
+    fetch = None
+    if position < end:
+        fetch = asyncio.create_task(reader.read(position, min(chunk_size, end - position)))
+    try:
+        while fetch is not None:
+            data = await fetch
+            position += len(data)
+            chunk_size = min(chunk_size * 2, MAX_SCAN_CHUNK_SIZE)
+            fetch = None
+            if position < end:
+                fetch = asyncio.create_task(reader.read(position, min(chunk_size, end - position)))
+            if await asyncio.to_thread(scanner.feed, data):
+                break
+    finally:
+        if fetch is not None:
+            fetch.cancel()
+            await asyncio.gather(fetch, return_exceptions=True)
+
+    if position >= reader.size:
+        await asyncio.to_thread(scanner.finish)
+    # A file holding exactly max_rows rows is still scanned completely
+    complete = position >= reader.size and not scanner.rows_left
+    if complete:
+        stopped_by = None
+    elif scanner.done:
+        stopped_by = "max_rows"
+    else:
+        stopped_by = "max_bytes"
+    return {
+        "bytes_scanned": position,
+        "complete": complete,
+        "stopped_by": stopped_by,
+    }
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from azure.storage.filedatalake import ContentSettings
+
+from adls2_mcp_server.compression import decodable, decompress_to_file
+from adls2_mcp_server.hashing import StreamHasher, verify_md5
+from adls2_mcp_server.transfer import (
+    PARTIAL_SUFFIX,
+    TransferLimiter,
+    TransferResult,
+    download_chunked,
+    upload_chunked,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default number of files a directory transfer moves at once
+DEFAULT_MAX_FILES = 16
+
+# Defaults for the limiter shared by all transfers of a client
+DEFAULT_MAX_INFLIGHT_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_BANDWIDTH = 0
+
+
+@dataclass
+class TransferJob:
+    """A single file of a directory transfer."""
+    local_path: Path
+    remote_path: str
+    size: int
+    mtime_ns: Optional[int] = None
+
+
+@dataclass
+class TransferReport:
+    """Aggregate outcome of a directory transfer."""
+    files_transferred: int = 0
+    files_skipped: int = 0
+    bytes_transferred: int = 0
+    elapsed_seconds: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Average rate in bytes per second."""
+        return self.bytes_transferred / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class TransferScheduler:
+    """Runs the files of a directory transfer concurrently.
+
+    Up to max_files files are transferred at once. Files no larger than
+    chunk_size are moved with a single request each; larger ones are split
+    into up to max_concurrency parallel chunks and can be resumed from their
+    journal. Every byte goes through the shared limiter, which caps the
+    bytes in flight and the bandwidth across all of them. Uploads set the
+    Content-MD5 of each file, and downloads are checked against it.
+    """
+
+    def __init__(
+        self,
+        file_system_client,
+        limiter: TransferLimiter,
+        chunk_size: int,
+        max_concurrency: int,
+        max_files: int = DEFAULT_MAX_FILES,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            file_system_client: Async FileSystemClient of the remote side
+            limiter: Limiter shared with the client's other transfers
+            chunk_size: Chunk size for large files, and the small file threshold
+            max_concurrency: Maximum number of chunks in flight per large file
+            max_files: Maximum number of files in flight
+        """
+        if max_files < 1:
+            raise ValueError("max_files must be at least 1")
+        self._file_system_client = file_system_client
+        self._limiter = limiter
+        self._chunk_size = chunk_size
+        self._max_concurrency = max_concurrency
+        self._max_files = max_files
+
+    async def _run(
+        self,
+        jobs: List[TransferJob],
+        transfer: Callable,
+        on_complete: Optional[Callable[[TransferJob, TransferResult], None]],
+    ) -> TransferReport:
+        report = TransferReport()
+        semaphore = asyncio.Semaphore(self._max_files)
+        started_at = time.monotonic()
+
+        async def run(job: TransferJob) -> None:
+            async with semaphore:
+                try:
+                    result = await transfer(job)
+                except Exception as e:
+                    logger.error(f"Error transferring {job.local_path} <-> {job.remote_path}: {e}")
+                    report.errors[job.remote_path] = str(e) or type(e).__name__
+                    return
+                report.files_transferred += 1
+                report.bytes_transferred += result.size
+                if on_complete is not None:
+                    on_complete(job, result)
+
+        await asyncio.gather(*(run(job) for job in jobs))
+        report.elapsed_seconds = time.monotonic() - started_at
+        return report
+
+    async def upload(
+        self,
+        jobs: List[TransferJob],
+        on_complete: Optional[Callable[[TransferJob, TransferResult], None]] = None,
+    ) -> TransferReport:
+        """Upload local files to their remote paths.
+
+        Args:
+            jobs: Files to upload
+            on_complete: Called with each job and its result once it succeeds
+
+        Returns:
+            TransferReport: Counts, bytes, timing and per-file errors
+        """
+        async def transfer(job: TransferJob) -> TransferResult:
+            file_client = self._file_system_client.get_file_client(job.remote_path)
+            if job.size > self._chunk_size:
+                return await upload_chunked(
+                    file_client, job.local_path, self._chunk_size, self._max_concurrency, self._limiter
+                )
+
+            await self._limiter.acquire(job.size)
+            try:
+                data = await asyncio.to_thread(job.local_path.read_bytes)
+                hasher = StreamHasher()
+                await asyncio.to_thread(hasher.update, data)
+                uploaded = await file_client.upload_data(
+                    data,
+                    length=len(data),
+                    overwrite=True,
+                    content_settings=ContentSettings(content_md5=bytearray(hasher.md5())),
+                )
+            finally:
+                self._limiter.release(job.size)
+            return TransferResult(
+                size=len(data),
+                etag=uploaded.get("etag", ""),
+                last_modified=uploaded.get("last_modified"),
+                digests=hasher.hexdigests(),
+            )
+
+        return await self._run(jobs, transfer, on_complete)
+
+    async def download(
+        self,
+        jobs: List[TransferJob],
+        on_complete: Optional[Callable[[TransferJob, TransferResult], None]] = None,
+    ) -> TransferReport:
+        """Download remote files to their local paths.
+
+        Args:
+            jobs: Files to download, with the sizes from their listing
+            on_complete: Called with each job and its result once it succeeds
+
+        Returns:
+            TransferReport: Counts, bytes, timing and per-file errors
+        """
+        async def transfer(job: TransferJob) -> TransferResult:
+            file_client = self._file_system_client.get_file_client(job.remote_path)
+            await asyncio.to_thread(job.local_path.parent.mkdir, parents=True, exist_ok=True)
+            if job.size > self._chunk_size:
+                return await download_chunked(
+                    file_client, job.local_path, self._chunk_size, self._max_concurrency, self._limiter
+                )
+
+            await self._limiter.acquire(job.size)
+            try:
+                download = await file_client.download_file(decompress=False)
+                data = await download.readall()
+                properties = download.properties
+                content_settings = properties.content_settings
+                hasher = StreamHasher()
+                await asyncio.to_thread(hasher.update, data)
+                verified = verify_md5(job.remote_path, content_settings.content_md5 if content_settings else None, hasher)
+                encoding = decodable(content_settings.content_encoding) if content_settings else None
+                temp_path = job.local_path.with_name(job.local_path.name + PARTIAL_SUFFIX)
+                if encoding:
+                    await asyncio.to_thread(decompress_to_file, encoding, data, temp_path)
+                else:
+                    await asyncio.to_thread(temp_path.write_bytes, data)
+                await asyncio.to_thread(os.replace, temp_path, job.local_path)
+            finally:
+                self._limiter.release(job.size)
+            return TransferResult(
+                size=len(data),
+                etag=properties.etag,
+                last_modified=properties.last_modified,
+                digests=hasher.hexdigests(),
+                verified=verified,
+                encoding=encoding or "",
+            )
+
+        return await self._run(jobs, transfer, on_complete)
@@ -1,10 +1,13 @@
+import asyncio
 import logging
 import os
+import threading
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
-from adls2_mcp_server.client import ADLS2Client
+from adls2_mcp_server.metrics import DEFAULT_EXPORT_INTERVAL, METRICS, export_to_file, instrument_tool, serve_prometheus
 from adls2_mcp_server.tools import register_all_tools
 
 load_dotenv()
@@ -15,9 +18,95 @@ logging.basicConfig(
     )
 logger = logging.getLogger(__name__)
 
+class LazyClientPool:
+    """Stands in for the ADLS2 client pool until a tool first uses it.
+
+    Importing the Azure SDK and building the clients' credentials take
+    longer than the rest of the server's startup, so both are deferred
+    until the first attribute access. The server can then answer the MCP
+    handshake without paying for them.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the pool has been created."""
+        return self._pool is not None
+
+    def load(self):
+        """Create the pool on first call and return it."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    from adls2_mcp_server.pool import ClientPool
+                    self._pool = ClientPool()
+        return self._pool
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+    async def close(self) -> None:
+        """Close the pool if it was ever created."""
+        if self._pool is not None:
+            await self._pool.close()
+
+
+async def _preload(clients: LazyClientPool) -> None:
+    """Create the default client off the event loop, then warm up its credential."""
+    try:
+        await asyncio.to_thread(lambda: clients.load().get())
+        await clients.warm_up()
+    except Exception as e:
+        logger.error(f"Error creating ADLS2 client: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Optionally preload the ADLS2 client and export metrics, and close the clients on shutdown."""
+    preload = None
+    if os.getenv("PRELOAD_CLIENT", "false").lower() == "true":
+        preload = asyncio.create_task(_preload(server.clients))
+
+    export = None
+    metrics_file = os.getenv("METRICS_PROMETHEUS_FILE")
+    if metrics_file:
+        interval = float(os.getenv("METRICS_EXPORT_INTERVAL", str(DEFAULT_EXPORT_INTERVAL)))
+        export = asyncio.create_task(export_to_file(METRICS, metrics_file, interval))
+
+    metrics_server = None
+    metrics_port = os.getenv("METRICS_PROMETHEUS_PORT")
+    if metrics_port:
+        try:
+            metrics_host = os.getenv("METRICS_PROMETHEUS_HOST", "127.0.0.1")
+            metrics_server = await serve_prometheus(METRICS, metrics_host, int(metrics_port))
+        except Exception as e:
+            logger.error(f"Error starting metrics server: {str(e)}")
+
+    try:
+        yield {}
+    finally:
+        if preload is not None:
+            preload.cancel()
+        if export is not None:
+            export.cancel()
+            await asyncio.gather(export, return_exceptions=True)
+        if metrics_server is not None:
+            await metrics_server.cleanup()
+        await server.clients.close()
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP server that records the latency and errors of every tool call."""
+
+    def add_tool(self, fn, name=None, *args, **kwargs):
+        """Register a tool, wrapped by instrument_tool."""
+        name = name or fn.__name__
+        return super().add_tool(instrument_tool(name, fn), name, *args, **kwargs)
+
 # Initialize MCP server
-mcp = FastMCP("ADLS2MCP")
-mcp.client = ADLS2Client() 
+mcp = InstrumentedFastMCP("ADLS2MCP", lifespan=lifespan)
+mcp.clients = LazyClientPool()
 
 # Register all MCP tools
 register_all_tools(mcp)
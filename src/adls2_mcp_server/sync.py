@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from adls2_mcp_server.listing import PathEntry
+from adls2_mcp_server.scheduler import TransferJob
+
+logger = logging.getLogger(__name__)
+
+# Name of the manifest kept at the root of a synced local directory
+MANIFEST_NAME = ".adls2-manifest.json"
+
+# Block size used when hashing local files
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_md5(path: Path) -> bytes:
+    """Compute the MD5 digest of a local file."""
+    digest = hashlib.md5()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+@dataclass
+class ManifestEntry:
+    """State of a file pair as of the last sync that saw both sides match."""
+    size: int
+    mtime_ns: int
+    etag: str = ""
+    md5: str = ""
+
+
+@dataclass
+class SyncManifest:
+    """Record of synced files, persisted at the root of the local directory.
+
+    An entry says that the local file with the recorded size and mtime had
+    the same content as the remote file with the recorded ETag. A file whose
+    local stat and remote ETag both still match is unchanged, so it needs
+    neither hashing nor a request.
+    """
+    path: Path
+    remote: str
+    files: Dict[str, ManifestEntry] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path, remote: str) -> "SyncManifest":
+        """Load the manifest, starting empty if it is missing, unreadable or for another remote."""
+        try:
+            with open(path, "r") as file:
+                state = json.load(file)
+            if state.get("remote") == remote:
+                files = {name: ManifestEntry(**entry) for name, entry in state.get("files", {}).items()}
+                return cls(path=path, remote=remote, files=files)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable sync manifest {path}: {e}")
+        return cls(path=path, remote=remote)
+
+    def save(self) -> None:
+        """Atomically write the manifest to disk."""
+        state = {"remote": self.remote, "files": {name: asdict(entry) for name, entry in self.files.items()}}
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.path)
+
+    def local_md5(self, name: str, stat: os.stat_result) -> Optional[bytes]:
+        """The recorded MD5 of a local file, if the file is unchanged since it was hashed."""
+        entry = self.files.get(name)
+        if entry is not None and entry.md5 and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            return bytes.fromhex(entry.md5)
+        return None
+
+    def record(self, name: str, stat: os.stat_result, etag: str, md5: Optional[bytes] = None) -> None:
+        """Record that a local file and a remote version match."""
+        self.files[name] = ManifestEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            etag=etag.strip('"'),
+            md5=md5.hex() if md5 else "",
+        )
+
+    def retain(self, names) -> None:
+        """Forget files that are no longer part of the sync."""
+        names = set(names)
+        self.files = {name: entry for name, entry in self.files.items() if name in names}
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+async def plan_sync(
+    jobs: List[TransferJob],
+    root: Path,
+    remote: Dict[str, PathEntry],
+    manifest: SyncManifest,
+    remote_md5: Callable[[str], Awaitable[Optional[bytes]]],
+    max_concurrency: int,
+) -> Tuple[List[TransferJob], int]:
+    """Drop the jobs whose local and remote files already match.
+
+    A pair matches when both sides exist and either the manifest shows
+    neither side changed since the last sync, or the sizes are equal and
+    the local MD5 equals the remote Content-MD5. Local files are only
+    hashed for that second check, and the manifest is updated with every
+    pair found to match. Files present only on the destination side are
+    left alone.
+
+    Args:
+        jobs: Candidate transfers, in either direction
+        root: Local directory the manifest names are relative to
+        remote: Remote files by path, from a fresh listing
+        manifest: Manifest of the previous sync
+        remote_md5: Returns the Content-MD5 of a remote path, or None if unset
+        max_concurrency: Maximum number of files compared at once
+
+    Returns:
+        Tuple[List[TransferJob], int]: The jobs still to run and the number skipped
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def changed(job: TransferJob) -> bool:
+        entry = remote.get(job.remote_path)
+        if entry is None or entry.is_directory:
+            return True
+        stat = await asyncio.to_thread(_stat, job.local_path)
+        if stat is None or stat.st_size != entry.size:
+            return True
+
+        name = job.local_path.relative_to(root).as_posix()
+        recorded = manifest.files.get(name)
+        if (
+            recorded is not None
+            and recorded.size == stat.st_size
+            and recorded.mtime_ns == stat.st_mtime_ns
+            and recorded.etag == entry.etag.strip('"')
+        ):
+            return False
+
+        async with semaphore:
+            expected = await remote_md5(job.remote_path)
+            if not expected:
+                return True
+            local = manifest.local_md5(name, stat) or await asyncio.to_thread(file_md5, job.local_path)
+        if local != bytes(expected):
+            return True
+        manifest.record(name, stat, entry.etag, local)
+        return False
+
+    results = await asyncio.gather(*(changed(job) for job in jobs))
+    pending = [job for job, is_changed in zip(jobs, results) if is_changed]
+    return pending, len(jobs) - len(pending)
@@ -0,0 +1,346 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional
+
+from azure.core.exceptions import AzureError
+from azure.core.pipeline.transport import AsyncHttpTransport
+from azure.storage.filedatalake._shared.authentication import AzureSigningError
+from azure.storage.filedatalake._shared.policies import is_retry
+from azure.storage.filedatalake._shared.policies_async import is_checksum_retry, retry_hook
+from azure.storage.filedatalake.aio import ExponentialRetry
+
+from adls2_mcp_server.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Defaults for retries of transient errors
+DEFAULT_RETRY_TOTAL = 5
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_BACKOFF_MAX = 60.0
+
+# Default cap on the requests in flight to one account
+DEFAULT_MAX_REQUESTS = 64
+
+# Factor the limit is multiplied by when the account throttles
+DECREASE_FACTOR = 0.5
+
+# Responses that mean the account is over its request or bandwidth limits
+THROTTLED_STATUS = frozenset([429, 503])
+
+# Responses that are worth retrying but say nothing about load
+TRANSIENT_STATUS = frozenset([408, 500, 502, 504])
+
+THROTTLED = "throttled"
+TRANSIENT = "transient"
+
+
+def classify_status(status: int) -> Optional[str]:
+    """Classify a response status as THROTTLED, TRANSIENT, or None for final."""
+    if status in THROTTLED_STATUS:
+        return THROTTLED
+    if status in TRANSIENT_STATUS:
+        return TRANSIENT
+    return None
+
+
+def operation_name(request) -> str:
+    """Name a storage request by its method and its comp, action, resource or restype parameter."""
+    query = request.query
+    kind = query.get("comp") or query.get("action") or query.get("resource") or query.get("restype")
+    return f"{request.method} {kind}" if kind else request.method
+
+
+def _content_length(headers) -> int:
+    try:
+        return int(headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+@dataclass
+class RequestStats:
+    """Counters of the HTTP requests sent to one account."""
+    requests: int = 0
+    throttled: int = 0
+    transient_errors: int = 0
+    connection_errors: int = 0
+    retries: int = 0
+    retries_exhausted: int = 0
+
+
+class AdaptiveConcurrency:
+    """Account-wide limit on requests in flight, adapted AIMD-style.
+
+    Every response that is not throttled raises the limit by 1/limit, so
+    it grows by about one per round of requests, up to max_limit. A
+    throttled response halves it, down to min_limit, unless its request was
+    sent before the last decrease: a burst of requests sent together is
+    throttled together, and only counts once. Requests over the limit wait
+    in FIFO order.
+    """
+
+    def __init__(self, max_limit: int = DEFAULT_MAX_REQUESTS, min_limit: int = 1):
+        """Initialize the limiter.
+
+        Args:
+            max_limit: Maximum number of requests in flight
+            min_limit: Number of requests always allowed in flight
+        """
+        if max_limit < 1:
+            raise ValueError("max_limit must be at least 1")
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._decreased_at = float("-inf")
+
+    def _fits(self) -> bool:
+        return self.in_flight < max(int(self.limit), self.min_limit)
+
+    async def acquire(self) -> float:
+        """Wait for a slot under the current limit.
+
+        Returns:
+            float: The time the slot was granted, to pass to on_throttle
+        """
+        if not self._waiters and self._fits():
+            self.in_flight += 1
+            return time.monotonic()
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self._waiters.remove(future)
+            else:
+                self.release()
+            raise
+        return time.monotonic()
+
+    def release(self) -> None:
+        """Return a slot and admit the waiters that now fit."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._fits():
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def on_success(self) -> None:
+        """Grow the limit after a response that was not throttled."""
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_throttle(self, sent_at: float) -> None:
+        """Shrink the limit after a throttled response to a request sent at sent_at."""
+        if sent_at < self._decreased_at:
+            return
+        self._decreased_at = time.monotonic()
+        self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+        logger.info(f"Storage account is throttling, limiting requests in flight to {int(self.limit)}")
+
+
+class ThrottledTransport(AsyncHttpTransport):
+    """Sends a client's requests under its AdaptiveConcurrency limit.
+
+    It sits below the retry policy, so every attempt takes a slot and its
+    response feeds the limit and the client's RequestStats. A streamed
+    download holds its slot until the response headers arrive, not while
+    the body is read.
+
+    The time spent waiting for a slot, the latency of each attempt by
+    operation and the bytes sent and received are recorded in METRICS.
+    Bytes are taken from the Content-Length headers, and a HEAD response
+    counts for none.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncHttpTransport,
+        concurrency: AdaptiveConcurrency,
+        stats: RequestStats,
+        account: str = "",
+    ):
+        """Initialize the transport.
+
+        Args:
+            transport: The transport that sends the requests
+            concurrency: Limit on the requests in flight
+            stats: Counters to update
+            account: Storage account name, to label the metrics with
+        """
+        self._transport = transport
+        self._concurrency = concurrency
+        self._stats = stats
+        self._account = account
+
+    async def send(self, request, **kwargs):
+        """Send the request once a slot is free, and classify its response."""
+        queued_at = time.monotonic()
+        sent_at = await self._concurrency.acquire()
+        METRICS.observe("adls2_request_wait_seconds", sent_at - queued_at, account=self._account)
+        try:
+            response = await self._transport.send(request, **kwargs)
+        except Exception:
+            self._stats.connection_errors += 1
+            raise
+        finally:
+            self._concurrency.release()
+            METRICS.observe(
+                "adls2_request_duration_seconds",
+                time.monotonic() - sent_at,
+                account=self._account,
+                operation=operation_name(request),
+            )
+
+        METRICS.inc("adls2_request_bytes_sent_total", _content_length(request.headers), account=self._account)
+        if request.method != "HEAD":
+            METRICS.inc("adls2_response_bytes_received_total", _content_length(response.headers), account=self._account)
+        self._stats.requests += 1
+        kind = classify_status(response.status_code)
+        if kind == THROTTLED:
+            self._stats.throttled += 1
+            self._concurrency.on_throttle(sent_at)
+        else:
+            if kind == TRANSIENT:
+                self._stats.transient_errors += 1
+            self._concurrency.on_success()
+        return response
+
+    async def open(self):
+        """Open the underlying transport."""
+        await self._transport.open()
+
+    async def close(self):
+        """Close the underlying transport."""
+        await self._transport.close()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+def _retry_after(response) -> Optional[float]:
+    """Seconds a response asks the client to wait before retrying, if it says."""
+    if response is None:
+        return None
+    for header in ("x-ms-retry-after-ms", "retry-after-ms"):
+        value = response.headers.get(header)
+        if value:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class ThrottlingRetryPolicy(ExponentialRetry):
+    """Retries transient errors with jittered exponential backoff.
+
+    Connection errors and the responses the storage SDK retries (408 and
+    5xx other than 501 and 505) are retried, and so is 429, which the SDK
+    treats as final like any other 4xx. A Retry-After header is honoured,
+    up to backoff_max. Otherwise the delay before retry n is
+    drawn uniformly from [0, min(backoff_max, backoff * 2 ** (n - 1))], so
+    requests throttled together do not come back together.
+    """
+
+    def __init__(
+        self,
+        stats: RequestStats,
+        retry_total: int = DEFAULT_RETRY_TOTAL,
+        backoff: float = DEFAULT_RETRY_BACKOFF,
+        backoff_max: float = DEFAULT_RETRY_BACKOFF_MAX,
+    ):
+        """Initialize the policy.
+
+        Args:
+            stats: Counters to update
+            retry_total: Maximum number of retries of one request
+            backoff: Base delay in seconds
+            backoff_max: Maximum delay in seconds
+        """
+        super().__init__(
+            initial_backoff=backoff,
+            retry_total=retry_total,
+            retry_connect=retry_total,
+            retry_read=retry_total,
+            retry_status=retry_total,
+        )
+        self.backoff_max = backoff_max
+        self._stats = stats
+
+    def get_backoff_time(self, settings: Dict[str, Any]) -> float:
+        """Return the delay before the next retry."""
+        retry_after = settings.pop("retry_after", None)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.initial_backoff * 2 ** (settings["count"] - 1)))
+
+    async def is_retry(self, settings: Dict[str, Any], response) -> bool:
+        """Whether a response is worth retrying: a throttled one always is."""
+        if response.http_response.status_code in THROTTLED_STATUS:
+            return True
+        return is_retry(response, settings["mode"]) or await is_checksum_retry(response)
+
+    async def send(self, request):
+        """Send the request, retrying as the storage SDK's policy does, plus 429."""
+        settings = self.configure_retries(request)
+        while True:
+            try:
+                response = await self.next.send(request)
+            except AzureError as error:
+                if isinstance(error, AzureSigningError):
+                    raise
+                if not self.increment(settings, request=request.http_request, error=error):
+                    raise
+                await retry_hook(settings, request=request.http_request, response=None, error=error)
+                await self.sleep(settings, request.context.transport)
+                continue
+            if await self.is_retry(settings, response) and self.increment(
+                settings, request=request.http_request, response=response.http_response
+            ):
+                await retry_hook(settings, request=request.http_request, response=response.http_response, error=None)
+                await self.sleep(settings, request.context.transport)
+                continue
+            break
+        if settings["history"]:
+            response.context["history"] = settings["history"]
+        response.http_response.location_mode = settings["mode"]
+        return response
+
+    def increment(self, settings: Dict[str, Any], request, response=None, error=None) -> bool:
+        """Count the retry, or the request given up on."""
+        retry = super().increment(settings, request, response=response, error=error)
+        if retry:
+            self._stats.retries += 1
+            settings["retry_after"] = _retry_after(response)
+        else:
+            self._stats.retries_exhausted += 1
+        return retry
@@ -1,7 +1,11 @@
 import json
 import logging
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
+
+from mcp.server.fastmcp import Context
+
+from adls2_mcp_server.listing import PathFilter, parse_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +25,48 @@ class DirectoryExistsResponse:
 class DirectoryPathsResponse:
     path: str
     paths: List[str] = field(default_factory=list)
+    details: Optional[Dict[str, List[Any]]] = None
+    continuation_token: Optional[str] = None
+    error: str = ""
+
+@dataclass
+class DirectoryTransferResponse:
+    source: str
+    destination: str
+    success: bool
+    files_transferred: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    bytes_transferred: int = 0
+    elapsed_seconds: float = 0.0
+    throughput_mib_per_second: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
     error: str = ""
 
+def _transfer_response(source: str, destination: str, report) -> Dict[str, Any]:
+    """Summarize a TransferReport as a DirectoryTransferResponse dict."""
+    response = DirectoryTransferResponse(
+        source=source,
+        destination=destination,
+        success=not report.errors,
+        files_transferred=report.files_transferred,
+        files_skipped=report.files_skipped,
+        files_failed=len(report.errors),
+        bytes_transferred=report.bytes_transferred,
+        elapsed_seconds=round(report.elapsed_seconds, 3),
+        throughput_mib_per_second=round(report.throughput / (1024 * 1024), 3),
+        errors=report.errors,
+        error="" if not report.errors else f"Failed to transfer {len(report.errors)} files"
+    )
+    return asdict(response)
+
+def _progress(ctx: Context):
+    """Forward directory operation progress as MCP progress notifications."""
+    async def report(processed: int, total: Optional[int], elapsed: float) -> None:
+        await ctx.report_progress(processed, total)
+
+    return report
+
 def register_directory_tools(mcp):
     """Register directory-related MCP tools."""
 
@@ -30,17 +74,18 @@ def register_directory_tools(mcp):
         name="create_directory",
         description="Create a new directory in the specified filesystem"
     )
-    async def create_directory(filesystem: str, path: str) -> Dict[str, str]:
+    async def create_directory(filesystem: str, path: str, account: Optional[str] = None) -> Dict[str, str]:
         """Create a new directory in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             path: Path of the directory to create
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = DirectoryResponse(
                 path=path,
                 success=False,
@@ -49,7 +94,7 @@ def register_directory_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.create_directory(filesystem, path)
+            success = await mcp.clients.get(account).create_directory(filesystem, path)
             response = DirectoryResponse(
                 path=path,
                 success=success,
@@ -69,17 +114,28 @@ def register_directory_tools(mcp):
         name="delete_directory",
         description="Delete a directory from the specified filesystem"
     )
-    async def delete_directory(filesystem: str, path: str) -> Dict[str, str]:
+    async def delete_directory(
+        filesystem: str,
+        path: str,
+        ctx: Context,
+        max_concurrency: Optional[int] = None,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Delete a directory from the specified filesystem.
+
+        Progress is reported as the number of entries deleted.
         
         Args:
             filesystem: Name of the filesystem
             path: Path of the directory to delete
+            max_concurrency: Maximum number of blob deletes in flight on accounts
+                without a hierarchical namespace. Defaults to 32.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = DirectoryResponse(
                 path=path,
                 success=False,
@@ -88,7 +144,9 @@ def register_directory_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.delete_directory(filesystem, path)
+            success = await mcp.clients.get(account).delete_directory(
+                filesystem, path, _progress(ctx), max_concurrency
+            )
             response = DirectoryResponse(
                 path=path,
                 success=success,
@@ -108,18 +166,30 @@ def register_directory_tools(mcp):
         name="rename_directory",
         description="Rename/move a directory within the specified filesystem"
     )
-    async def rename_directory(filesystem: str, source_path: str, destination_path: str) -> Dict[str, str]:
+    async def rename_directory(
+        filesystem: str,
+        source_path: str,
+        destination_path: str,
+        ctx: Context,
+        max_concurrency: Optional[int] = None,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Rename/move a directory within the specified filesystem.
+
+        Progress is reported as the number of entries moved.
         
         Args:
             filesystem: Name of the filesystem
             source_path: Current path of the directory
             destination_path: New path for the directory
+            max_concurrency: Maximum number of blob moves in flight on accounts
+                without a hierarchical namespace. Defaults to 32.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = DirectoryResponse(
                 path=source_path,
                 success=False,
@@ -128,7 +198,9 @@ def register_directory_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.rename_directory(filesystem, source_path, destination_path)
+            success = await mcp.clients.get(account).rename_directory(
+                filesystem, source_path, destination_path, _progress(ctx), max_concurrency
+            )
             response = DirectoryResponse(
                 path=destination_path,
                 success=success,
@@ -148,18 +220,19 @@ def register_directory_tools(mcp):
         name="directory_exists",
         description="Check if a directory exists in the specified filesystem"
     )
-    async def directory_exists(filesystem: str, path: str) -> Dict[str, str]:
+    async def directory_exists(filesystem: str, path: str, account: Optional[str] = None) -> Dict[str, str]:
         """Check if a directory exists in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             path: Path of the directory to check
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
         try:
-            exists = await mcp.client.directory_exists(filesystem, path)
+            exists = await mcp.clients.get(account).directory_exists(filesystem, path)
             response = DirectoryExistsResponse(
                 path=path,
                 exists=exists,
@@ -177,24 +250,91 @@ def register_directory_tools(mcp):
 
     @mcp.tool(
         name="directory_get_paths",
-        description="Get all paths under the specified directory"
+        description="Get paths under the specified directory, optionally one page at a time"
     )
-    async def directory_get_paths(filesystem: str, directory_path: str, recursive: bool = True) -> Dict[str, str]:
+    async def directory_get_paths(
+        filesystem: str,
+        directory_path: str,
+        recursive: bool = True,
+        max_results: Optional[int] = None,
+        continuation_token: Optional[str] = None,
+        detailed: bool = False,
+        max_concurrency: Optional[int] = None,
+        pattern: Optional[str] = None,
+        regex: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_since: Optional[str] = None,
+        modified_before: Optional[str] = None,
+        files_only: bool = False,
+        dirs_only: bool = False,
+        refresh: bool = False,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Get all paths under the specified directory.
+
+        When max_results or continuation_token is given, a single page is
+        returned together with a continuation_token for the next page, which
+        is None once the listing is complete.
+
+        When detailed is True, details holds the is_directory, size,
+        last_modified and etag of each path as arrays aligned with paths.
+
+        The filter arguments are applied while the listing is received, so
+        only matching paths are returned.
+
+        Full listings are cached by the server and kept up to date with the
+        changes it makes. Pass refresh=True to re-list from storage.
         
         Args:
             filesystem: Name of the filesystem
             directory_path: Path of the directory to list
             recursive: If True, list paths recursively. Defaults to True.
+            max_results: Maximum number of paths to return in one page
+            continuation_token: Token from a previous response to fetch the next page
+            detailed: If True, include per-path details. Defaults to False.
+            max_concurrency: Maximum number of parallel subtree listings for full
+                recursive listings. Defaults to 8.
+            pattern: Glob pattern, matched against the file name unless it contains "/"
+            regex: Regular expression searched for in the full path
+            min_size: Minimum size in bytes
+            max_size: Maximum size in bytes
+            modified_since: Only paths modified at or after this ISO 8601 timestamp (UTC if no offset)
+            modified_before: Only paths modified before this ISO 8601 timestamp (UTC if no offset)
+            files_only: Only return files
+            dirs_only: Only return directories
+            refresh: If True, bypass the listing cache and re-list from storage
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the list of paths and operation status
         """
         try:
-            paths = await mcp.client.directory_get_paths(filesystem, directory_path, recursive)
+            path_filter = PathFilter(
+                pattern=pattern,
+                regex=regex,
+                min_size=min_size,
+                max_size=max_size,
+                modified_since=parse_timestamp(modified_since),
+                modified_before=parse_timestamp(modified_before),
+                files_only=files_only,
+                dirs_only=dirs_only,
+            )
+            listing = await mcp.clients.get(account).directory_get_paths(
+                filesystem,
+                directory_path,
+                recursive,
+                max_results,
+                continuation_token,
+                max_concurrency,
+                path_filter,
+                refresh,
+            )
             response = DirectoryPathsResponse(
                 path=directory_path,
-                paths=paths,
+                paths=listing.paths,
+                details=listing.columns() if detailed else None,
+                continuation_token=listing.continuation_token,
                 error=""
             )
             return asdict(response)
@@ -205,3 +345,134 @@ def register_directory_tools(mcp):
                 error=str(e)
             )
             return asdict(response)
+
+    @mcp.tool(
+        name="upload_directory",
+        description="Upload a local directory tree to ADLS2, transferring files concurrently"
+    )
+    async def upload_directory(
+        local_directory: str,
+        filesystem: str,
+        destination: str,
+        max_files: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        sync: bool = False,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Upload a local directory tree to ADLS2.
+
+        Small files are sent with one request each and many are in flight at
+        once; files larger than chunk_size are split into parallel chunks.
+        The server-wide TRANSFER_MAX_INFLIGHT_BYTES and TRANSFER_MAX_BANDWIDTH
+        caps apply across all transfers.
+
+        With sync, only new or changed files are uploaded. Files are compared
+        by size and ETag against a manifest kept in the local directory, and
+        by Content-MD5 when that is inconclusive.
+
+        Args:
+            local_directory: Directory to upload (relative to UPLOAD_ROOT)
+            filesystem: Name of the filesystem
+            destination: Destination directory in ADLS2
+            max_files: Maximum number of files uploaded in parallel. Defaults to 16.
+            chunk_size: Chunk size for large files in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of chunks in flight per large file. Defaults to 4.
+            sync: If True, skip files that are unchanged since the last sync. Defaults to False.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing per-file errors and the aggregate throughput
+        """
+        if mcp.clients.read_only:
+            response = DirectoryTransferResponse(
+                source=local_directory,
+                destination=destination,
+                success=False,
+                error="Cannot upload directory in read-only mode"
+            )
+            return asdict(response)
+
+        try:
+            report = await mcp.clients.get(account).upload_directory(
+                local_directory, filesystem, destination, max_files, chunk_size, max_concurrency, sync
+            )
+            if report is None:
+                response = DirectoryTransferResponse(
+                    source=local_directory,
+                    destination=destination,
+                    success=False,
+                    error="Failed to upload directory"
+                )
+                return asdict(response)
+            return _transfer_response(local_directory, destination, report)
+        except Exception as e:
+            logger.error(f"Error uploading directory {local_directory} to {destination}: {e}")
+            response = DirectoryTransferResponse(
+                source=local_directory,
+                destination=destination,
+                success=False,
+                error=str(e)
+            )
+            return asdict(response)
+
+    @mcp.tool(
+        name="download_directory",
+        description="Download an ADLS2 directory tree, transferring files concurrently"
+    )
+    async def download_directory(
+        filesystem: str,
+        source: str,
+        download_path: str,
+        max_files: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        sync: bool = False,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Download an ADLS2 directory tree.
+
+        Small files are fetched with one request each and many are in flight
+        at once; files larger than chunk_size are split into parallel ranges.
+        The server-wide TRANSFER_MAX_INFLIGHT_BYTES and TRANSFER_MAX_BANDWIDTH
+        caps apply across all transfers.
+
+        With sync, only new or changed files are downloaded. Files are compared
+        by size and ETag against a manifest kept in the local directory, and
+        by Content-MD5 when that is inconclusive.
+
+        Args:
+            filesystem: Name of the filesystem
+            source: Source directory in ADLS2
+            download_path: Local directory to download into (relative to DOWNLOAD_ROOT)
+            max_files: Maximum number of files downloaded in parallel. Defaults to 16.
+            chunk_size: Chunk size for large files in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of ranges in flight per large file. Defaults to 4.
+            sync: If True, skip files that are unchanged since the last sync. Defaults to False.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing per-file errors and the aggregate throughput
+        """
+        try:
+            report = await mcp.clients.get(account).download_directory(
+                filesystem, source, download_path, max_files, chunk_size, max_concurrency, sync
+            )
+            if report is None:
+                response = DirectoryTransferResponse(
+                    source=source,
+                    destination=download_path,
+                    success=False,
+                    error="Failed to download directory"
+                )
+                return asdict(response)
+            return _transfer_response(source, download_path, report)
+        except Exception as e:
+            logger.error(f"Error downloading directory {source} to {download_path}: {e}")
+            response = DirectoryTransferResponse(
+                source=source,
+                destination=download_path,
+                success=False,
+                error=str(e)
+            )
+            return asdict(response)
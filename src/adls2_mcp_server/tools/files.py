@@ -1,7 +1,10 @@
 import json
 import logging
-from dataclasses import dataclass, asdict
-from typing import Dict, Union
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Union
+
+from adls2_mcp_server.ranged import encode_data
+from adls2_mcp_server.scan import DEFAULT_SAMPLE_ROWS, MAX_SAMPLE_ROWS
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,7 @@ class FileResponse:
     source: str
     destination: str
     success: bool
+    digests: Dict[str, str] = field(default_factory=dict)
     error: str = ""
 
 @dataclass
@@ -19,6 +23,37 @@ class FileDownloadResponse:
     source: str
     destination: str
     success: bool
+    digests: Dict[str, str] = field(default_factory=dict)
+    verified: Optional[bool] = None
+    error: str = ""
+
+@dataclass
+class FileRangeResponse:
+    path: str
+    success: bool
+    data: str = ""
+    encoding: str = "utf-8"
+    offset: int = 0
+    length: int = 0
+    size: int = 0
+    etag: str = ""
+    lines: Optional[int] = None
+    truncated: bool = False
+    bytes_fetched: int = 0
+    error: str = ""
+
+@dataclass
+class ParquetInfoResponse:
+    path: str
+    success: bool
+    info: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+@dataclass
+class FileScanResponse:
+    path: str
+    success: bool
+    result: Dict[str, Any] = field(default_factory=dict)
     error: str = ""
 
 @dataclass
@@ -54,25 +89,60 @@ class SetFileMetadataResponse:
     success: bool
     error: str = ""
 
+@dataclass
+class FileBatchResponse:
+    filesystem: str
+    results: List[Dict[str, Any]]
+    succeeded: int
+    failed: int
+    error: str = ""
+
+def _batch_response(filesystem: str, results: List[Any]) -> Dict[str, Any]:
+    """Wrap per-path responses in a FileBatchResponse dict."""
+    failed = sum(1 for result in results if result.error)
+    response = FileBatchResponse(
+        filesystem=filesystem,
+        results=[asdict(result) for result in results],
+        succeeded=len(results) - failed,
+        failed=failed,
+    )
+    return asdict(response)
+
 def register_file_tools(mcp):
     """Register file-related MCP tools."""
 
     @mcp.tool(
         name="upload_file",
-        description="Upload a file to ADLS2"
+        description="Upload a file to ADLS2 in parallel chunks, optionally compressed with gzip or zstd, setting its Content-MD5"
     )
-    async def upload_file(upload_file: str, filesystem: str, destination: str) -> Dict[str, str]:
+    async def upload_file(
+        upload_file: str,
+        filesystem: str,
+        destination: str,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        hashes: Optional[List[str]] = None,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Upload a file to ADLS2.
         
         Args:
             upload_file: Path to the file to upload (relative to UPLOAD_ROOT)
             filesystem: Name of the filesystem
             destination: Destination path in ADLS2
+            chunk_size: Size of each uploaded block in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of blocks uploaded in parallel. Defaults to 4.
+            compression: Compress the file with "gzip" or "zstd" and set its Content-Encoding. Defaults to no compression.
+            compression_level: Compression level, 0-9 for gzip and 1-22 for zstd. Defaults to 6 for gzip and 3 for zstd.
+            hashes: Extra digests computed while the data streams: sha256, crc64, xxh64 or xxh3_128. MD5 is always computed.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = FileResponse(
                 source=upload_file,
                 destination=destination,
@@ -83,11 +153,15 @@ def register_file_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.upload_file(upload_file, filesystem, destination)
+            result = await mcp.clients.get(account).upload_file(
+                upload_file, filesystem, destination, chunk_size, max_concurrency, compression, compression_level, hashes
+            )
+            success = result is not None
             response = FileResponse(
                 source=upload_file,
                 destination=destination,
                 success=success,
+                digests=result.digests if success else {},
                 error="" if success else "Failed to upload file"
             )
             return asdict(response)
@@ -103,25 +177,46 @@ def register_file_tools(mcp):
 
     @mcp.tool(
         name="download_file",
-        description="Download a file from ADLS2"
+        description="Download a file from ADLS2 in parallel ranges, decompressing gzip or zstd encoded files and verifying their Content-MD5"
     )
-    async def download_file(filesystem: str, source: str, download_path: str) -> Dict[str, str]:
+    async def download_file(
+        filesystem: str,
+        source: str,
+        download_path: str,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        decompress: bool = True,
+        hashes: Optional[List[str]] = None,
+        verify: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Download a file from ADLS2.
         
         Args:
             filesystem: Name of the filesystem
             source: Source path in ADLS2
             download_path: Path where to save the file (relative to UPLOAD_ROOT)
+            chunk_size: Size of each ranged read in bytes. Defaults to 8 MiB.
+            max_concurrency: Maximum number of ranges downloaded in parallel. Defaults to 4.
+            decompress: Decompress a file stored with a gzip or zstd Content-Encoding. Defaults to True.
+            hashes: Extra digests computed while the data streams: sha256, crc64, xxh64 or xxh3_128. MD5 is always computed.
+            verify: Fail the download if its MD5 does not match the file's Content-MD5. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
         try:
-            success = await mcp.client.download_file(filesystem, source, download_path)
+            result = await mcp.clients.get(account).download_file(
+                filesystem, source, download_path, chunk_size, max_concurrency, decompress, hashes, verify
+            )
+            success = result is not None
             response = FileDownloadResponse(
                 source=source,
                 destination=download_path,
                 success=success,
+                digests=result.digests if success else {},
+                verified=result.verified if success else None,
                 error="" if success else "Failed to download file"
             )
             return asdict(response)
@@ -135,22 +230,265 @@ def register_file_tools(mcp):
             )
             return asdict(response)
 
+    @mcp.tool(
+        name="read_file_range",
+        description="Read a byte range, the first or last lines, or a window of lines of a file without downloading it"
+    )
+    async def read_file_range(
+        filesystem: str,
+        file_path: str,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        head_lines: Optional[int] = None,
+        tail_lines: Optional[int] = None,
+        start_line: Optional[int] = None,
+        line_count: Optional[int] = None,
+        encoding: str = "utf-8",
+        max_bytes: Optional[int] = None,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Read part of a file with ranged reads, without downloading it.
+
+        Pass one of: offset/length for a byte range, head_lines, tail_lines,
+        or start_line/line_count for a window of lines. With none, the start
+        of the file is read. Only the bytes needed are fetched, except that
+        a window of lines is found by reading through the lines before it.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            offset: Byte offset to read from. Negative offsets count from the end of the file.
+            length: Number of bytes to read. Defaults to the rest of the file, up to max_bytes.
+            head_lines: Number of lines to read from the start of the file
+            tail_lines: Number of lines to read from the end of the file
+            start_line: First line of a window of lines, numbered from 1
+            line_count: Number of lines in the window. Defaults to 1.
+            encoding: Text encoding to decode the bytes with, or "base64". Defaults to utf-8.
+            max_bytes: Maximum number of bytes returned. Defaults to 64 KiB,
+                and cannot exceed READ_MAX_BYTES.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing the data, its offset and length, the file size and
+            ETag, and whether the read was truncated at max_bytes
+        """
+        try:
+            result = await mcp.clients.get(account).read_file_range(
+                filesystem, file_path, offset, length, head_lines, tail_lines, start_line, line_count, max_bytes
+            )
+            if result is None:
+                response = FileRangeResponse(path=file_path, success=False, error="Failed to read file range")
+                return asdict(response)
+            response = FileRangeResponse(
+                path=file_path,
+                success=True,
+                data=encode_data(result.data, encoding),
+                encoding=encoding,
+                offset=result.offset,
+                length=len(result.data),
+                size=result.size,
+                etag=result.etag,
+                lines=result.lines,
+                truncated=result.truncated,
+                bytes_fetched=result.bytes_fetched,
+            )
+            return asdict(response)
+        except Exception as e:
+            logger.error(f"Error reading range of file {file_path}: {e}")
+            response = FileRangeResponse(path=file_path, success=False, error=str(e))
+            return asdict(response)
+
+    @mcp.tool(
+        name="get_parquet_info",
+        description="Get the schema, row count, row groups and column statistics of a Parquet file by reading only its footer"
+    )
+    async def get_parquet_info(
+        filesystem: str,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        max_row_groups: Optional[int] = None,
+        use_cache: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get the schema, row count, row groups and column statistics of a Parquet file.
+
+        Only the footer is read, in one or two small ranged reads whatever
+        the size of the file. Min/max statistics are decoded according to
+        each column's type; file-wide values combine all row groups.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            columns: Names of the columns to describe, dotted for nested columns. Defaults to all.
+            max_row_groups: Maximum number of row groups listed. Defaults to 100.
+            use_cache: If False, bypass the server's properties and footer caches. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing the file's Parquet metadata
+        """
+        try:
+            info = await mcp.clients.get(account).get_parquet_info(
+                filesystem, file_path, columns, max_row_groups, use_cache
+            )
+            response = ParquetInfoResponse(
+                path=file_path,
+                success=info is not None,
+                info=info or {},
+                error="" if info is not None else "Failed to read Parquet footer"
+            )
+            return asdict(response)
+        except Exception as e:
+            logger.error(f"Error reading Parquet footer of file {file_path}: {e}")
+            response = ParquetInfoResponse(path=file_path, success=False, error=str(e))
+            return asdict(response)
+
+    @mcp.tool(
+        name="sample_file",
+        description="Return the first rows of a CSV or JSONL file, parsed, reading only the bytes needed"
+    )
+    async def sample_file(
+        filesystem: str,
+        file_path: str,
+        rows: int = DEFAULT_SAMPLE_ROWS,
+        format: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        header: bool = True,
+        columns: Optional[List[str]] = None,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return the first rows of a CSV or JSONL file, parsed into records.
+
+        The file is streamed with small ranged reads that stop as soon as
+        enough rows have been parsed.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            rows: Number of rows to return. Defaults to 10, at most 1000.
+            format: "csv" or "jsonl". Defaults to a guess from the extension.
+            delimiter: CSV field delimiter. Defaults to a tab for .tsv files and a comma otherwise.
+            header: Whether the first CSV line holds the column names. Defaults to True.
+            columns: Columns to return. Defaults to all.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing the column names and the sampled rows
+        """
+        try:
+            if rows < 1 or rows > MAX_SAMPLE_ROWS:
+                raise ValueError(f"rows must be between 1 and {MAX_SAMPLE_ROWS}")
+            result = await mcp.clients.get(account).scan_file(
+                filesystem,
+                file_path,
+                format,
+                delimiter,
+                header,
+                columns,
+                max_rows=rows,
+                sample_rows=rows,
+                collect_stats=False,
+            )
+            response = FileScanResponse(
+                path=file_path,
+                success=result is not None,
+                result=result or {},
+                error="" if result is not None else "Failed to sample file"
+            )
+            return asdict(response)
+        except Exception as e:
+            logger.error(f"Error sampling file {file_path}: {e}")
+            response = FileScanResponse(path=file_path, success=False, error=str(e))
+            return asdict(response)
+
+    @mcp.tool(
+        name="scan_file",
+        description="Stream a CSV or JSONL file to count rows and compute per-column null counts, distinct counts, top values and numeric ranges"
+    )
+    async def scan_file(
+        filesystem: str,
+        file_path: str,
+        format: Optional[str] = None,
+        delimiter: Optional[str] = None,
+        header: bool = True,
+        columns: Optional[List[str]] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        top_k: Optional[int] = None,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Stream a CSV or JSONL file and compute row and column statistics.
+
+        The file is read chunk by chunk and never held whole, in memory or
+        on disk. Per column it reports null counts, distinct counts, the
+        most frequent values and, for numeric columns, min, max and mean.
+        Counts are exact up to 1000 distinct values per column and
+        approximate beyond. The scan stops early at max_rows or max_bytes;
+        "complete" tells whether the whole file was read.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_path: Path to the file relative to filesystem root
+            format: "csv" or "jsonl". Defaults to a guess from the extension.
+            delimiter: CSV field delimiter. Defaults to a tab for .tsv files and a comma otherwise.
+            header: Whether the first CSV line holds the column names. Defaults to True.
+            columns: Columns to describe. Defaults to all, up to 256.
+            max_rows: Number of rows after which the scan stops. Defaults to 1,000,000.
+            max_bytes: Number of bytes after which the scan stops. Defaults to
+                256 MiB, and cannot exceed SCAN_MAX_BYTES.
+            top_k: Number of most frequent values reported per column. Defaults to 10.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing the row count, the column statistics and how much of the file was scanned
+        """
+        try:
+            result = await mcp.clients.get(account).scan_file(
+                filesystem,
+                file_path,
+                format,
+                delimiter,
+                header,
+                columns,
+                max_rows=max_rows,
+                max_bytes=max_bytes,
+                top_k=top_k,
+            )
+            response = FileScanResponse(
+                path=file_path,
+                success=result is not None,
+                result=result or {},
+                error="" if result is not None else "Failed to scan file"
+            )
+            return asdict(response)
+        except Exception as e:
+            logger.error(f"Error scanning file {file_path}: {e}")
+            response = FileScanResponse(path=file_path, success=False, error=str(e))
+            return asdict(response)
+
     @mcp.tool(
         name="file_exists",
         description="Check if a file exists in the specified filesystem"
     )
-    async def file_exists(filesystem: str, file_path: str) -> Dict[str, str]:
+    async def file_exists(
+        filesystem: str,
+        file_path: str,
+        use_cache: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Check if a file exists in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             file_path: Path to the file relative to filesystem root
+            use_cache: If False, bypass the server's properties cache. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
         try:
-            exists = await mcp.client.file_exists(filesystem, file_path)
+            exists = await mcp.clients.get(account).file_exists(filesystem, file_path, use_cache)
             response = FileExistsResponse(
                 path=file_path,
                 exists=exists,
@@ -170,18 +508,24 @@ def register_file_tools(mcp):
         name="rename_file",
         description="Rename/move a file within the specified filesystem"
     )
-    async def rename_file(filesystem: str, source_path: str, destination_path: str) -> Dict[str, str]:
+    async def rename_file(
+        filesystem: str,
+        source_path: str,
+        destination_path: str,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Rename/move a file within the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             source_path: Current path of the file relative to filesystem root
             destination_path: New path for the file relative to filesystem root
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = FileRenameResponse(
                 source=source_path,
                 destination=destination_path,
@@ -191,7 +535,7 @@ def register_file_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.rename_file(filesystem, source_path, destination_path)
+            success = await mcp.clients.get(account).rename_file(filesystem, source_path, destination_path)
             response = FileRenameResponse(
                 source=source_path,
                 destination=destination_path,
@@ -213,18 +557,25 @@ def register_file_tools(mcp):
         name="get_file_properties",
         description="Get properties of a file in the specified filesystem"
     )
-    async def get_file_properties(filesystem: str, file_path: str) -> Dict[str, str]:
+    async def get_file_properties(
+        filesystem: str,
+        file_path: str,
+        use_cache: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Get properties of a file in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             file_path: Path to the file relative to filesystem root
+            use_cache: If False, bypass the server's properties cache. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the file properties and operation status
         """
         try:
-            properties = await mcp.client.get_file_properties(filesystem, file_path)
+            properties = await mcp.clients.get(account).get_file_properties(filesystem, file_path, use_cache)
             if properties is not None:
                 response = FilePropertiesResponse(
                     path=file_path,
@@ -254,18 +605,25 @@ def register_file_tools(mcp):
         name="get_file_metadata",
         description="Get metadata of a file in the specified filesystem"
     )
-    async def get_file_metadata(filesystem: str, file_path: str) -> Dict[str, str]:
+    async def get_file_metadata(
+        filesystem: str,
+        file_path: str,
+        use_cache: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Get metadata of a file in the specified filesystem.
         
         Args:
             filesystem: Name of the filesystem
             file_path: Path to the file relative to filesystem root
+            use_cache: If False, bypass the server's properties cache. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the file metadata and operation status
         """
         try:
-            metadata = await mcp.client.get_file_metadata(filesystem, file_path)
+            metadata = await mcp.clients.get(account).get_file_metadata(filesystem, file_path, use_cache)
             if metadata is not None:
                 response = FileMetadataResponse(
                     path=file_path,
@@ -295,7 +653,13 @@ def register_file_tools(mcp):
         name="set_file_metadata",
         description="Set a single metadata key-value pair for a file"
     )
-    async def set_file_metadata(filesystem: str, file_path: str, key: str, value: str) -> Dict[str, str]:
+    async def set_file_metadata(
+        filesystem: str,
+        file_path: str,
+        key: str,
+        value: str,
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Set a single metadata key-value pair for a file.
         
         Args:
@@ -303,11 +667,12 @@ def register_file_tools(mcp):
             file_path: Path to the file relative to filesystem root
             key: Metadata key
             value: Metadata value
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the operation status
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = SetFileMetadataResponse(
                 path=file_path,
                 success=False,
@@ -316,7 +681,7 @@ def register_file_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.set_file_metadata(filesystem, file_path, key, value)
+            success = await mcp.clients.get(account).set_file_metadata(filesystem, file_path, key, value)
             response = SetFileMetadataResponse(
                 path=file_path,
                 success=success,
@@ -336,18 +701,24 @@ def register_file_tools(mcp):
         name="set_file_metadata_json",
         description="Set multiple metadata key-value pairs for a file using JSON"
     )
-    async def set_file_metadata_json(filesystem: str, file_path: str, metadata_json: Union[str, Dict[str, str]]) -> Dict[str, str]:
+    async def set_file_metadata_json(
+        filesystem: str,
+        file_path: str,
+        metadata_json: Union[str, Dict[str, str]],
+        account: Optional[str] = None,
+    ) -> Dict[str, str]:
         """Set multiple metadata key-value pairs for a file using JSON.
         
         Args:
             filesystem: Name of the filesystem
             file_path: Path to the file relative to filesystem root
             metadata_json: JSON string or dictionary containing metadata key-value pairs
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the operation status
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = SetFileMetadataResponse(
                 path=file_path,
                 success=False,
@@ -360,7 +731,9 @@ def register_file_tools(mcp):
             if isinstance(metadata_json, dict):
                 metadata_json = json.dumps(metadata_json)
             
-            success = await mcp.client.set_file_metadata_json(filesystem, file_path, metadata_json)
+            success = await mcp.clients.get(account).set_file_metadata_json(
+                filesystem, file_path, metadata_json
+            )
             response = SetFileMetadataResponse(
                 path=file_path,
                 success=success,
@@ -375,3 +748,151 @@ def register_file_tools(mcp):
                 error=str(e)
             )
             return asdict(response)
+
+    @mcp.tool(
+        name="file_exists_batch",
+        description="Check if several files exist in the specified filesystem"
+    )
+    async def file_exists_batch(
+        filesystem: str,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Check if several files exist in the specified filesystem.
+
+        The checks run concurrently and each path gets its own result, so
+        one failing path does not fail the batch.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_paths: Paths to the files relative to filesystem root
+            max_concurrency: Maximum number of checks in flight. Defaults to 16.
+            use_cache: If False, bypass the server's properties cache. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing one result per path and the success/failure counts
+        """
+        try:
+            items = await mcp.clients.get(account).file_exists_batch(
+                filesystem, file_paths, max_concurrency, use_cache
+            )
+            results = [
+                FileExistsResponse(path=item.path, exists=bool(item.value), error=item.error)
+                for item in items
+            ]
+            return _batch_response(filesystem, results)
+        except Exception as e:
+            logger.error(f"Error checking existence of {len(file_paths)} files: {e}")
+            response = FileBatchResponse(
+                filesystem=filesystem,
+                results=[],
+                succeeded=0,
+                failed=len(file_paths),
+                error=str(e)
+            )
+            return asdict(response)
+
+    @mcp.tool(
+        name="get_file_properties_batch",
+        description="Get properties of several files in the specified filesystem"
+    )
+    async def get_file_properties_batch(
+        filesystem: str,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get properties of several files in the specified filesystem.
+
+        The requests run concurrently and each path gets its own result, so
+        one failing path does not fail the batch.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_paths: Paths to the files relative to filesystem root
+            max_concurrency: Maximum number of requests in flight. Defaults to 16.
+            use_cache: If False, bypass the server's properties cache. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing one result per path and the success/failure counts
+        """
+        try:
+            items = await mcp.clients.get(account).get_file_properties_batch(
+                filesystem, file_paths, max_concurrency, use_cache
+            )
+            results = [
+                FilePropertiesResponse(
+                    path=item.path,
+                    properties=item.value or {},
+                    success=not item.error,
+                    error=item.error
+                )
+                for item in items
+            ]
+            return _batch_response(filesystem, results)
+        except Exception as e:
+            logger.error(f"Error getting properties for {len(file_paths)} files: {e}")
+            response = FileBatchResponse(
+                filesystem=filesystem,
+                results=[],
+                succeeded=0,
+                failed=len(file_paths),
+                error=str(e)
+            )
+            return asdict(response)
+
+    @mcp.tool(
+        name="get_file_metadata_batch",
+        description="Get metadata of several files in the specified filesystem"
+    )
+    async def get_file_metadata_batch(
+        filesystem: str,
+        file_paths: List[str],
+        max_concurrency: Optional[int] = None,
+        use_cache: bool = True,
+        account: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get metadata of several files in the specified filesystem.
+
+        The requests run concurrently and each path gets its own result, so
+        one failing path does not fail the batch.
+
+        Args:
+            filesystem: Name of the filesystem
+            file_paths: Paths to the files relative to filesystem root
+            max_concurrency: Maximum number of requests in flight. Defaults to 16.
+            use_cache: If False, bypass the server's properties cache. Defaults to True.
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
+        Returns:
+            Dict containing one result per path and the success/failure counts
+        """
+        try:
+            items = await mcp.clients.get(account).get_file_metadata_batch(
+                filesystem, file_paths, max_concurrency, use_cache
+            )
+            results = [
+                FileMetadataResponse(
+                    path=item.path,
+                    metadata=item.value or {},
+                    success=not item.error,
+                    error=item.error
+                )
+                for item in items
+            ]
+            return _batch_response(filesystem, results)
+        except Exception as e:
+            logger.error(f"Error getting metadata for {len(file_paths)} files: {e}")
+            response = FileBatchResponse(
+                filesystem=filesystem,
+                results=[],
+                succeeded=0,
+                failed=len(file_paths),
+                error=str(e)
+            )
+            return asdict(response)
@@ -2,7 +2,7 @@ import json
 import logging
 import os
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger(__name__)
@@ -32,14 +32,17 @@ def register_filesystem_tools(mcp):
         name="list_filesystems",
         description="List all filesystems in the storage account"
     )
-    async def list_filesystems() -> Dict[str, str]:
+    async def list_filesystems(account: Optional[str] = None) -> Dict[str, str]:
         """List all filesystems in the storage account.
         
+        Args:
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
+
         Returns:
             Dict containing the list of filesystems and operation status
         """
         try:
-            fs = await mcp.client.list_filesystems()
+            fs = await mcp.clients.get(account).list_filesystems()
             response = FilesystemListResponse(
                 success=True,
                 filesystems=fs,
@@ -58,16 +61,17 @@ def register_filesystem_tools(mcp):
         name="create_filesystem",
         description="Create a new ADLS2 filesystem (container)"
     )
-    async def create_filesystem(name: str) -> Dict[str, str]:
+    async def create_filesystem(name: str, account: Optional[str] = None) -> Dict[str, str]:
         """Create a new filesystem in the storage account.
         
         Args:
             name: Name of the filesystem to create
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = CreateFilesystemResponse(
                 name=name,
                 success=False,
@@ -76,7 +80,7 @@ def register_filesystem_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.create_container(name)
+            success = await mcp.clients.get(account).create_container(name)
             response = CreateFilesystemResponse(
                 name=name,
                 success=success,
@@ -96,16 +100,17 @@ def register_filesystem_tools(mcp):
         name="delete_filesystem",
         description="Delete an ADLS2 filesystem"
     )
-    async def delete_filesystem(name: str) -> Dict[str, str]:
+    async def delete_filesystem(name: str, account: Optional[str] = None) -> Dict[str, str]:
         """Delete a filesystem from the storage account.
         
         Args:
             name: Name of the filesystem to delete
+            account: Storage account to use. Defaults to AZURE_STORAGE_ACCOUNT_NAME.
             
         Returns:
             Dict containing the result of the operation
         """
-        if mcp.client.read_only:
+        if mcp.clients.read_only:
             response = DeleteFilesystemResponse(
                 name=name,
                 success=False,
@@ -114,7 +119,7 @@ def register_filesystem_tools(mcp):
             return asdict(response)
 
         try:
-            success = await mcp.client.delete_filesystem(name)
+            success = await mcp.clients.get(account).delete_filesystem(name)
             response = DeleteFilesystemResponse(
                 name=name,
                 success=success,
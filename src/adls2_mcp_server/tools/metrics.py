@@ -0,0 +1,87 @@
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterator
+
+from adls2_mcp_server.metrics import METRICS, Sample
+
+logger = logging.getLogger(__name__)
+
+# Client stats that are current values rather than running counts
+_GAUGE_STATS = {"concurrency_limit", "in_flight", "size", "listings", "entries", "hit_rate"}
+
+def _stat_metric(prefix: str, name: str) -> str:
+    """Metric name of a client stat, with the _total suffix of a counter unless it is a gauge."""
+    return f"{prefix}{name}" if name in _GAUGE_STATS else f"{prefix}{name}_total"
+
+@dataclass
+class RequestStatsResponse:
+    success: bool
+    accounts: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    error: str = ""
+
+@dataclass
+class ServerMetricsResponse:
+    success: bool
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+def register_metrics_tools(mcp):
+    """Register metrics related MCP tools."""
+
+    def collect_client_stats() -> Iterator[Sample]:
+        """Request and cache counters of the live clients, if the pool was ever created."""
+        if not mcp.clients.loaded:
+            return
+        for account, stats in mcp.clients.request_stats().items():
+            for name, value in stats.items():
+                yield _stat_metric("adls2_", name), {"account": account}, value
+        for account, caches in mcp.clients.cache_stats().items():
+            for cache, stats in caches.items():
+                for name, value in stats.items():
+                    yield _stat_metric("adls2_cache_", name), {"account": account, "cache": cache}, value
+
+    METRICS.add_collector(collect_client_stats)
+
+    @mcp.tool(
+        name="get_request_stats",
+        description="Get request, throttling and retry counters of the storage accounts in use"
+    )
+    async def get_request_stats() -> Dict[str, Any]:
+        """Get request, throttling and retry counters of the storage accounts in use.
+
+        Counters start when an account's client is created. Each account
+        also reports its current adaptive limit on requests in flight, which
+        shrinks while the account throttles and grows back afterwards.
+
+        Returns:
+            Dict containing the counters by account
+        """
+        try:
+            response = RequestStatsResponse(success=True, accounts=mcp.clients.request_stats())
+            return asdict(response)
+        except Exception as e:
+            logger.error(f"Error getting request stats: {e}")
+            response = RequestStatsResponse(success=False, error=str(e))
+            return asdict(response)
+
+    @mcp.tool(
+        name="get_server_metrics",
+        description="Get latency, bytes transferred, error, retry and cache metrics of the server"
+    )
+    async def get_server_metrics() -> Dict[str, Any]:
+        """Get latency, bytes transferred, error, retry and cache metrics of the server.
+
+        Latencies are kept per tool and per storage operation, with their
+        count, mean and estimated p50, p90 and p99 in milliseconds. Counters
+        are cumulative since the server started.
+
+        Returns:
+            Dict containing the metrics by name, each a list of labelled values
+        """
+        try:
+            response = ServerMetricsResponse(success=True, metrics=METRICS.snapshot())
+            return asdict(response)
+        except Exception as e:
+            logger.error(f"Error getting server metrics: {e}")
+            response = ServerMetricsResponse(success=False, error=str(e))
+            return asdict(response)
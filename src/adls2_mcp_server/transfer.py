@@ -0,0 +1,749 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.filedatalake import ContentSettings
+
+from adls2_mcp_server.compression import (
+    UNCOMPRESSED_SIZE_KEY,
+    compress_member,
+    decodable,
+    decompressing_writer,
+)
+from adls2_mcp_server.hashing import IntegrityError, StreamHasher, verify_md5
+
+logger = logging.getLogger(__name__)
+
+# Defaults for chunked transfers. Peak memory is bounded by
+# chunk_size * max_concurrency regardless of the file size.
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Service limit for a single append operation
+MAX_CHUNK_SIZE = 4000 * 1024 * 1024
+
+# Suffix of the temporary file a download is written to before it is renamed
+PARTIAL_SUFFIX = ".partial"
+
+# Suffix of the checkpoint journal kept next to a transfer's local file
+JOURNAL_SUFFIX = ".adls2-journal"
+
+
+def resolve_transfer_options(chunk_size: Optional[int], max_concurrency: Optional[int]) -> Tuple[int, int]:
+    """Apply defaults to and validate chunked transfer options.
+
+    Args:
+        chunk_size: Size of each chunk in bytes, or None for the default
+        max_concurrency: Number of chunks in flight, or None for the default
+
+    Returns:
+        Tuple[int, int]: The resolved (chunk_size, max_concurrency)
+
+    Raises:
+        ValueError: If either option is out of range
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+
+    if chunk_size < 1 or chunk_size > MAX_CHUNK_SIZE:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE} bytes")
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    return chunk_size, max_concurrency
+
+
+class TransferLimiter:
+    """Caps the bytes in flight and the transfer rate across transfers.
+
+    Chunks reserve their size before they are read or fetched and release
+    it once they have been sent or written. Reservations are granted in
+    FIFO order; one that is larger than max_inflight_bytes is admitted on
+    its own so it cannot block forever. With max_bandwidth set, granted
+    reservations are also paced so the average rate stays under the cap.
+    """
+
+    def __init__(self, max_inflight_bytes: int, max_bandwidth: Optional[float] = None):
+        """Initialize the limiter.
+
+        Args:
+            max_inflight_bytes: Maximum number of bytes reserved at once
+            max_bandwidth: Maximum average rate in bytes per second, or None
+                for no limit
+        """
+        self.max_inflight_bytes = max_inflight_bytes
+        self.max_bandwidth = max_bandwidth
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._next_slot = 0.0
+
+    def _fits(self, nbytes: int) -> bool:
+        return self.in_flight == 0 or self.in_flight + nbytes <= self.max_inflight_bytes
+
+    async def acquire(self, nbytes: int) -> None:
+        """Reserve nbytes, waiting for room and for the bandwidth budget."""
+        if not self._waiters and self._fits(nbytes):
+            self.in_flight += nbytes
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((nbytes, future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # release() may already have dropped it; if not, the
+                    # waiters behind it may fit now
+                    if (nbytes, future) in self._waiters:
+                        self._waiters.remove((nbytes, future))
+                        self.release(0)
+                else:
+                    self.release(nbytes)
+                raise
+
+        if self.max_bandwidth:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + nbytes / self.max_bandwidth
+            if start > now:
+                try:
+                    await asyncio.sleep(start - now)
+                except asyncio.CancelledError:
+                    self.release(nbytes)
+                    raise
+
+    def release(self, nbytes: int) -> None:
+        """Return a reservation and admit the waiters that now fit."""
+        self.in_flight -= nbytes
+        while self._waiters and self._fits(self._waiters[0][0]):
+            waiting, future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += waiting
+                future.set_result(None)
+
+
+class _ChunkPool:
+    """Bounded set of in-flight chunk tasks.
+
+    A slot is acquired before a chunk is read or fetched and released when
+    its task finishes, so at most max_concurrency chunks are held at once.
+    With a limiter, the chunk's bytes are reserved and released along with
+    the slot. The first task failure is re-raised on the next acquire or on
+    exit, and the remaining tasks are cancelled.
+    """
+
+    def __init__(self, max_concurrency: int, limiter: Optional[TransferLimiter] = None):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._limiter = limiter
+        self._tasks = set()
+        self._error: Optional[BaseException] = None
+        self.started = 0
+
+    async def __aenter__(self) -> "_ChunkPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            await self._cancel()
+            return
+        try:
+            await asyncio.gather(*list(self._tasks))
+        except BaseException:
+            await self._cancel()
+            raise
+        if self._error is not None:
+            raise self._error
+
+    async def acquire(self, nbytes: int = 0) -> None:
+        """Wait for a free slot and, with a limiter, room for nbytes."""
+        await self._semaphore.acquire()
+        if self._error is not None:
+            self._semaphore.release()
+            raise self._error
+        if self._limiter is not None:
+            try:
+                await self._limiter.acquire(nbytes)
+            except BaseException:
+                self._semaphore.release()
+                raise
+
+    def release(self, nbytes: int = 0) -> None:
+        """Give back a slot acquired for a chunk that was not started."""
+        self._semaphore.release()
+        if self._limiter is not None:
+            self._limiter.release(nbytes)
+
+    def start(self, coro, nbytes: int = 0) -> None:
+        """Run a chunk coroutine in the slot acquired for it."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(lambda task: self._done(task, nbytes))
+        self.started += 1
+
+    def _done(self, task: asyncio.Task, nbytes: int) -> None:
+        self._tasks.discard(task)
+        self.release(nbytes)
+        if not task.cancelled() and task.exception() is not None and self._error is None:
+            self._error = task.exception()
+
+    async def _cancel(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class _Sequence:
+    """Hands a value from each chunk task to the next, in the order they were started.
+
+    A task gets its turn with next(): it awaits the previous future for the
+    value left by the task before it, and sets the current one once its
+    in-order step is done. A failure is passed down the chain, so the tasks
+    after a failed one fail with it instead of waiting forever.
+    """
+
+    def __init__(self, initial=None):
+        self._last = asyncio.get_running_loop().create_future()
+        self._last.set_result(initial)
+
+    def next(self) -> Tuple[asyncio.Future, asyncio.Future]:
+        """The futures of the previous step and of a new one."""
+        previous = self._last
+        self._last = asyncio.get_running_loop().create_future()
+        # Mark a failure as retrieved when no task is left to await it
+        self._last.add_done_callback(lambda future: future.cancelled() or future.exception())
+        return previous, self._last
+
+    @staticmethod
+    def fail(current: asyncio.Future, error: BaseException) -> None:
+        """Pass a task's failure on to the tasks after it."""
+        if current.done():
+            return
+        if isinstance(error, asyncio.CancelledError):
+            current.cancel()
+        else:
+            current.set_exception(error)
+
+    async def result(self):
+        """The value left by the last step."""
+        return await self._last
+
+
+@dataclass
+class TransferResult:
+    """Outcome of a chunked transfer.
+
+    The digests are of the bytes as stored, which for a file with a
+    Content-Encoding differ from the local file.
+    """
+    size: int
+    etag: str = ""
+    last_modified: Optional[datetime] = None
+    digests: Dict[str, str] = field(default_factory=dict)
+    verified: Optional[bool] = None
+    encoding: str = ""
+
+
+_journal_lock = threading.Lock()
+
+
+@dataclass
+class TransferJournal:
+    """Checkpoint of a chunked transfer, persisted next to its local file.
+
+    Completed chunks are stored as merged [start, end) ranges of chunk
+    indices so the journal stays small for very large files.
+    """
+    path: Path
+    source: str
+    destination: str
+    source_etag: str
+    size: int
+    chunk_size: int
+    target_etag: str = ""
+    compression: str = ""
+    compression_level: Optional[int] = None
+    completed: List[List[int]] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["TransferJournal"]:
+        """Load a journal, returning None if it is missing or unreadable."""
+        try:
+            with open(path, "r") as file:
+                state = json.load(file)
+            return cls(path=path, **state)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable transfer journal {path}: {e}")
+            return None
+
+    def matches(
+        self,
+        source: str,
+        destination: str,
+        source_etag: str,
+        size: int,
+        chunk_size: int,
+        compression: str = "",
+        compression_level: Optional[int] = None,
+    ) -> bool:
+        """Whether this journal describes the same transfer of the same source version."""
+        return (
+            self.source == source
+            and self.destination == destination
+            and self.source_etag == source_etag
+            and self.size == size
+            and self.chunk_size == chunk_size
+            and self.compression == compression
+            and self.compression_level == compression_level
+        )
+
+    def is_done(self, index: int) -> bool:
+        """Whether the chunk at index has already been transferred."""
+        return any(start <= index < end for start, end in self.completed)
+
+    def mark_done(self, index: int) -> None:
+        """Record the chunk at index as transferred."""
+        ranges = sorted([list(r) for r in self.completed] + [[index, index + 1]])
+        merged = [ranges[0]]
+        for start, end in ranges[1:]:
+            if start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.completed = merged
+
+    def save(self) -> None:
+        """Atomically write the journal to disk."""
+        state: Dict = asdict(self)
+        del state["path"]
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with _journal_lock:
+            with open(temp_path, "w") as file:
+                json.dump(state, file)
+            os.replace(temp_path, self.path)
+
+    def discard(self) -> None:
+        """Remove the journal once the transfer has completed."""
+        self.path.unlink(missing_ok=True)
+
+
+def _remote_name(file_client) -> str:
+    return f"{file_client.file_system_name}/{file_client.path_name}"
+
+
+async def upload_chunked(
+    file_client,
+    source_path: Path,
+    chunk_size: int,
+    max_concurrency: int,
+    limiter: Optional[TransferLimiter] = None,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+    hashes: Iterable[str] = (),
+) -> TransferResult:
+    """Stream a local file to ADLS2 using parallel append operations.
+
+    The file is read in chunks. Each chunk is appended at its offset while
+    the next ones are read, with at most max_concurrency chunks held in
+    memory at a time. The data is committed with a single flush once every
+    append has completed.
+
+    With compression, each chunk is compressed in a worker thread as a
+    self-contained gzip member or zstd frame, so chunks compress in
+    parallel. Compressed chunks take their offsets in order, and the file
+    is committed with its Content-Encoding set and its uncompressed size
+    in the UNCOMPRESSED_SIZE_KEY metadata.
+
+    The bytes sent are hashed in order as they are read or compressed,
+    without a second pass over the file, and the file is committed with
+    their MD5 as its Content-MD5.
+
+    Progress is checkpointed in a journal next to the source file. If a
+    previous upload of the same, unmodified source to the same destination
+    was interrupted, and the uncommitted destination file is still the one
+    it created, only the missing chunks are sent. The chunks already sent
+    are still read, to hash them, and a compressed upload compresses them
+    again to find the offsets of the rest.
+
+    Args:
+        file_client: Async DataLakeFileClient for the destination
+        source_path: Local file to upload
+        chunk_size: Size of each appended block in bytes, before compression
+        max_concurrency: Maximum number of blocks in flight
+        limiter: Optional limiter shared with other transfers
+        compression: Content encoding to compress with, gzip or zstd, or
+            None to upload the file as is
+        compression_level: Compression level, required with compression
+        hashes: Digests to compute on top of MD5; see HASH_ALGORITHMS
+
+    Returns:
+        TransferResult: Bytes uploaded, their digests and the ETag of the committed file
+    """
+    stat = source_path.stat()
+    size = stat.st_size
+    source = str(source_path)
+    destination = _remote_name(file_client)
+    source_etag = f"{size}-{stat.st_mtime_ns}"
+    journal_path = source_path.with_name(source_path.name + JOURNAL_SUFFIX)
+    hasher = StreamHasher(hashes)
+
+    journal = TransferJournal.load(journal_path)
+    if journal is not None and journal.matches(
+        source, destination, source_etag, size, chunk_size, compression or "", compression_level
+    ):
+        try:
+            properties = await file_client.get_file_properties()
+            if properties.etag != journal.target_etag:
+                journal = None
+        except ResourceNotFoundError:
+            journal = None
+    else:
+        journal = None
+
+    if journal is None:
+        metadata = {UNCOMPRESSED_SIZE_KEY: str(size)} if compression else None
+        created = await file_client.create_file(
+            content_settings=ContentSettings(content_encoding=compression), metadata=metadata
+        )
+        journal = TransferJournal(
+            path=journal_path,
+            source=source,
+            destination=destination,
+            source_etag=source_etag,
+            size=size,
+            chunk_size=chunk_size,
+            target_etag=created["etag"],
+            compression=compression or "",
+            compression_level=compression_level,
+        )
+        await asyncio.to_thread(journal.save)
+    else:
+        logger.info(f"Resuming upload of {source_path} to {destination}")
+
+    async def append(index: int, data: bytes, offset: int) -> None:
+        await file_client.append_data(data, offset=offset, length=len(data))
+        journal.mark_done(index)
+        await asyncio.to_thread(journal.save)
+
+    async def compress_and_append(index: int, data: bytes, previous: asyncio.Future, current: asyncio.Future) -> None:
+        try:
+            compressed = await asyncio.to_thread(compress_member, compression, compression_level, data)
+            offset = await previous
+            await asyncio.to_thread(hasher.update, compressed)
+            current.set_result(offset + len(compressed))
+        except BaseException as e:
+            _Sequence.fail(current, e)
+            raise
+        if not journal.is_done(index):
+            await append(index, compressed, offset)
+
+    sequence = _Sequence(0) if compression else None
+    # An empty file still compresses to one member, so it decompresses cleanly
+    offsets = range(0, size, chunk_size) if size or not compression else range(1)
+    with open(source_path, "rb") as file:
+        async with _ChunkPool(max_concurrency, limiter) as pool:
+            for index, offset in enumerate(offsets):
+                length = min(chunk_size, size - offset)
+                if journal.is_done(index) and not compression:
+                    await asyncio.to_thread(_read_chunk, file, offset, length, hasher)
+                    continue
+                await pool.acquire(length)
+                try:
+                    data = await asyncio.to_thread(_read_chunk, file, offset, length, None if compression else hasher)
+                except BaseException:
+                    pool.release(length)
+                    raise
+                if compression:
+                    pool.start(compress_and_append(index, data, *sequence.next()), length)
+                else:
+                    pool.start(append(index, data, offset), length)
+
+    uploaded = await sequence.result() if compression else size
+    flushed = await file_client.flush_data(
+        uploaded, content_settings=ContentSettings(content_encoding=compression, content_md5=bytearray(hasher.md5()))
+    )
+    journal.discard()
+    logger.debug(f"Uploaded {uploaded} bytes from {source_path} ({size} bytes) in {pool.started} chunks")
+    return TransferResult(
+        size=uploaded,
+        etag=flushed.get("etag", ""),
+        last_modified=flushed.get("last_modified"),
+        digests=hasher.hexdigests(),
+        encoding=compression or "",
+    )
+
+
+def _read_chunk(file, offset: int, length: int, hasher: Optional[StreamHasher] = None) -> bytes:
+    """Read length bytes at offset of an open file, adding them to hasher."""
+    file.seek(offset)
+    data = file.read(length)
+    if hasher is not None:
+        hasher.update(data)
+    return data
+
+
+def _write_at(file, lock: threading.Lock, offset: int, data: bytes) -> None:
+    """Write data at the given offset of an open file."""
+    with lock:
+        file.seek(offset)
+        file.write(data)
+
+
+def _read_hashed(file, lock: threading.Lock, offset: int, length: int, hasher: StreamHasher) -> None:
+    """Add length bytes at the given offset of an open file to hasher."""
+    with lock:
+        file.seek(offset)
+        data = file.read(length)
+    hasher.update(data)
+
+
+async def download_chunked(
+    file_client,
+    dest_path: Path,
+    chunk_size: int,
+    max_concurrency: int,
+    limiter: Optional[TransferLimiter] = None,
+    decompress: bool = True,
+    hashes: Iterable[str] = (),
+    verify: bool = True,
+) -> TransferResult:
+    """Download an ADLS2 file using parallel ranged reads.
+
+    The destination is preallocated as a sparse temporary file next to
+    dest_path. Byte ranges are fetched concurrently and each one is written
+    straight to its offset, with at most max_concurrency ranges held in
+    memory at a time. Every range is requested against the ETag read at the
+    start, so a file modified mid-transfer fails instead of producing a
+    mixed copy. The temporary file is renamed over dest_path only once all
+    ranges have been written, so a partial download never looks complete.
+
+    Progress is checkpointed in a journal next to dest_path. If a previous
+    download of the same source was interrupted and the source ETag is
+    unchanged, only the missing ranges are fetched; otherwise the download
+    starts over.
+
+    Ranges are hashed in order once written, so a range waits in memory
+    for the ones before it to be hashed, and ranges fetched before an
+    interruption are hashed from the temporary file. If the source has a
+    Content-MD5, a download whose MD5 differs fails and its temporary
+    file is removed.
+
+    A file stored with a gzip or zstd Content-Encoding is decompressed
+    while it is downloaded, unless decompress is False; see
+    _download_decompressed.
+
+    Args:
+        file_client: Async DataLakeFileClient for the source
+        dest_path: Local path to write the file to
+        chunk_size: Size of each ranged read in bytes
+        max_concurrency: Maximum number of ranges in flight
+        limiter: Optional limiter shared with other transfers
+        decompress: Whether to decompress a compressed file. Defaults to True.
+        hashes: Digests to compute on top of MD5; see HASH_ALGORITHMS
+        verify: Whether to check the MD5 against the source's Content-MD5. Defaults to True.
+
+    Returns:
+        TransferResult: Bytes downloaded, their digests, whether they were
+        verified and the ETag of the source
+
+    Raises:
+        IntegrityError: If the MD5 does not match the Content-MD5
+    """
+    properties = await file_client.get_file_properties()
+    content_settings = properties.content_settings
+    encoding = decodable(content_settings.content_encoding) if content_settings else None
+    expected_md5 = content_settings.content_md5 if content_settings and verify else None
+    hasher = StreamHasher(hashes)
+    if decompress and encoding:
+        return await _download_decompressed(
+            file_client, dest_path, properties, encoding, chunk_size, max_concurrency, limiter, hasher, expected_md5
+        )
+
+    size = properties.size
+    etag = properties.etag
+    source = _remote_name(file_client)
+    destination = str(dest_path)
+    temp_path = dest_path.with_name(dest_path.name + PARTIAL_SUFFIX)
+    journal_path = dest_path.with_name(dest_path.name + JOURNAL_SUFFIX)
+
+    journal = TransferJournal.load(journal_path)
+    if (
+        journal is not None
+        and journal.matches(source, destination, etag, size, chunk_size)
+        and temp_path.exists()
+        and temp_path.stat().st_size == size
+    ):
+        logger.info(f"Resuming download of {source} to {dest_path}")
+        mode = "r+b"
+    else:
+        journal = TransferJournal(
+            path=journal_path,
+            source=source,
+            destination=destination,
+            source_etag=etag,
+            size=size,
+            chunk_size=chunk_size,
+        )
+        mode = "wb"
+
+    lock = threading.Lock()
+
+    with open(temp_path, mode) as file:
+        if mode == "wb":
+            file.truncate(size)
+            await asyncio.to_thread(journal.save)
+
+        async def fetch(index: int, offset: int, length: int, previous: asyncio.Future, current: asyncio.Future) -> None:
+            try:
+                if journal.is_done(index):
+                    await previous
+                    await asyncio.to_thread(_read_hashed, file, lock, offset, length, hasher)
+                else:
+                    download = await file_client.download_file(
+                        offset=offset,
+                        length=length,
+                        etag=etag,
+                        match_condition=MatchConditions.IfNotModified,
+                        decompress=False,
+                    )
+                    data = await download.readall()
+                    await asyncio.to_thread(_write_at, file, lock, offset, data)
+                    journal.mark_done(index)
+                    await asyncio.to_thread(journal.save)
+                    await previous
+                    await asyncio.to_thread(hasher.update, data)
+                current.set_result(None)
+            except BaseException as e:
+                _Sequence.fail(current, e)
+                raise
+
+        sequence = _Sequence()
+        async with _ChunkPool(max_concurrency, limiter) as pool:
+            for index, offset in enumerate(range(0, size, chunk_size)):
+                length = min(chunk_size, size - offset)
+                await pool.acquire(length)
+                pool.start(fetch(index, offset, length, *sequence.next()), length)
+        await sequence.result()
+
+    try:
+        verified = verify_md5(source, expected_md5, hasher)
+    except IntegrityError:
+        # The ranges match the source ETag, so fetching them again would not help
+        temp_path.unlink(missing_ok=True)
+        journal.discard()
+        raise
+    os.replace(temp_path, dest_path)
+    journal.discard()
+    logger.debug(f"Downloaded {size} bytes to {dest_path} in {pool.started} chunks")
+    return TransferResult(
+        size=size,
+        etag=etag,
+        last_modified=properties.last_modified,
+        digests=hasher.hexdigests(),
+        verified=verified,
+    )
+
+
+async def _download_decompressed(
+    file_client,
+    dest_path: Path,
+    properties,
+    encoding: str,
+    chunk_size: int,
+    max_concurrency: int,
+    limiter: Optional[TransferLimiter],
+    hasher: StreamHasher,
+    expected_md5: Optional[bytes],
+) -> TransferResult:
+    """Download a compressed ADLS2 file, decompressing it as it arrives.
+
+    Ranges of the compressed file are fetched concurrently, as in
+    download_chunked, and fed in order to a streaming decompressor in a
+    worker thread, which appends its output to a temporary file next to
+    dest_path. Memory is bounded by the ranges in flight plus the
+    decompressor's output buffer, whatever the compression ratio. The
+    decompressor's state cannot be checkpointed, so an interrupted download
+    starts over. The compressed bytes are hashed on their way to the
+    decompressor and checked against expected_md5.
+
+    Args:
+        file_client: Async DataLakeFileClient for the source
+        dest_path: Local path to write the decompressed file to
+        properties: Properties of the source, read at the start
+        encoding: Content encoding of the source, gzip or zstd
+        chunk_size: Size of each ranged read in bytes
+        max_concurrency: Maximum number of ranges in flight
+        limiter: Optional limiter shared with other transfers
+        hasher: Hasher of the compressed bytes
+        expected_md5: Content-MD5 of the source, or None to skip the check
+
+    Returns:
+        TransferResult: Compressed bytes downloaded, their digests and the ETag of the source
+
+    Raises:
+        IntegrityError: If the MD5 does not match expected_md5
+    """
+    size = properties.size
+    etag = properties.etag
+    temp_path = dest_path.with_name(dest_path.name + PARTIAL_SUFFIX)
+
+    try:
+        with open(temp_path, "wb") as file:
+            writer = decompressing_writer(encoding, file)
+
+            def consume(data: bytes) -> None:
+                hasher.update(data)
+                writer.write(data)
+
+            async def fetch(offset: int, length: int, previous: asyncio.Future, current: asyncio.Future) -> None:
+                try:
+                    download = await file_client.download_file(
+                        offset=offset,
+                        length=length,
+                        etag=etag,
+                        match_condition=MatchConditions.IfNotModified,
+                        decompress=False,
+                    )
+                    data = await download.readall()
+                    await previous
+                    await asyncio.to_thread(consume, data)
+                    current.set_result(None)
+                except BaseException as e:
+                    _Sequence.fail(current, e)
+                    raise
+
+            sequence = _Sequence()
+            async with _ChunkPool(max_concurrency, limiter) as pool:
+                for offset in range(0, size, chunk_size):
+                    length = min(chunk_size, size - offset)
+                    await pool.acquire(length)
+                    pool.start(fetch(offset, length, *sequence.next()), length)
+            await sequence.result()
+            await asyncio.to_thread(writer.close)
+        verified = verify_md5(_remote_name(file_client), expected_md5, hasher)
+    except BaseException:
+        # A partly decompressed file cannot be resumed
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    os.replace(temp_path, dest_path)
+    logger.debug(f"Downloaded {size} bytes to {dest_path} in {pool.started} chunks, {writer.size} bytes decompressed")
+    return TransferResult(
+        size=size,
+        etag=etag,
+        last_modified=properties.last_modified,
+        digests=hasher.hexdigests(),
+        verified=verified,
+        encoding=encoding,
+    )
@@ -0,0 +1,102 @@
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport, AsyncHttpTransport
+
+# Defaults for the shared HTTP connection pool
+DEFAULT_POOL_SIZE = 100
+DEFAULT_POOL_SIZE_PER_HOST = 0
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0
+
+# Seconds resolved storage endpoint addresses are reused for
+DNS_CACHE_TTL = 300
+
+
+class PooledAioHttpTransport(AioHttpTransport):
+    """aiohttp transport with a tuned, long-lived connection pool.
+
+    The stock transport opens its session with aiohttp's default connector.
+    This one sizes the pool and keeps idle connections alive long enough
+    to be reused across tool calls, so concurrent requests do not pay a
+    new TCP and TLS handshake each. aiohttp sends one request at a time
+    per connection, so pool_size_per_host also caps the requests in
+    flight to a single storage endpoint.
+
+    The session is still created lazily on first use, inside the event
+    loop that runs the requests.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_size_per_host: int = DEFAULT_POOL_SIZE_PER_HOST,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        **kwargs,
+    ):
+        """Initialize the transport.
+
+        Args:
+            pool_size: Maximum number of open connections. 0 for no limit.
+            pool_size_per_host: Maximum number of open connections per host. 0 for no limit.
+            keepalive_timeout: Seconds an idle connection is kept open for reuse
+            connect_timeout: Seconds allowed to establish a connection
+            read_timeout: Seconds allowed between bytes read from a response
+        """
+        super().__init__(connection_timeout=connect_timeout, read_timeout=read_timeout, **kwargs)
+        self._pool_size = pool_size
+        self._pool_size_per_host = pool_size_per_host
+        self._keepalive_timeout = keepalive_timeout
+
+    async def open(self):
+        """Open the session with the tuned connector, then defer to AioHttpTransport."""
+        if not self.session and self._session_owner and not self._has_been_opened:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_size,
+                limit_per_host=self._pool_size_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                trust_env=self._use_env_settings,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                auto_decompress=False,
+            )
+        await super().open()
+
+
+class SharedTransport(AsyncHttpTransport):
+    """Lends a transport to a client without handing over its lifetime.
+
+    A client closes its transport when it is closed. Wrapping one transport
+    in a SharedTransport per client lets several clients send through the
+    same connection pool, which stays open until its owner closes it.
+    """
+
+    def __init__(self, transport: AsyncHttpTransport):
+        """Initialize the wrapper.
+
+        Args:
+            transport: The shared transport
+        """
+        self._transport = transport
+
+    async def send(self, request, **kwargs):
+        """Send the request through the shared transport."""
+        return await self._transport.send(request, **kwargs)
+
+    async def open(self):
+        """Open the shared transport if it is not open yet."""
+        await self._transport.open()
+
+    async def close(self):
+        """Leave the shared transport open for its other users."""
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args):
+        pass
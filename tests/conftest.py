@@ -0,0 +1,37 @@
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import pytest
+
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    """Build ADLS2Clients with UPLOAD_ROOT and DOWNLOAD_ROOT under tmp_path.
+
+    Used as `async with make_client(url) as client:`. With a url, the client
+    sends its requests there instead of to Azure.
+    """
+    from adls2_mcp_server import client as client_module
+
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "downloads").mkdir()
+    monkeypatch.setenv("UPLOAD_ROOT", str(tmp_path / "uploads"))
+    monkeypatch.setenv("DOWNLOAD_ROOT", str(tmp_path / "downloads"))
+    service_client = client_module.DataLakeServiceClient
+
+    @asynccontextmanager
+    async def make(url: Optional[str] = None, **config):
+        if url is not None:
+            monkeypatch.setattr(
+                client_module, "DataLakeServiceClient", lambda account_url, **kwargs: service_client(url, **kwargs)
+            )
+        config.setdefault("read_only", False)
+        client = client_module.ADLS2Client(
+            client_module.ADLS2Config(storage_account_name="fake", storage_account_key="a2V5", **config)
+        )
+        try:
+            yield client
+        finally:
+            await client.close()
+
+    return make
@@ -0,0 +1,426 @@
+"""In-memory stand-in for the ADLS Gen2 and Blob endpoints of one account.
+
+It answers the requests ADLS2Client sends well enough to exercise it
+end to end: path properties, ranged reads, create, append and flush,
+rename, metadata, copy, delete, and paged listings over both APIs.
+"""
+
+import asyncio
+import base64
+import datetime
+import ipaddress
+import itertools
+import json
+import ssl
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from email.utils import formatdate
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import unquote
+
+from aiohttp import web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+_etags = itertools.count(1)
+
+
+def _now() -> str:
+    return formatdate(time.time(), usegmt=True)
+
+
+class Node:
+    """A file or directory with its data, metadata and stored headers."""
+
+    def __init__(self, is_directory: bool = False, data: bytes = b""):
+        self.is_directory = is_directory
+        self.data = data
+        self.metadata: Dict[str, str] = {}
+        self.headers: Dict[str, str] = {}
+        self.uncommitted: Dict[int, bytes] = {}
+        self.touch()
+
+    def touch(self) -> None:
+        self.etag = f'"0x{next(_etags):x}"'
+        self.last_modified = _now()
+
+
+class FakeADLS:
+    """Account state, plus knobs for latency, throttling and failures.
+
+    Attributes:
+        latency: Seconds each request waits before it is answered
+        capacity: Requests in flight above which the fake answers 503
+        fail: Number of 503 responses still to give, by HTTP method
+        hns: Whether the account reports a hierarchical namespace
+        rename_rounds: Continuation rounds before a rename completes
+        intercept: Called with each request before it is served; a
+            response it returns is sent instead
+        requests, peak, throttled: What the fake has seen so far
+    """
+
+    def __init__(self, latency: float = 0.0, capacity: int = 0):
+        self.filesystems: Dict[str, Dict[str, Node]] = {}
+        self.latency = latency
+        self.capacity = capacity
+        self.fail: Dict[str, int] = {}
+        self.hns = True
+        self.rename_rounds = 0
+        self.intercept: Optional[Callable[[web.Request], Optional[web.Response]]] = None
+        self.requests = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.throttled = 0
+
+    def add_file(self, filesystem: str, path: str, data: bytes = b"") -> Node:
+        """Add a file, creating its parent directories."""
+        files = self.filesystems.setdefault(filesystem, {})
+        self._add_parents(files, path)
+        node = files[path] = Node(data=data)
+        return node
+
+    def add_directory(self, filesystem: str, path: str) -> Node:
+        """Add a directory, creating its parents."""
+        files = self.filesystems.setdefault(filesystem, {})
+        self._add_parents(files, path)
+        node = files[path] = Node(is_directory=True)
+        return node
+
+    @staticmethod
+    def _add_parents(files: Dict[str, Node], path: str) -> None:
+        parts = path.split("/")
+        for index in range(1, len(parts)):
+            files.setdefault("/".join(parts[:index]), Node(is_directory=True))
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self.capacity and self.in_flight > self.capacity:
+                self.throttled += 1
+                return web.Response(status=503, headers={"x-ms-error-code": "ServerBusy"})
+            if self.fail.get(request.method):
+                self.fail[request.method] -= 1
+                return web.Response(status=503, headers={"Retry-After": "0", "x-ms-error-code": "ServerBusy"})
+            if self.intercept is not None:
+                response = self.intercept(request)
+                if response is not None:
+                    return response
+            return await self._dispatch(request)
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _error(status: int, code: str) -> web.Response:
+        body = json.dumps({"error": {"code": code, "message": code}})
+        return web.Response(
+            status=status, headers={"x-ms-error-code": code}, text=body, content_type="application/json"
+        )
+
+    async def _dispatch(self, request: web.Request) -> web.Response:
+        query = request.query
+        filesystem, _, path = request.path.lstrip("/").partition("/")
+        path = unquote(path).strip("/")
+        method = request.method
+
+        if not filesystem and query.get("restype") == "account":
+            return web.Response(headers={
+                "x-ms-is-hns-enabled": "true" if self.hns else "false",
+                "x-ms-sku-name": "Standard_LRS",
+                "x-ms-account-kind": "StorageV2",
+            })
+        if not path:
+            return self._filesystem(method, filesystem, query)
+
+        files = self.filesystems.setdefault(filesystem, {})
+        node = files.get(path)
+        if method == "HEAD":
+            return self._head(request, node)
+        if method == "GET":
+            return self._get(request, node)
+        if method == "PUT":
+            return await self._put(request, files, path, node)
+        if method == "PATCH":
+            return await self._patch(request, node)
+        if method == "DELETE":
+            return self._delete(query, files, path, node)
+        return self._error(400, "Unsupported")
+
+    def _filesystem(self, method: str, filesystem: str, query) -> web.Response:
+        if method == "PUT":
+            self.filesystems.setdefault(filesystem, {})
+            return web.Response(status=201, headers={"ETag": '"0x1"', "Last-Modified": _now()})
+        if method == "DELETE":
+            self.filesystems.pop(filesystem, None)
+            return web.Response(status=202)
+        if method == "GET" and query.get("resource") == "filesystem":
+            return self._list_paths(filesystem, query)
+        if method == "GET" and query.get("restype") == "container" and query.get("comp") == "list":
+            return self._list_blobs(filesystem, query)
+        return self._error(400, "Unsupported")
+
+    @staticmethod
+    def _properties(node: Node) -> Dict[str, str]:
+        headers = {
+            "ETag": node.etag,
+            "Last-Modified": node.last_modified,
+            "x-ms-blob-type": "BlockBlob",
+            "x-ms-creation-time": node.last_modified,
+        }
+        if node.is_directory:
+            headers["x-ms-meta-hdi_isfolder"] = "true"
+        for key, value in node.metadata.items():
+            headers[f"x-ms-meta-{key}"] = value
+        headers.update(node.headers)
+        return headers
+
+    def _head(self, request: web.Request, node: Optional[Node]) -> web.Response:
+        if node is None:
+            return web.Response(status=404, headers={"x-ms-error-code": "BlobNotFound"})
+        if request.headers.get("If-None-Match") == node.etag:
+            return web.Response(status=304)
+        headers = self._properties(node)
+        headers["Content-Length"] = str(len(node.data))
+        headers["x-ms-resource-type"] = "directory" if node.is_directory else "file"
+        return web.Response(headers=headers)
+
+    def _get(self, request: web.Request, node: Optional[Node]) -> web.Response:
+        if node is None:
+            return self._error(404, "BlobNotFound")
+        if_match = request.headers.get("If-Match")
+        if if_match and if_match != node.etag:
+            return self._error(412, "ConditionNotMet")
+        headers = self._properties(node)
+        byte_range = request.headers.get("x-ms-range") or request.headers.get("Range")
+        if not byte_range:
+            return web.Response(body=node.data, headers=headers)
+
+        total = len(node.data)
+        first, _, last = byte_range.split("=")[1].partition("-")
+        first = int(first)
+        last = min(int(last) if last else total - 1, total - 1)
+        if first >= total > 0:
+            return self._error(416, "InvalidRange")
+        headers["Content-Range"] = f"bytes {first}-{last}/{total}"
+        md5 = headers.pop("Content-MD5", None)
+        if md5:
+            headers["x-ms-blob-content-md5"] = md5
+        return web.Response(status=206, body=node.data[first:last + 1], headers=headers)
+
+    async def _put(self, request: web.Request, files: Dict[str, Node], path: str, node: Optional[Node]) -> web.Response:
+        query = request.query
+        if "x-ms-rename-source" in request.headers:
+            return self._rename(request, files, path)
+        if query.get("comp") == "metadata":
+            if node is None:
+                return self._error(404, "BlobNotFound")
+            if_match = request.headers.get("If-Match")
+            if if_match and if_match != node.etag:
+                return self._error(412, "ConditionNotMet")
+            node.metadata = {
+                key[10:]: value for key, value in request.headers.items() if key.lower().startswith("x-ms-meta-")
+            }
+            node.touch()
+            return web.Response(headers={"ETag": node.etag, "Last-Modified": node.last_modified})
+        if query.get("resource") in ("file", "directory"):
+            self._add_parents(files, path)
+            node = files[path] = Node(is_directory=query["resource"] == "directory")
+            for key, value in request.headers.items():
+                if key.lower().startswith("x-ms-meta-"):
+                    node.metadata[key[10:]] = value
+            for item in filter(None, request.headers.get("x-ms-properties", "").split(",")):
+                key, value = item.split("=", 1)
+                node.metadata[key] = base64.b64decode(value).decode()
+            self._store_headers(request, node, ("x-ms-content-encoding", "x-ms-content-type"))
+            return web.Response(
+                status=201, headers={"ETag": node.etag, "Last-Modified": node.last_modified, "Content-Length": "0"}
+            )
+        if "x-ms-copy-source" in request.headers:
+            source = unquote(request.headers["x-ms-copy-source"].split("//", 1)[1].split("/", 1)[1]).split("?")[0]
+            source_filesystem, _, source_path = source.partition("/")
+            source_node = self.filesystems.get(source_filesystem, {}).get(source_path)
+            if source_node is None:
+                return self._error(404, "CannotVerifyCopySource")
+            node = files[path] = Node(is_directory=source_node.is_directory, data=source_node.data)
+            node.metadata = dict(source_node.metadata)
+            return web.Response(status=202, headers={
+                "ETag": node.etag,
+                "Last-Modified": node.last_modified,
+                "x-ms-copy-status": "success",
+                "x-ms-copy-id": "1",
+            })
+        return self._error(400, "Unsupported")
+
+    def _rename(self, request: web.Request, files: Dict[str, Node], path: str) -> web.Response:
+        if self.rename_rounds:
+            self.rename_rounds -= 1
+            return web.Response(status=201, headers={
+                "x-ms-continuation": f"token{self.rename_rounds}",
+                "ETag": '"0x1"',
+                "Last-Modified": _now(),
+            })
+        source = unquote(request.headers["x-ms-rename-source"].split("?")[0]).lstrip("/")
+        source_filesystem, _, source_path = source.partition("/")
+        source_files = self.filesystems.get(source_filesystem, {})
+        if source_path not in source_files:
+            return self._error(404, "SourcePathNotFound")
+        moved = [key for key in source_files if key == source_path or key.startswith(source_path + "/")]
+        for key in moved:
+            files[path + key[len(source_path):]] = source_files.pop(key)
+        return web.Response(status=201, headers={"ETag": files[path].etag, "Last-Modified": _now()})
+
+    async def _patch(self, request: web.Request, node: Optional[Node]) -> web.Response:
+        if node is None:
+            return self._error(404, "PathNotFound")
+        action = request.query.get("action")
+        if action == "append":
+            node.uncommitted[int(request.query["position"])] = await request.read()
+            return web.Response(status=202)
+        if action == "flush":
+            data = b""
+            for offset in sorted(node.uncommitted):
+                if offset != len(data):
+                    return self._error(400, "InvalidFlushPosition")
+                data += node.uncommitted[offset]
+            if len(data) != int(request.query["position"]):
+                return self._error(400, "InvalidFlushPosition")
+            node.data = data
+            node.uncommitted = {}
+            node.touch()
+            self._store_headers(request, node, ("x-ms-content-md5", "x-ms-content-encoding", "x-ms-content-type"))
+            return web.Response(
+                headers={"ETag": node.etag, "Last-Modified": node.last_modified, "Content-Length": "0"}
+            )
+        if action == "setAccessControl":
+            return web.Response()
+        return self._error(400, "Unsupported")
+
+    @staticmethod
+    def _store_headers(request: web.Request, node: Node, names) -> None:
+        for name in names:
+            if name in request.headers:
+                key = "-".join(part.upper() if part == "md5" else part.title() for part in name[5:].split("-"))
+                node.headers[key] = request.headers[name]
+
+    def _delete(self, query, files: Dict[str, Node], path: str, node: Optional[Node]) -> web.Response:
+        if node is None:
+            return self._error(404, "PathNotFound")
+        if "recursive" not in query:
+            del files[path]
+            return web.Response(status=202)
+        for key in [key for key in files if key == path or key.startswith(path + "/")]:
+            del files[key]
+        return web.Response()
+
+    def _list_paths(self, filesystem: str, query) -> web.Response:
+        files = self.filesystems.get(filesystem)
+        if files is None:
+            return self._error(404, "FilesystemNotFound")
+        directory = (query.get("directory") or "").strip("/")
+        recursive = query.get("recursive", "false") == "true"
+        names = []
+        for name in sorted(files):
+            if directory and not name.startswith(directory + "/"):
+                continue
+            relative = name[len(directory) + 1:] if directory else name
+            if recursive or "/" not in relative:
+                names.append(name)
+
+        start = int(query.get("continuation") or 0)
+        page_size = int(query.get("maxResults", 5000))
+        page = names[start:start + page_size]
+        headers = {}
+        if start + page_size < len(names):
+            headers["x-ms-continuation"] = str(start + page_size)
+        paths = []
+        for name in page:
+            node = files[name]
+            path = {
+                "name": name,
+                "contentLength": str(len(node.data)),
+                "lastModified": node.last_modified,
+                "etag": node.etag.strip('"'),
+                "owner": "$superuser",
+                "group": "$superuser",
+                "permissions": "rw-r-----",
+            }
+            if node.is_directory:
+                path["isDirectory"] = "true"
+            paths.append(path)
+        return web.Response(text=json.dumps({"paths": paths}), content_type="application/json", headers=headers)
+
+    def _list_blobs(self, filesystem: str, query) -> web.Response:
+        prefix = query.get("prefix", "")
+        blobs = []
+        for name, node in sorted(self.filesystems.get(filesystem, {}).items()):
+            if not name.startswith(prefix):
+                continue
+            metadata = "<Metadata><hdi_isfolder>true</hdi_isfolder></Metadata>" if node.is_directory else ""
+            blobs.append(
+                f"<Blob><Name>{name}</Name><Properties><Content-Length>{len(node.data)}</Content-Length>"
+                f"<Etag>{node.etag}</Etag><Last-Modified>{node.last_modified}</Last-Modified>"
+                f"<BlobType>BlockBlob</BlobType></Properties>{metadata}</Blob>"
+            )
+        xml = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<EnumerationResults ServiceEndpoint="x" ContainerName="{filesystem}">'
+            f'<Blobs>{"".join(blobs)}</Blobs><NextMarker /></EnumerationResults>'
+        )
+        return web.Response(text=xml, content_type="application/xml")
+
+
+def server_ssl_context() -> ssl.SSLContext:
+    """TLS context with a fresh self-signed certificate for 127.0.0.1."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), False)
+        .sign(key, hashes.SHA256())
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    with tempfile.TemporaryDirectory() as directory:
+        certificate_file = Path(directory) / "cert.pem"
+        key_file = Path(directory) / "key.pem"
+        certificate_file.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+        key_file.write_bytes(
+            key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            )
+        )
+        context.load_cert_chain(certificate_file, key_file)
+    return context
+
+
+@asynccontextmanager
+async def serve(fake: FakeADLS, ssl_context: Optional[ssl.SSLContext] = None):
+    """Serve the fake on an ephemeral local port, yielding its URL.
+
+    With an ssl_context, such as server_ssl_context(), the fake is served
+    over https. Token credentials are only sent over https.
+    """
+    app = web.Application(client_max_size=1 << 30)
+    app.router.add_route("*", "/{tail:.*}", fake.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    try:
+        yield f"{'https' if ssl_context else 'http'}://{host}:{port}"
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from adls2_mcp_server.batch import MAX_BATCH_SIZE, run_batch
+from fake_adls import FakeADLS, serve
+
+
+def test_run_batch_keeps_order_and_records_errors():
+    async def operation(path):
+        await asyncio.sleep(0.001 * (5 - int(path)))
+        if path == "2":
+            raise ValueError("bad path")
+        if path == "3":
+            raise KeyError()
+        return int(path) * 10
+
+    items = asyncio.run(run_batch([str(index) for index in range(5)], operation))
+    assert [item.path for item in items] == ["0", "1", "2", "3", "4"]
+    assert [item.value for item in items] == [0, 10, None, None, 40]
+    assert [item.error for item in items] == ["", "", "bad path", "KeyError", ""]
+
+
+def test_run_batch_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def operation(path):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+
+    asyncio.run(run_batch([str(index) for index in range(50)], operation, max_concurrency=4))
+    assert peak == 4
+
+
+def test_run_batch_rejects_invalid_arguments():
+    async def operation(path):
+        return path
+
+    with pytest.raises(ValueError):
+        asyncio.run(run_batch(["a"], operation, max_concurrency=-1))
+    with pytest.raises(ValueError):
+        asyncio.run(run_batch(["a"] * (MAX_BATCH_SIZE + 1), operation))
+
+
+def test_batch_tools_report_per_item_results(make_client):
+    fake = FakeADLS(latency=0.01)
+    for index in range(40):
+        fake.add_file("fs", f"d/f{index}", b"x" * index).metadata["n"] = str(index)
+    paths = [f"d/f{index}" for index in range(40)] + ["d/missing"]
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            exists = await client.file_exists_batch("fs", paths, max_concurrency=8, use_cache=False)
+            assert fake.peak <= 8
+            properties = await client.get_file_properties_batch("fs", paths, use_cache=False)
+            metadata = await client.get_file_metadata_batch("fs", paths[:3] + paths[-1:], use_cache=False)
+            return exists, properties, metadata
+
+    exists, properties, metadata = asyncio.run(main())
+    assert [item.value for item in exists] == [True] * 40 + [False]
+    assert not any(item.error for item in exists)
+
+    assert [item.value["size"] for item in properties[:40]] == [str(index) for index in range(40)]
+    assert properties[-1].value is None
+    assert properties[-1].error
+
+    assert [item.value for item in metadata[:3]] == [{"n": "0"}, {"n": "1"}, {"n": "2"}]
+    assert metadata[-1].error
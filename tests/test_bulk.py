@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from adls2_mcp_server.bulk import ProgressTracker, move_blobs
+from fake_adls import FakeADLS, serve
+
+
+def _flat_account(files=10, marker=True):
+    fake = FakeADLS()
+    fake.hns = False
+    for index in range(files):
+        fake.add_file("fs", f"d/sub{index % 3}/f{index}", b"%d" % index)
+    fake.add_file("fs", "d2/keep", b"k")
+    if not marker:
+        del fake.filesystems["fs"]["d"]
+    return fake
+
+
+def _last_report(reports):
+    async def progress(processed, total, elapsed):
+        reports.append((processed, total))
+
+    return progress
+
+
+def _names(fake):
+    return sorted(fake.filesystems["fs"])
+
+
+@pytest.mark.parametrize("marker", [True, False])
+def test_flat_delete_removes_every_blob_once(make_client, marker):
+    fake = _flat_account(marker=marker)
+    reports = []
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            assert await client.delete_directory("fs", "d", _last_report(reports), max_concurrency=4)
+
+    asyncio.run(main())
+    assert _names(fake) == ["d2", "d2/keep"]
+    # 10 files and 3 subdirectory markers, plus the directory's own marker if any
+    expected = 14 if marker else 13
+    assert reports[-1] == (expected, expected)
+
+
+@pytest.mark.parametrize("marker", [True, False])
+def test_flat_rename_moves_every_blob_once(make_client, marker):
+    fake = _flat_account(marker=marker)
+    reports = []
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            assert await client.rename_directory("fs", "d", "e", _last_report(reports), max_concurrency=4)
+
+    asyncio.run(main())
+    files = fake.filesystems["fs"]
+    assert not [name for name in files if name == "d" or name.startswith("d/")]
+    assert files["e/sub1/f4"].data == b"4"
+    assert ("e" in files) == marker
+    expected = 14 if marker else 13
+    assert reports[-1] == (expected, expected)
+
+
+def test_flat_rename_into_itself_is_rejected(make_client):
+    fake = _flat_account()
+    before = _names(fake)
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            assert not await client.rename_directory("fs", "d", "d/inner")
+            assert not await client.rename_directory("fs", "d/", "d")
+            container_client = client._get_blob_service_client().get_container_client("fs")
+            with pytest.raises(ValueError):
+                await move_blobs(container_client, "d", "d/x", 4, ProgressTracker())
+
+    asyncio.run(main())
+    assert _names(fake) == before
+
+
+def test_flat_rename_to_sibling_with_shared_prefix(make_client):
+    fake = _flat_account(files=3)
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            assert await client.rename_directory("fs", "d", "d3")
+
+    asyncio.run(main())
+    assert _names(fake) == ["d2", "d2/keep", "d3", "d3/sub0", "d3/sub0/f0", "d3/sub1", "d3/sub1/f1", "d3/sub2", "d3/sub2/f2"]
+
+
+def test_missing_directory_fails(make_client):
+    fake = _flat_account()
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            assert not await client.delete_directory("fs", "nothing")
+            assert not await client.rename_directory("fs", "nothing", "else")
+
+    asyncio.run(main())
+
+
+def test_failed_namespace_lookup_is_cached(make_client):
+    calls = 0
+
+    async def main():
+        async with make_client() as client:
+            async def forbidden():
+                nonlocal calls
+                calls += 1
+                raise PermissionError("no account-level permission")
+
+            client._get_blob_service_client().get_account_information = forbidden
+            assert await client._is_hns_enabled()
+            assert await client._is_hns_enabled()
+
+    asyncio.run(main())
+    assert calls == 1
@@ -0,0 +1,144 @@
+import asyncio
+import struct
+
+from adls2_mcp_server import cache as cache_module
+from adls2_mcp_server.cache import TTLCache
+from fake_adls import FakeADLS, serve
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    now[0] += 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+    assert cache.stats() == {"size": 1, "hits": 2, "misses": 2, "hit_rate": 0.5}
+
+
+def test_disabled_ttl_cache_stores_nothing():
+    for cache in (TTLCache(maxsize=0), TTLCache(maxsize=10, ttl=0)):
+        cache.set("a", 1)
+        assert not cache.enabled
+        assert cache.get("a") is None
+
+
+def test_reads_are_served_from_cache_until_this_server_writes(make_client, tmp_path):
+    fake = FakeADLS()
+    node = fake.add_file("fs", "d/f", b"data")
+    (tmp_path / "uploads" / "new").write_bytes(b"new data")
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            assert (await client.get_file_properties("fs", "d/f"))["size"] == "4"
+            requests = fake.requests
+            assert await client.file_exists("fs", "/d/f/")
+            assert await client.get_file_metadata("fs", "d/f") == {}
+            assert fake.requests == requests
+
+            await client.get_file_properties("fs", "d/f", use_cache=False)
+            assert fake.requests == requests + 1
+
+            assert await client.set_file_metadata("fs", "d/f", "owner", "me")
+            assert await client.get_file_metadata("fs", "d/f") == {"owner": "me"}
+
+            assert await client.rename_file("fs", "d/f", "d/g")
+            assert not await client.file_exists("fs", "d/f")
+            assert await client.get_file_metadata("fs", "d/g") == {"owner": "me"}
+
+            assert await client.upload_file("new", "fs", "d/g")
+            assert (await client.get_file_properties("fs", "d/g"))["size"] == "8"
+            return client.cache_stats["properties"]
+
+    stats = asyncio.run(main())
+    assert node.metadata == {"owner": "me"}
+    # file_exists, get_file_metadata and the ETag set_file_metadata wrote against
+    assert stats["hits"] == 3
+
+
+def test_stale_cached_etag_is_refetched_for_metadata_writes(make_client):
+    fake = FakeADLS()
+    node = fake.add_file("fs", "f", b"data")
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            await client.get_file_properties("fs", "f")
+            node.metadata = {"written": "elsewhere"}
+            node.touch()
+            assert await client.set_file_metadata("fs", "f", "owner", "me")
+
+    asyncio.run(main())
+    assert node.metadata == {"written": "elsewhere", "owner": "me"}
+
+
+def test_directory_writes_invalidate_everything_under_them(make_client):
+    fake = FakeADLS()
+    for path in ("d/a", "d/sub/b", "dd/c"):
+        fake.add_file("fs", path, b"x")
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            for path in ("d/a", "d/sub/b", "dd/c"):
+                assert await client.file_exists("fs", path)
+            assert await client.delete_directory("fs", "d")
+            requests = fake.requests
+            assert await client.file_exists("fs", "dd/c")
+            assert fake.requests == requests
+            assert not await client.file_exists("fs", "d/a")
+            assert not await client.file_exists("fs", "d/sub/b")
+            assert fake.requests == requests + 2
+
+    asyncio.run(main())
+
+
+def _parquet(num_rows: int) -> bytes:
+    """A Parquet file holding only a footer with a version and a row count."""
+    footer = bytes([0x15, 0x02, 0x26]) + bytes([num_rows * 2]) + b"\x00"
+    return b"PAR1" + footer + struct.pack("<I", len(footer)) + b"PAR1"
+
+
+def test_parquet_footer_cache_follows_the_etag(make_client, tmp_path):
+    fake = FakeADLS()
+    node = fake.add_file("fs", "t.parquet", _parquet(5))
+    (tmp_path / "uploads" / "t.parquet").write_bytes(_parquet(9))
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            first = await client.get_parquet_info("fs", "t.parquet")
+            requests = fake.requests
+            second = await client.get_parquet_info("fs", "t.parquet")
+            assert fake.requests == requests
+
+            node.data = _parquet(7)
+            node.touch()
+            within_ttl = await client.get_parquet_info("fs", "t.parquet")
+            refreshed = await client.get_parquet_info("fs", "t.parquet", use_cache=False)
+            after_refresh = await client.get_parquet_info("fs", "t.parquet")
+
+            assert await client.upload_file("t.parquet", "fs", "t.parquet")
+            uploaded = await client.get_parquet_info("fs", "t.parquet")
+            return first, second, within_ttl, refreshed, after_refresh, uploaded
+
+    infos = asyncio.run(main())
+    assert [info["num_rows"] for info in infos] == [5, 5, 5, 7, 7, 9]
+    assert [info["cached"] for info in infos] == [False, True, True, False, True, False]
+    assert infos[3]["etag"] == infos[4]["etag"] != infos[1]["etag"]
+
+
+def test_path_clients_are_reused_and_bounded(make_client):
+    async def main():
+        async with make_client(path_client_cache_size=2) as client:
+            first = client._get_file_client("fs", "a")
+            assert client._get_file_client("fs", "a") is first
+            assert client._get_directory_client("fs", "a") is not first
+            client._get_file_client("fs", "b")
+            assert client._get_file_client("fs", "a") is not first
+
+    asyncio.run(main())
@@ -0,0 +1,30 @@
+import asyncio
+import time
+
+from fake_adls import FakeADLS, serve
+
+LATENCY = 0.3
+
+
+def test_parallel_property_reads_overlap(make_client):
+    fake = FakeADLS(latency=LATENCY)
+    for index in range(20):
+        fake.add_file("fs", f"d/f{index}", b"x" * index)
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            started = time.perf_counter()
+            assert (await client.get_file_properties("fs", "d/f0", use_cache=False))["size"] == "0"
+            one = time.perf_counter() - started
+
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *(client.get_file_properties("fs", f"d/f{index}", use_cache=False) for index in range(20))
+            )
+            many = time.perf_counter() - started
+            return one, many, results
+
+    one, many, results = asyncio.run(main())
+    assert [result["size"] for result in results] == [str(index) for index in range(20)]
+    assert fake.peak == 20
+    assert many < 3 * max(one, LATENCY)
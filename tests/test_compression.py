@@ -0,0 +1,77 @@
+import io
+import zlib
+
+import pytest
+
+from adls2_mcp_server.compression import GZIP, ZSTD, compress_member, decompressing_writer
+
+
+def _decompress(encoding: str, data: bytes, piece_size: int = 4096) -> bytes:
+    output = io.BytesIO()
+    writer = decompressing_writer(encoding, output)
+    for start in range(0, len(data), piece_size):
+        writer.write(data[start:start + piece_size])
+    writer.close()
+    return output.getvalue()
+
+
+@pytest.fixture(params=[GZIP, ZSTD])
+def encoding(request):
+    if request.param == ZSTD:
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+def test_members_decompress_as_one_stream(encoding):
+    data = b"".join(b"%d,row\n" % index for index in range(50_000))
+    stream = b"".join(compress_member(encoding, 3, data[start:start + 100_000]) for start in range(0, len(data), 100_000))
+    assert _decompress(encoding, stream) == data
+
+
+def test_empty_stream_decompresses_to_nothing(encoding):
+    assert _decompress(encoding, b"") == b""
+
+
+@pytest.mark.parametrize("fraction", [0.001, 0.25, 0.75, 0.999])
+def test_truncated_stream_raises(encoding, fraction):
+    data = b"".join(b"%d,%d\n" % (index, index * 7919 % 10007) for index in range(20_000))
+    stream = compress_member(encoding, 3, data) + compress_member(encoding, 3, data)
+    with pytest.raises((ValueError, zlib.error)):
+        _decompress(encoding, stream[:max(1, int(len(stream) * fraction))])
+
+
+def test_zstd_checksummed_and_skippable_frames():
+    zstandard = pytest.importorskip("zstandard")
+    data = b"hello zstd " * 10_000
+    frame = zstandard.ZstdCompressor(write_checksum=True, write_content_size=False).compress(data)
+    skippable = b"\x50\x2a\x4d\x18" + (3).to_bytes(4, "little") + b"pad"
+    assert _decompress(ZSTD, skippable + frame + frame, piece_size=7) == data + data
+    with pytest.raises(ValueError, match="middle of a frame"):
+        _decompress(ZSTD, frame[:-2])
+
+
+class _LargestWrite:
+    def __init__(self):
+        self.largest = 0
+
+    def write(self, data):
+        self.largest = max(self.largest, len(data))
+
+
+def test_zstd_output_per_step_is_bounded():
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor().compressobj()
+    zeros = bytes(1 << 20)
+    frame = b"".join(compressor.compress(zeros) for _ in range(256)) + compressor.flush()
+    sink = _LargestWrite()
+    writer = decompressing_writer(ZSTD, sink)
+    writer.write(frame)
+    writer.close()
+    assert writer.size == 256 << 20
+    assert sink.largest <= 32 << 20
+
+
+def test_zstd_garbage_raises_value_error():
+    pytest.importorskip("zstandard")
+    with pytest.raises(ValueError, match="Invalid zstd stream"):
+        _decompress(ZSTD, b"not a zstd stream")
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from azure.core.credentials import AccessToken, AzureNamedKeyCredential
+
+from adls2_mcp_server import credentials as credentials_module
+from adls2_mcp_server.client import ADLS2Client, ADLS2Config
+from adls2_mcp_server.credentials import STORAGE_SCOPE, TOKEN_CACHE_NAME, create_credential, resolve_credential_type
+
+
+class _TokenCredential:
+    """Async token credential that records how it was built and used."""
+
+    instances = []
+
+    def __init__(self, fail=False, **kwargs):
+        self.kwargs = kwargs
+        self.fail = fail
+        self.scopes = []
+        self.closed = False
+        _TokenCredential.instances.append(self)
+
+    async def get_token(self, *scopes, **kwargs):
+        self.scopes.append(scopes)
+        if self.fail:
+            raise RuntimeError("no identity available")
+        return AccessToken("token", 2_000_000_000)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def token_credentials(monkeypatch):
+    """Replace every token credential type by _TokenCredential."""
+    _TokenCredential.instances = []
+    for name in list(credentials_module._TOKEN_CREDENTIALS):
+        monkeypatch.setitem(credentials_module._TOKEN_CREDENTIALS, name, _TokenCredential)
+    return _TokenCredential.instances
+
+
+@pytest.mark.parametrize("account_key, credential_type, expected", [
+    ("a2V5", None, "shared_key"),
+    (None, None, "default"),
+    ("a2V5", "Managed-Identity", "managed_identity"),
+    (None, "CLI", "cli"),
+])
+def test_resolve_credential_type(account_key, credential_type, expected):
+    assert resolve_credential_type(account_key, credential_type) == expected
+
+
+def test_account_key_gives_a_named_key_credential(token_credentials):
+    credential = create_credential("acct", "a2V5")
+    assert isinstance(credential, AzureNamedKeyCredential)
+    assert (credential.named_key.name, credential.named_key.key) == ("acct", "a2V5")
+    assert token_credentials == []
+
+
+def test_pinned_type_overrides_the_account_key(token_credentials):
+    assert create_credential("acct", "a2V5", "cli") is token_credentials[0]
+
+
+@pytest.mark.parametrize("credential_type, message", [
+    ("shared_key", "AZURE_STORAGE_ACCOUNT_KEY is not set"),
+    ("kerberos", "Unknown AZURE_CREDENTIAL_TYPE 'kerberos'"),
+])
+def test_unusable_credential_type_is_rejected(credential_type, message):
+    with pytest.raises(ValueError, match=message):
+        create_credential("acct", credential_type=credential_type)
+
+
+@pytest.mark.parametrize("credential_type, persisted", [
+    ("environment", True),
+    ("workload_identity", True),
+    ("default", False),
+    ("managed_identity", False),
+    ("cli", False),
+])
+def test_token_cache_is_persisted_where_supported(token_credentials, credential_type, persisted):
+    create_credential("acct", credential_type=credential_type, allow_unencrypted_token_cache=True)
+    options = token_credentials[0].kwargs.get("cache_persistence_options")
+    assert (options is not None) == persisted
+    if persisted:
+        assert options.name == TOKEN_CACHE_NAME
+        assert options.allow_unencrypted_storage
+
+
+def test_token_cache_persistence_can_be_turned_off(token_credentials):
+    create_credential("acct", credential_type="environment", persist_token_cache=False)
+    assert token_credentials[0].kwargs == {}
+
+
+def _client(**config):
+    return ADLS2Client(ADLS2Config(storage_account_name="acct", read_only=True, **config))
+
+
+def test_client_warms_up_and_closes_its_token_credential(token_credentials):
+    async def main():
+        client = _client(credential_type="environment")
+        await client.warm_up()
+        await client.close()
+
+    asyncio.run(main())
+    credential, = token_credentials
+    assert credential.scopes == [(STORAGE_SCOPE,)]
+    assert credential.closed
+
+
+def test_warm_up_failure_is_left_for_the_first_request(caplog):
+    credential = _TokenCredential(fail=True)
+
+    async def main():
+        client = ADLS2Client(ADLS2Config(storage_account_name="acct"), credential=credential)
+        await client.warm_up()
+        await client.close()
+
+    asyncio.run(main())
+    assert credential.scopes == [(STORAGE_SCOPE,)]
+    assert "no identity available" in caplog.text
+    # A credential passed in belongs to the caller
+    assert not credential.closed
+
+
+def test_shared_key_client_needs_no_token(token_credentials):
+    async def main():
+        client = _client(storage_account_key="a2V5")
+        await client.warm_up()
+        await client.close()
+        return client
+
+    client = asyncio.run(main())
+    assert isinstance(client._credential, AzureNamedKeyCredential)
+    assert token_credentials == []
+
+
+def test_preload_acquires_the_first_token_before_any_tool_call(token_credentials, monkeypatch):
+    from adls2_mcp_server.server import LazyClientPool, _preload
+
+    monkeypatch.setenv("AZURE_STORAGE_ACCOUNT_NAME", "acct")
+    monkeypatch.setenv("AZURE_CREDENTIAL_TYPE", "workload_identity")
+    monkeypatch.delenv("AZURE_STORAGE_ACCOUNT_KEY", raising=False)
+    clients = LazyClientPool()
+
+    async def main():
+        await _preload(clients)
+        assert clients.loaded
+        await clients.close()
+
+    asyncio.run(main())
+    credential, = token_credentials
+    assert credential.scopes == [(STORAGE_SCOPE,)]
+    assert credential.kwargs["cache_persistence_options"].name == TOKEN_CACHE_NAME
+    assert credential.closed
@@ -0,0 +1,139 @@
+import asyncio
+from email.utils import parsedate_to_datetime
+from types import SimpleNamespace
+
+from adls2_mcp_server.listing import PathFilter
+from adls2_mcp_server.tools.directories import register_directory_tools
+from fake_adls import FakeADLS, serve
+
+
+def _tree():
+    fake = FakeADLS()
+    for directory in ("a", "b", "c"):
+        for index in range(4):
+            fake.add_file("fs", f"root/{directory}/f{index}.csv", b"x" * index)
+    fake.add_file("fs", "root/top.txt", b"top")
+    return fake
+
+
+def _pages(client, directory, recursive, max_results, **options):
+    async def collect():
+        pages = []
+        token = None
+        while True:
+            listing = await client.directory_get_paths(
+                "fs", directory, recursive, max_results=max_results, continuation_token=token, **options
+            )
+            pages.append(listing.paths)
+            token = listing.continuation_token
+            if token is None:
+                return pages
+
+    return collect()
+
+
+def test_pages_follow_continuation_tokens_to_the_full_listing(make_client):
+    fake = _tree()
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            full = (await client.directory_get_paths("fs", "root", True, max_concurrency=1)).paths
+            pages = await _pages(client, "root", True, max_results=5)
+            shallow = await _pages(client, "root", False, max_results=3)
+            return full, pages, shallow
+
+    full, pages, shallow = asyncio.run(main())
+    assert len(full) == 16
+    assert [len(page) for page in pages] == [5, 5, 5, 1]
+    assert [path for page in pages for path in page] == full
+    assert shallow == [["root/a", "root/b", "root/c"], ["root/top.txt"]]
+
+
+def test_single_page_when_everything_fits(make_client):
+    fake = _tree()
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            return await client.directory_get_paths("fs", "root/a", True, max_results=100)
+
+    listing = asyncio.run(main())
+    assert listing.paths == [f"root/a/f{index}.csv" for index in range(4)]
+    assert listing.continuation_token is None
+
+
+def test_missing_directory_lists_nothing(make_client):
+    fake = _tree()
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            return await client.directory_get_paths("fs", "missing", True, max_results=5)
+
+    listing = asyncio.run(main())
+    assert listing.paths == []
+    assert listing.continuation_token is None
+
+
+class _Server:
+    """Stand-in for the FastMCP server the tools register on."""
+
+    def __init__(self, client):
+        self.tools = {}
+        self.clients = SimpleNamespace(get=lambda account=None: client, read_only=False)
+
+    def tool(self, name, description=""):
+        def register(function):
+            self.tools[name] = function
+            return function
+
+        return register
+
+
+def _tool(client, name):
+    server = _Server(client)
+    register_directory_tools(server)
+    return server.tools[name]
+
+
+def test_detailed_listing_has_columns_aligned_with_paths(make_client):
+    fake = _tree()
+    modified = fake.filesystems["fs"]["root/b/f3.csv"].last_modified
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            get_paths = _tool(client, "directory_get_paths")
+            return (
+                await get_paths("fs", "root/b", detailed=True),
+                await get_paths("fs", "root", recursive=False),
+            )
+
+    detailed, plain = asyncio.run(main())
+    assert detailed["error"] == ""
+    assert detailed["paths"] == [f"root/b/f{index}.csv" for index in range(4)]
+    details = detailed["details"]
+    assert details["is_directory"] == [False] * 4
+    assert details["size"] == [0, 1, 2, 3]
+    assert details["last_modified"][3] == parsedate_to_datetime(modified).isoformat()
+    assert details["etag"][3] == fake.filesystems["fs"]["root/b/f3.csv"].etag.strip('"')
+
+    assert plain["paths"] == ["root/a", "root/b", "root/c", "root/top.txt"]
+    assert plain["details"] is None
+
+
+def test_filters_apply_to_full_and_paged_listings(make_client):
+    fake = _tree()
+    path_filter = PathFilter(pattern="f[12].csv", files_only=True)
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            full = await client.directory_get_paths("fs", "root", path_filter=path_filter)
+            pages = await _pages(client, "root", True, max_results=5, path_filter=path_filter)
+            cached = await client.directory_get_paths("fs", "root")
+            filtered_from_cache = await client.directory_get_paths("fs", "root", path_filter=path_filter)
+            return full.paths, pages, cached.paths, filtered_from_cache.paths
+
+    full, pages, cached, filtered_from_cache = asyncio.run(main())
+    expected = [f"root/{directory}/f{index}.csv" for directory in "abc" for index in (1, 2)]
+    assert full == expected
+    assert [path for page in pages for path in page] == expected
+    assert len(cached) == 16
+    assert filtered_from_cache == expected
@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import hashlib
+import importlib.util
+import os
+
+import pytest
+
+from adls2_mcp_server.hashing import IntegrityError, StreamHasher, resolve_hashes, verify_md5
+from fake_adls import FakeADLS, serve
+
+
+def _content_md5(data):
+    return base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+def test_stream_hasher_matches_hashing_in_one_go():
+    data = os.urandom(100_000)
+    hasher = StreamHasher(["sha256"])
+    for offset in range(0, len(data), 7777):
+        hasher.update(data[offset:offset + 7777])
+
+    assert hasher.md5() == hashlib.md5(data).digest()
+    assert hasher.hexdigests() == {"md5": hashlib.md5(data).hexdigest(), "sha256": hashlib.sha256(data).hexdigest()}
+    assert StreamHasher().hexdigests() == {"md5": hashlib.md5(b"").hexdigest()}
+
+
+def test_resolve_hashes_drops_md5_and_duplicates():
+    assert resolve_hashes(None) == []
+    assert resolve_hashes(["SHA256", "md5", "sha256"]) == ["sha256"]
+    with pytest.raises(ValueError, match="hashes must be among md5, sha256"):
+        resolve_hashes(["sha1"])
+
+
+@pytest.mark.skipif(importlib.util.find_spec("xxhash") is not None, reason="xxhash is installed")
+def test_hash_needing_a_missing_package_is_rejected():
+    with pytest.raises(ValueError, match="xxh64 needs the xxhash package"):
+        resolve_hashes(["xxh64"])
+
+
+def test_verify_md5():
+    hasher = StreamHasher()
+    hasher.update(b"data")
+
+    assert verify_md5("f", None, hasher) is None
+    assert verify_md5("f", bytearray(hashlib.md5(b"data").digest()), hasher) is True
+    with pytest.raises(IntegrityError, match=f"Content-MD5 mismatch for f: stored {hashlib.md5(b'other').hexdigest()}"):
+        verify_md5("f", hashlib.md5(b"other").digest(), hasher)
+    assert issubclass(IntegrityError, ValueError)
+
+
+def _download(make_client, fake, **options):
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            return await client.download_file("fs", "f.bin", "f.bin", chunk_size=1000, **options)
+
+    return asyncio.run(main())
+
+
+def test_download_is_verified_against_content_md5(make_client, tmp_path):
+    data = os.urandom(5500)
+    fake = FakeADLS()
+    fake.add_file("fs", "f.bin", data).headers["Content-MD5"] = _content_md5(data)
+
+    result = _download(make_client, fake, hashes=["sha256"])
+
+    assert result.verified is True
+    assert result.digests == {"md5": hashlib.md5(data).hexdigest(), "sha256": hashlib.sha256(data).hexdigest()}
+    assert (tmp_path / "downloads" / "f.bin").read_bytes() == data
+
+
+def test_download_without_content_md5_is_not_verified(make_client):
+    fake = FakeADLS()
+    fake.add_file("fs", "f.bin", b"data")
+
+    assert _download(make_client, fake).verified is None
+
+
+@pytest.mark.parametrize("size", [10, 5500])
+def test_download_with_mismatched_content_md5_fails_and_leaves_nothing(make_client, tmp_path, size):
+    fake = FakeADLS()
+    fake.add_file("fs", "f.bin", os.urandom(size)).headers["Content-MD5"] = _content_md5(b"something else")
+
+    with pytest.raises(IntegrityError, match="Content-MD5 mismatch for fs/f.bin"):
+        _download(make_client, fake)
+
+    assert list((tmp_path / "downloads").iterdir()) == []
+
+
+def test_mismatch_is_ignored_without_verify(make_client, tmp_path):
+    fake = FakeADLS()
+    fake.add_file("fs", "f.bin", b"data").headers["Content-MD5"] = _content_md5(b"something else")
+
+    result = _download(make_client, fake, verify=False)
+
+    assert result.verified is None
+    assert (tmp_path / "downloads" / "f.bin").read_bytes() == b"data"
+
+
+def test_compressed_round_trip_verifies_the_stored_bytes(make_client, tmp_path):
+    data = b"line\n" * 10_000
+    (tmp_path / "uploads" / "f.txt").write_bytes(data)
+    fake = FakeADLS()
+    fake.filesystems["fs"] = {}
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            uploaded = await client.upload_file("f.txt", "fs", "f.txt", compression="gzip")
+            downloaded = await client.download_file("fs", "f.txt", "f.txt", chunk_size=1000)
+            return uploaded, downloaded
+
+    uploaded, downloaded = asyncio.run(main())
+    stored = fake.filesystems["fs"]["f.txt"].data
+    assert fake.filesystems["fs"]["f.txt"].headers["Content-MD5"] == _content_md5(stored)
+    assert uploaded.digests["md5"] == downloaded.digests["md5"] == hashlib.md5(stored).hexdigest()
+    assert downloaded.verified is True
+    assert (tmp_path / "downloads" / "f.txt").read_bytes() == data
+
+
+def test_directory_download_reports_mismatched_files(make_client, tmp_path):
+    fake = FakeADLS()
+    fake.add_file("fs", "d/good", b"good").headers["Content-MD5"] = _content_md5(b"good")
+    fake.add_file("fs", "d/bad", b"bad").headers["Content-MD5"] = _content_md5(b"corrupted")
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            return await client.download_directory("fs", "d", "d")
+
+    report = asyncio.run(main())
+    assert report.files_transferred == 1
+    assert list(report.errors) == ["d/bad"]
+    assert "Content-MD5 mismatch" in report.errors["d/bad"]
+    assert sorted(path.name for path in (tmp_path / "downloads" / "d").iterdir()) == ["good"]
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from adls2_mcp_server.listing import WRITE_LOG_SIZE, ListingCache, PathEntry, PathFilter, parse_timestamp
+
+
+def _entries(*names):
+    return [PathEntry(name=name) for name in names]
+
+
+def test_zero_max_entries_disables_cache():
+    cache = ListingCache(0, 60)
+    cache.set(cache.key("fs", "d", False), [])
+    assert cache.stats()["listings"] == 0
+
+
+def test_patches_evict_past_max_entries():
+    cache = ListingCache(5, 60)
+    cache.set(cache.key("fs", "d", False), _entries("d/a", "d/b"))
+    for index in range(20):
+        cache.add("fs", PathEntry(name=f"d/n{index}"))
+    assert cache.stats()["entries"] <= 5
+
+
+def test_refresh_dropped_only_when_its_directory_was_written():
+    cache = ListingCache(100, 60)
+    written = cache.key("fs", "d", False)
+    elsewhere = cache.key("fs", "e", True)
+    other_filesystem = cache.key("other", "d", False)
+    generation = cache.generation
+    cache.add("fs", PathEntry(name="d/x"))
+
+    cache.set(written, _entries("d/a"), generation)
+    cache.set(elsewhere, _entries("e/a"), generation)
+    cache.set(other_filesystem, _entries("d/a"), generation)
+
+    assert cache.get(written)[0] is None
+    assert cache.get(elsewhere)[0] is not None
+    assert cache.get(other_filesystem)[0] is not None
+
+
+def test_refresh_dropped_after_write_to_ancestor_or_descendant():
+    cache = ListingCache(100, 60)
+    generation = cache.generation
+    cache.remove("fs", "e")
+    cache.set(cache.key("fs", "e/sub", False), _entries("e/sub/a"), generation)
+    assert cache.get(cache.key("fs", "e/sub", False))[0] is None
+
+    generation = cache.generation
+    cache.add("fs", PathEntry(name="q/r/s"))
+    cache.set(cache.key("fs", "", True), _entries("q"), generation)
+    assert cache.get(cache.key("fs", "", True))[0] is None
+
+
+def test_refresh_dropped_when_write_log_overflowed():
+    cache = ListingCache(100, 60)
+    generation = cache.generation
+    for index in range(WRITE_LOG_SIZE + 1):
+        cache.add("elsewhere", PathEntry(name=f"n{index}"))
+    cache.set(cache.key("fs", "d", False), _entries("d/a"), generation)
+    assert cache.get(cache.key("fs", "d", False))[0] is None
+
+
+NOW = datetime(2024, 6, 1, 12, tzinfo=timezone.utc)
+
+
+def _matching(path_filter, *entries):
+    return [entry.name for entry in entries if path_filter.matches(entry)]
+
+
+def test_pattern_matches_name_unless_it_has_a_slash():
+    entries = [PathEntry(name="raw/2024/a.csv"), PathEntry(name="raw/b.csv"), PathEntry(name="raw/c.json")]
+    assert _matching(PathFilter(pattern="*.csv"), *entries) == ["raw/2024/a.csv", "raw/b.csv"]
+    assert _matching(PathFilter(pattern="raw/*/*.csv"), *entries) == ["raw/2024/a.csv"]
+    assert _matching(PathFilter(pattern="A.CSV"), *entries) == []
+    assert _matching(PathFilter(regex=r"/20\d\d/"), *entries) == ["raw/2024/a.csv"]
+
+
+def test_size_bounds_are_inclusive():
+    entries = [PathEntry(name=str(size), size=size) for size in (9, 10, 20, 21)]
+    assert _matching(PathFilter(min_size=10, max_size=20), *entries) == ["10", "20"]
+
+
+def test_modified_bounds_treat_naive_times_as_utc():
+    entries = [
+        PathEntry(name="old", last_modified=NOW - timedelta(days=2)),
+        PathEntry(name="edge", last_modified=NOW.replace(tzinfo=None)),
+        PathEntry(name="new", last_modified=NOW + timedelta(hours=1)),
+        PathEntry(name="unknown"),
+    ]
+    since = PathFilter(modified_since=NOW.replace(tzinfo=None))
+    assert _matching(since, *entries) == ["edge", "new"]
+    assert _matching(PathFilter(modified_before=NOW), *entries) == ["old"]
+    assert _matching(PathFilter(), *entries) == ["old", "edge", "new", "unknown"]
+
+
+def test_files_only_and_dirs_only():
+    entries = [PathEntry(name="d", is_directory=True), PathEntry(name="f")]
+    assert _matching(PathFilter(files_only=True), *entries) == ["f"]
+    assert _matching(PathFilter(dirs_only=True), *entries) == ["d"]
+    with pytest.raises(ValueError):
+        PathFilter(files_only=True, dirs_only=True)
+
+
+def test_parse_timestamp():
+    assert parse_timestamp(None) is None
+    assert parse_timestamp("2024-06-01T12:00:00") == NOW
+    assert parse_timestamp("2024-06-01T14:00:00+02:00") == NOW
+    with pytest.raises(ValueError):
+        parse_timestamp("yesterday")
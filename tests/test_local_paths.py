@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+from adls2_mcp_server.client import _local_tree, _within
+from adls2_mcp_server.listing import PathEntry
+
+
+def test_within_collapses_dot_dot(tmp_path):
+    root = tmp_path / "data"
+    root.mkdir()
+    assert _within(root, root / "a" / "b") == (root / "a" / "b").resolve()
+    assert _within(root, root / "a" / ".." / "b") == (root / "b").resolve()
+    assert _within(root, root / ".." / "etc") is None
+    assert _within(root, root / "a" / ".." / ".." / "etc") is None
+
+
+def test_within_rejects_sibling_prefix(tmp_path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (tmp_path / "data2").mkdir()
+    assert _within(root, root / ".." / "data2" / "x") is None
+
+
+def test_within_follows_symlinks(tmp_path):
+    root = tmp_path / "data"
+    outside = tmp_path / "outside"
+    root.mkdir()
+    outside.mkdir()
+    os.symlink(outside, root / "link")
+    assert _within(root, root / "link" / "x") is None
+
+
+def test_local_tree_skips_symlinks_leading_out(tmp_path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "kept.txt").write_text("x")
+    secret = tmp_path / "secret.txt"
+    secret.write_text("s")
+    os.symlink(secret, root / "leak.txt")
+    jobs, _ = _local_tree(root.resolve(), "dest")
+    assert [job.remote_path for job in jobs] == ["dest/kept.txt"]
+
+
+def test_transfers_refuse_paths_outside_roots(make_client, tmp_path):
+    (tmp_path / "secret.txt").write_text("s")
+    (tmp_path / "uploads2").mkdir()
+    (tmp_path / "uploads2" / "f.txt").write_text("x")
+
+    async def main():
+        async with make_client() as client:
+            assert await client.upload_file("../secret.txt", "fs", "a") is None
+            assert await client.upload_file("../uploads2/f.txt", "fs", "a") is None
+            assert await client.download_file("fs", "a", "../escape/f.txt") is None
+            assert await client.upload_directory("..", "fs", "a") is None
+            assert await client.download_directory("fs", "a", "../downloads2") is None
+
+    asyncio.run(main())
+    assert not (tmp_path / "escape").exists()
+    assert not (tmp_path / "downloads2").exists()
+
+
+def test_download_directory_skips_entry_names_leading_out(make_client, tmp_path):
+    async def main():
+        async with make_client() as client:
+            async def listing(*args):
+                return [PathEntry(name="d/../../../escape", is_directory=True)]
+
+            client._fetch_listing = listing
+            report = await client.download_directory("fs", "d", "out")
+            assert report is not None
+            assert report.files_transferred == 0
+
+    asyncio.run(main())
+    assert not (tmp_path / "escape").exists()
+    assert (tmp_path / "downloads" / "out").is_dir()
@@ -0,0 +1,187 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from adls2_mcp_server import metrics as metrics_module
+from adls2_mcp_server.metrics import Histogram, MetricsRegistry, export_to_file, instrument_tool, serve_prometheus
+from adls2_mcp_server.tools import metrics as metrics_tools
+from fake_adls import FakeADLS, serve
+
+
+def _types(text):
+    return dict(line.split()[2:] for line in text.splitlines() if line.startswith("# TYPE"))
+
+
+def _values(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1, 0]
+    assert histogram.quantile(0.5) == 1.5
+    assert histogram.quantile(1.0) == 3.0
+    assert Histogram().quantile(0.5) == 0.0
+    assert histogram.summary()["mean"] == 1.625
+
+
+def test_prometheus_rendering_of_histograms_counters_and_collected_values():
+    registry = MetricsRegistry()
+    registry.observe("op_seconds", 0.003, op="read")
+    registry.observe("op_seconds", 0.2, op="read")
+    registry.inc("calls_total", tool="ls")
+    registry.inc("calls_total", 2, tool="ls")
+    registry.add_collector(lambda: [
+        ("requests_total", {"account": "a"}, 7),
+        ("in_flight", {"account": "a"}, 2),
+        ("odd", {"label": 'say "hi"\n'}, 1),
+    ])
+
+    text = registry.render_prometheus()
+
+    assert _types(text) == {
+        "op_seconds": "histogram",
+        "calls_total": "counter",
+        "requests_total": "counter",
+        "in_flight": "gauge",
+        "odd": "gauge",
+        "adls2_uptime_seconds": "gauge",
+    }
+    values = _values(text)
+    assert values['op_seconds_bucket{op="read",le="0.005"}'] == "1"
+    assert values['op_seconds_bucket{op="read",le="0.1"}'] == "1"
+    assert values['op_seconds_bucket{op="read",le="0.25"}'] == "2"
+    assert values['op_seconds_bucket{op="read",le="+Inf"}'] == "2"
+    assert values['op_seconds_count{op="read"}'] == "2"
+    assert float(values['op_seconds_sum{op="read"}']) == pytest.approx(0.203)
+    assert values['calls_total{tool="ls"}'] == "3"
+    assert values['requests_total{account="a"}'] == "7"
+    assert values['odd{label="say \\"hi\\"\\n"}'] == "1"
+    assert text.endswith("\n")
+
+
+def test_failing_collector_is_skipped(caplog):
+    registry = MetricsRegistry()
+
+    def broken():
+        raise RuntimeError("collector failed")
+
+    registry.add_collector(broken)
+    registry.add_collector(lambda: [("size", {}, 3)])
+
+    assert _values(registry.render_prometheus())["size"] == "3"
+    assert registry.snapshot()["size"] == [{"value": 3}]
+    assert "collector failed" in caplog.text
+
+
+def test_snapshot_reports_histograms_in_milliseconds():
+    registry = MetricsRegistry()
+    registry.observe("op_seconds", 0.02, op="read")
+    registry.inc("calls_total", tool="ls")
+
+    snapshot = registry.snapshot()
+
+    op, = snapshot["op_seconds"]
+    assert op["op"] == "read"
+    assert op["count"] == 1
+    assert op["max"] == pytest.approx(20.0)
+    assert snapshot["calls_total"] == [{"tool": "ls", "value": 1}]
+
+
+def test_instrumented_tool_counts_calls_and_errors(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_module, "METRICS", registry)
+
+    async def tool(result):
+        if result is None:
+            raise RuntimeError("boom")
+        return result
+
+    wrapped = instrument_tool("tool", tool)
+
+    async def main():
+        await wrapped({"success": True, "error": ""})
+        await wrapped({"success": False})
+        await wrapped({"error": "missing"})
+        with pytest.raises(RuntimeError):
+            await wrapped(None)
+
+    asyncio.run(main())
+    snapshot = registry.snapshot()
+    assert snapshot["adls2_tool_calls_total"] == [{"tool": "tool", "value": 4}]
+    assert snapshot["adls2_tool_errors_total"] == [{"tool": "tool", "value": 3}]
+    assert snapshot["adls2_tool_duration_seconds"][0]["count"] == 4
+
+
+def test_client_stats_are_exported_as_counters_and_gauges(make_client, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_tools, "METRICS", registry)
+    fake = FakeADLS()
+    fake.add_file("fs", "f", b"x")
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            server = SimpleNamespace(tool=lambda name, description="": lambda function: function)
+            server.clients = SimpleNamespace(
+                loaded=True,
+                request_stats=lambda: {"fake": client.request_stats},
+                cache_stats=lambda: {"fake": client.cache_stats},
+            )
+            metrics_tools.register_metrics_tools(server)
+            await client.get_file_properties("fs", "f")
+            await client.get_file_properties("fs", "f")
+            return registry.render_prometheus()
+
+    text = asyncio.run(main())
+    types, values = _types(text), _values(text)
+    for name in ("adls2_requests_total", "adls2_retries_total", "adls2_cache_hits_total", "adls2_cache_misses_total"):
+        assert types[name] == "counter"
+    for name in ("adls2_concurrency_limit", "adls2_in_flight", "adls2_cache_size", "adls2_cache_hit_rate"):
+        assert types[name] == "gauge"
+    assert types["adls2_cache_entries"] == "gauge"
+    assert values['adls2_requests_total{account="fake"}'] == "1"
+    assert values['adls2_cache_hits_total{account="fake",cache="properties"}'] == "1"
+    assert values['adls2_cache_size{account="fake",cache="properties"}'] == "1"
+
+
+def test_collector_is_silent_until_the_pool_exists(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_tools, "METRICS", registry)
+    server = SimpleNamespace(tool=lambda name, description="": lambda function: function)
+    server.clients = SimpleNamespace(loaded=False)
+    metrics_tools.register_metrics_tools(server)
+
+    assert set(registry.snapshot()) == {"uptime_seconds"}
+
+
+def test_metrics_are_written_to_file_and_served(tmp_path):
+    registry = MetricsRegistry()
+    registry.inc("calls_total", tool="ls")
+    path = tmp_path / "adls2.prom"
+
+    async def main():
+        export = asyncio.create_task(export_to_file(registry, str(path), interval=60))
+        await asyncio.sleep(0.1)
+        registry.inc("calls_total", tool="ls")
+        export.cancel()
+        await asyncio.gather(export, return_exceptions=True)
+
+        runner = await serve_prometheus(registry, "127.0.0.1", 0)
+        try:
+            host, port = runner.addresses[0][:2]
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://{host}:{port}/metrics") as response:
+                    return response.status, await response.text()
+        finally:
+            await runner.cleanup()
+
+    status, served = asyncio.run(main())
+    # The last write is made on cancellation
+    assert _values(path.read_text())['calls_total{tool="ls"}'] == "2"
+    assert not (tmp_path / "adls2.prom.tmp").exists()
+    assert status == 200
+    assert _values(served)['calls_total{tool="ls"}'] == "2"
@@ -0,0 +1,35 @@
+import asyncio
+import struct
+
+import pytest
+
+from adls2_mcp_server.parquet import MAGIC, ParquetError, read_metadata
+
+
+class _TailReader:
+    """RangeReader stand-in for a large file of which only the trailer is real."""
+
+    def __init__(self, size: int, footer_size: int):
+        self.size = size
+        self._trailer = struct.pack("<I", footer_size) + MAGIC
+        self.reads = []
+
+    async def read(self, offset: int, length: int) -> bytes:
+        self.reads.append((offset, length))
+        data = bytearray(length)
+        tail = self._trailer[max(0, len(self._trailer) - length):]
+        data[length - len(tail):] = tail
+        return bytes(data)
+
+
+def test_oversized_footer_rejected_before_reading_it():
+    reader = _TailReader(size=8 * 1024 ** 3, footer_size=3 * 1024 ** 3)
+    with pytest.raises(ParquetError, match="exceeds the limit"):
+        asyncio.run(read_metadata(reader, max_footer_size=16 * 1024 * 1024))
+    assert len(reader.reads) == 1
+
+
+def test_footer_longer_than_file_rejected():
+    reader = _TailReader(size=1024, footer_size=4096)
+    with pytest.raises(ParquetError, match="exceeds the file size"):
+        asyncio.run(read_metadata(reader))
@@ -0,0 +1,183 @@
+import asyncio
+from contextlib import AsyncExitStack
+from types import SimpleNamespace
+
+import pytest
+from azure.core.credentials import AccessToken, AzureNamedKeyCredential
+
+from adls2_mcp_server import client as client_module
+from adls2_mcp_server import credentials as credentials_module
+from adls2_mcp_server import pool as pool_module
+from adls2_mcp_server.client import ADLS2Config
+from adls2_mcp_server.pool import ClientPool
+from fake_adls import FakeADLS, serve, server_ssl_context
+
+
+class _TokenCredential:
+    """Async token credential standing in for DefaultAzureCredential."""
+
+    def __init__(self, **kwargs):
+        self.closed = False
+
+    async def get_token(self, *scopes, **kwargs):
+        return AccessToken("token", 2_000_000_000)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def token_credential(monkeypatch):
+    monkeypatch.setitem(credentials_module._TOKEN_CREDENTIALS, "default", _TokenCredential)
+
+
+def _pool(**config):
+    config.setdefault("storage_accounts", ["other", "third"])
+    return ClientPool(ADLS2Config(storage_account_name="main", storage_account_key="a2V5", **config))
+
+
+def _route(monkeypatch, urls):
+    """Send each account's requests to its own URL instead of to Azure."""
+    service_client = client_module.DataLakeServiceClient
+
+    def trust_self_signed(request):
+        request.context.options["connection_verify"] = False
+
+    def create(account_url, **kwargs):
+        account = account_url.split("//")[1].split(".")[0]
+        return service_client(urls[account], raw_request_hook=trust_self_signed, **kwargs)
+
+    monkeypatch.setattr(client_module, "DataLakeServiceClient", create)
+
+
+def test_each_account_is_served_by_its_own_client(monkeypatch):
+    fakes = {account: FakeADLS() for account in ("main", "other")}
+    authorizations = {account: [] for account in fakes}
+    for account, fake in fakes.items():
+        fake.add_file("fs", "f", account.encode())
+        fake.intercept = lambda request, seen=authorizations[account]: seen.append(request.headers["Authorization"])
+
+    async def main():
+        async with AsyncExitStack() as stack:
+            ssl_context = server_ssl_context()
+            urls = {
+                account: await stack.enter_async_context(serve(fake, ssl_context)) for account, fake in fakes.items()
+            }
+            _route(monkeypatch, urls)
+            pool = _pool(read_only=False)
+            try:
+                sizes = [
+                    (await pool.get(account).get_file_properties("fs", "f"))["size"]
+                    for account in (None, "main", "Other", "other")
+                ]
+                return pool, sizes, pool.accounts
+            finally:
+                await pool.close()
+
+    pool, sizes, accounts = asyncio.run(main())
+    assert sizes == ["4", "4", "5", "5"]
+    assert accounts == ["main", "other"]
+    assert [fake.requests for fake in fakes.values()] == [1, 1]
+    assert authorizations["main"][0].startswith("SharedKey main:")
+    assert authorizations["other"] == ["Bearer token"]
+
+
+def test_clients_share_the_transport_limiter_and_token_credential():
+    async def main():
+        pool = _pool()
+        try:
+            main_client, other, third = pool.get(), pool.get("other"), pool.get("third")
+            assert pool.get("OTHER ") is other
+            return pool, main_client, other, third
+        finally:
+            await pool.close()
+
+    pool, main_client, other, third = asyncio.run(main())
+    assert isinstance(main_client._credential, AzureNamedKeyCredential)
+    assert isinstance(other._credential, _TokenCredential)
+    assert other._credential is third._credential
+    assert other.client.url.startswith("https://other.dfs.core.windows.net")
+    assert other._config.storage_account_key is None
+    assert main_client._transfer_limiter is other._transfer_limiter
+    assert main_client._transport._transport._transport is other._transport._transport._transport
+    # Closing the pool closes what the pool owns
+    assert other._credential.closed
+    assert pool._transport.session is None
+
+
+@pytest.mark.parametrize("account, message", [
+    ("elsewhere", "not listed in AZURE_STORAGE_ACCOUNTS"),
+    ("no", "Invalid storage account name"),
+    ("bad-name", "Invalid storage account name"),
+])
+def test_unlisted_or_malformed_accounts_are_rejected(account, message):
+    async def main():
+        pool = _pool()
+        try:
+            with pytest.raises(ValueError, match=message):
+                pool.get(account)
+            assert pool.accounts == []
+        finally:
+            await pool.close()
+
+    asyncio.run(main())
+
+
+def test_wildcard_allows_any_account():
+    async def main():
+        pool = _pool(storage_accounts=["*"])
+        try:
+            return pool.get("anything").client.url
+        finally:
+            await pool.close()
+
+    assert asyncio.run(main()).startswith("https://anything.dfs.core.windows.net")
+
+
+def test_pinned_shared_key_needs_a_key_for_other_accounts():
+    async def main():
+        pool = _pool(credential_type="shared_key")
+        try:
+            assert isinstance(pool.get()._credential, AzureNamedKeyCredential)
+            with pytest.raises(ValueError, match="No account key for storage account 'other'"):
+                pool.get("other")
+        finally:
+            await pool.close()
+
+    asyncio.run(main())
+
+
+def test_idle_clients_are_dropped(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pool_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    async def main():
+        pool = _pool(account_idle_timeout=60)
+        try:
+            other = pool.get("other")
+            now[0] += 50
+            main_client = pool.get()
+            now[0] += 20
+            assert pool.get() is main_client
+            assert pool.accounts == ["main"]
+            assert pool.get("other") is not other
+        finally:
+            await pool.close()
+
+    asyncio.run(main())
+
+
+def test_idle_timeout_of_zero_keeps_clients(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pool_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+
+    async def main():
+        pool = _pool(account_idle_timeout=0)
+        try:
+            other = pool.get("other")
+            now[0] += 1e6
+            assert pool.get("other") is other
+        finally:
+            await pool.close()
+
+    asyncio.run(main())
@@ -0,0 +1,196 @@
+import asyncio
+import random
+
+import pytest
+
+from adls2_mcp_server import ranged as ranged_module
+from adls2_mcp_server.ranged import RangeReader, resolve_read_options
+from fake_adls import FakeADLS, serve
+
+
+class _Download:
+    def __init__(self, data):
+        self._data = data
+
+    async def readall(self):
+        return self._data
+
+
+class _FileClient:
+    """Serves ranged downloads of one version of a file from memory."""
+
+    def __init__(self, data, etag="v1"):
+        self.data = data
+        self.etag = etag
+        self.ranges = []
+
+    async def download_file(self, offset, length, etag, match_condition, decompress):
+        assert etag == self.etag
+        assert not decompress
+        self.ranges.append((offset, length))
+        return _Download(self.data[offset:offset + length])
+
+
+def _reader(data):
+    return RangeReader(_FileClient(data), len(data), "v1")
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Make line reads fetch a few bytes at a time, so lines straddle chunks."""
+    monkeypatch.setattr(ranged_module, "LINE_CHUNK_SIZE", 3)
+    monkeypatch.setattr(ranged_module, "MAX_LINE_CHUNK_SIZE", 7)
+
+
+def _random_text(rnd):
+    lines = [b"x" * rnd.choice([0, 0, 1, 2, 5, 9, 20]) + b"\n" for _ in range(rnd.randrange(0, 12))]
+    if rnd.random() < 0.5:
+        lines.append(b"y" * rnd.randrange(1, 10))
+    return b"".join(lines)
+
+
+def test_line_windows_match_splitting_the_whole_file(small_chunks):
+    rnd = random.Random(21)
+    for _ in range(300):
+        data = _random_text(rnd)
+        lines = data.splitlines(keepends=True)
+        start_line, count = rnd.randrange(1, len(lines) + 3), rnd.randrange(1, 6)
+
+        result = _run(_reader(data).read_lines(start_line, count, max_bytes=1000, max_scan_bytes=1000))
+
+        window = lines[start_line - 1:start_line - 1 + count]
+        assert result.data == b"".join(window), (data, start_line, count)
+        assert result.offset == (sum(map(len, lines[:start_line - 1])) if window else len(data))
+        assert result.lines == len(window)
+        assert not result.truncated
+
+
+def test_tails_match_splitting_the_whole_file(small_chunks):
+    rnd = random.Random(22)
+    for _ in range(300):
+        data = _random_text(rnd)
+        lines = data.splitlines(keepends=True)
+        count = rnd.randrange(1, 8)
+
+        result = _run(_reader(data).read_tail(count, max_bytes=1000))
+
+        tail = lines[-count:] if lines else []
+        assert result.data == b"".join(tail), (data, count)
+        assert result.offset == len(data) - len(result.data)
+        assert result.lines == len(tail)
+        assert not result.truncated
+
+
+def test_empty_file():
+    reader = _reader(b"")
+    head = _run(reader.read_lines(1, 5, 100, 100))
+    tail = _run(reader.read_tail(5, 100))
+    assert (head.data, head.offset, head.lines, head.truncated) == (b"", 0, 0, False)
+    assert (tail.data, tail.offset, tail.lines, tail.truncated) == (b"", 0, 0, False)
+    assert reader._file_client.ranges == []
+
+
+def test_final_line_break_does_not_start_another_line():
+    assert _run(_reader(b"a\nb\n").read_tail(1, 100)).data == b"b\n"
+    assert _run(_reader(b"a\nb\n\n").read_tail(1, 100)).data == b"\n"
+    assert _run(_reader(b"\n").read_tail(3, 100)).data == b"\n"
+    assert _run(_reader(b"a\nb\n").read_lines(3, 1, 100, 100)).lines == 0
+
+
+def test_line_window_truncated_at_max_bytes_keeps_whole_lines():
+    result = _run(_reader(b"aaaa\nbbbb\ncccc\n").read_lines(1, 3, max_bytes=12, max_scan_bytes=100))
+    assert (result.data, result.lines, result.truncated) == (b"aaaa\nbbbb\n", 2, True)
+
+    long_line = _run(_reader(b"x" * 50 + b"\n").read_lines(1, 1, max_bytes=8, max_scan_bytes=100))
+    assert (long_line.data, long_line.truncated) == (b"x" * 8, True)
+
+
+def test_tail_truncated_at_max_bytes_keeps_whole_lines():
+    result = _run(_reader(b"aaaa\nbbbb\ncccc\n").read_tail(3, max_bytes=12))
+    assert (result.data, result.offset, result.lines, result.truncated) == (b"bbbb\ncccc\n", 5, 2, True)
+
+    long_line = _run(_reader(b"x" * 50 + b"y" * 8).read_tail(1, max_bytes=8))
+    assert (long_line.data, long_line.offset, long_line.truncated) == (b"y" * 8, 50, True)
+
+
+def test_line_window_beyond_the_scan_cap(small_chunks):
+    data = b"".join(b"line %d\n" % index for index in range(100))
+    with pytest.raises(ValueError, match="Line 90 is not within the first 64 bytes"):
+        _run(_reader(data).read_lines(90, 1, max_bytes=100, max_scan_bytes=64))
+
+    result = _run(_reader(data).read_lines(2, 50, max_bytes=1000, max_scan_bytes=64))
+    assert result.truncated
+    assert result.offset == 7
+    # Cut at the last line break within the cap, like a window cut at max_bytes
+    assert result.data == data[7:data.rindex(b"\n", 0, 64) + 1]
+    assert result.lines == 8
+    assert result.bytes_fetched == 64
+
+
+def test_tail_of_large_file_reads_only_its_end():
+    data = b"".join(b"row %06d\n" % index for index in range(200_000))
+    reader = _reader(data)
+
+    result = _run(reader.read_tail(3, max_bytes=100_000))
+    short = _run(reader.read_tail(3, max_bytes=1000))
+
+    assert result.data == short.data == b"row 199997\nrow 199998\nrow 199999\n"
+    chunk = ranged_module.LINE_CHUNK_SIZE
+    # A read never goes further back than max_bytes and one byte more
+    assert reader._file_client.ranges == [(len(data) - chunk, chunk), (len(data) - 1001, 1001)]
+
+
+@pytest.mark.parametrize("offset, length, max_bytes, expected", [
+    (2, 3, 100, (b"234", 2, False)),
+    (-3, None, 100, (b"789", 7, False)),
+    (-30, 2, 100, (b"01", 0, False)),
+    (8, 10, 100, (b"89", 8, False)),
+    (50, None, 100, (b"", 10, False)),
+    (0, None, 4, (b"0123", 0, True)),
+])
+def test_byte_ranges(offset, length, max_bytes, expected):
+    result = _run(_reader(b"0123456789").read_bytes(offset, length, max_bytes))
+    assert (result.data, result.offset, result.truncated) == expected
+
+
+@pytest.mark.parametrize("options, message", [
+    ({"head_lines": 3, "tail_lines": 3}, "Pass only one of"),
+    ({"offset": 0, "start_line": 2}, "Pass only one of"),
+    ({"tail_lines": 0}, "tail_lines must be at least 1"),
+    ({"start_line": 0}, "start_line must be at least 1"),
+    ({"length": -1}, "length must not be negative"),
+    ({"max_bytes": 2 * 1024 * 1024}, "max_bytes must be between 1 and"),
+])
+def test_inconsistent_read_options_are_rejected(options, message):
+    arguments = dict.fromkeys(
+        ("offset", "length", "head_lines", "tail_lines", "start_line", "line_count", "max_bytes")
+    )
+    with pytest.raises(ValueError, match=message):
+        resolve_read_options(**{**arguments, **options})
+
+
+def test_read_file_range_against_the_service(make_client):
+    fake = FakeADLS()
+    data = b"".join(b"line %d\n" % index for index in range(1000))
+    node = fake.add_file("fs", "log.txt", data)
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            head = await client.read_file_range("fs", "log.txt", head_lines=2)
+            tail = await client.read_file_range("fs", "log.txt", tail_lines=2)
+            window = await client.read_file_range("fs", "log.txt", start_line=500, line_count=1)
+            node.data = b"replaced\n"
+            node.touch()
+            # The cached ETag no longer matches, so the read is retried on the new version
+            replaced = await client.read_file_range("fs", "log.txt", tail_lines=1)
+            return head, tail, window, replaced
+
+    head, tail, window, replaced = asyncio.run(main())
+    assert head.data == b"line 0\nline 1\n"
+    assert tail.data == b"line 998\nline 999\n"
+    assert (window.data, window.offset, window.lines) == (b"line 499\n", data.index(b"line 499\n"), 1)
+    assert (replaced.data, replaced.size) == (b"replaced\n", 9)
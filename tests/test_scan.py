@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+from adls2_mcp_server.scan import CSV, JSONL, MAX_RECORD_LENGTH, FileScanner, scan
+
+CHUNK = 64 * 1024
+
+
+class _BytesReader:
+    """RangeReader stand-in serving ranges of an in-memory file."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self.size = len(data)
+
+    async def read(self, offset: int, length: int) -> bytes:
+        return self._data[offset:offset + length]
+
+
+def _scan(data: bytes, scanner: FileScanner, max_bytes: int = 1 << 30):
+    return asyncio.run(scan(_BytesReader(data), scanner, max_bytes))
+
+
+def _csv(rows):
+    return "".join(line + "\n" for line in rows).encode()
+
+
+def test_csv_field_over_default_limit_parses():
+    field = "x" * 200_000
+    rows = ["id,text", f'1,"{field}"'] + [f"{i},short" for i in range(2, 1001)]
+    scanner = FileScanner(CSV, sample_rows=2)
+    result = _scan(_csv(rows), scanner)
+    assert result["complete"]
+    assert scanner.rows == 1000
+    assert scanner.parse_errors == 0
+    assert scanner.sample[0]["text"] == field
+
+
+def test_csv_error_counts_as_parse_error():
+    rows = ["a,b", "1,2", "3\r4,5", "6,7"]
+    scanner = FileScanner(CSV)
+    _scan(_csv(rows), scanner)
+    assert scanner.rows == 2
+    assert scanner.parse_errors == 1
+
+
+def test_csv_record_over_max_length_counts_as_parse_error():
+    rows = ["a,b", "1,2", f'3,"{"y" * (MAX_RECORD_LENGTH + 10)}"', "4,5"]
+    scanner = FileScanner(CSV)
+    result = _scan(_csv(rows), scanner)
+    assert result["complete"]
+    assert scanner.rows == 2
+    assert scanner.parse_errors == 1
+
+
+def test_long_line_keeps_memory_bounded():
+    long_line = json.dumps({"blob": "z" * (8 * MAX_RECORD_LENGTH)}).encode()
+    data = b'{"a": 1}\n' + long_line + b'\n{"a": 2}\n'
+    scanner = FileScanner(JSONL)
+    for start in range(0, len(data), CHUNK):
+        scanner.feed(data[start:start + CHUNK])
+        assert len(scanner._remainder) <= MAX_RECORD_LENGTH
+    scanner.finish()
+    assert scanner.rows == 2
+    assert scanner.parse_errors == 1
+
+
+def test_newline_free_file_is_one_parse_error():
+    scanner = FileScanner(JSONL)
+    result = _scan(b"q" * (3 * MAX_RECORD_LENGTH), scanner)
+    assert result["complete"]
+    assert scanner.rows == 0
+    assert scanner.parse_errors == 1
+
+
+def test_file_of_exactly_max_rows_is_complete():
+    data = _csv(["n"] + [str(i) for i in range(100)])
+    result = _scan(data, FileScanner(CSV, max_rows=100))
+    assert result["complete"]
+    assert result["stopped_by"] is None
+
+    result = _scan(data, FileScanner(CSV, max_rows=99))
+    assert not result["complete"]
+    assert result["stopped_by"] == "max_rows"
+
+
+def test_jsonl_of_exactly_max_rows_is_complete():
+    data = b"".join(json.dumps({"i": i}).encode() + b"\n\n" for i in range(50))
+    result = _scan(data, FileScanner(JSONL, max_rows=50))
+    assert result["complete"]
+
+    result = _scan(data, FileScanner(JSONL, max_rows=49))
+    assert result["stopped_by"] == "max_rows"
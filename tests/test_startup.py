@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+# Packages that must only load once the first tool call needs a client
+DEFERRED_PACKAGES = ("azure", "aiohttp", "msal")
+
+# Budget for the cumulative import time of the server module, in microseconds.
+# Generous, so that it catches the SDK coming back rather than machine noise.
+IMPORT_TIME_BUDGET_US = 3_000_000
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def test_server_import_does_not_load_sdk():
+    result = _python(
+        "-c",
+        "import sys, adls2_mcp_server.server\n"
+        f"prefixes = {DEFERRED_PACKAGES!r}\n"
+        "print('\\n'.join(m for m in sys.modules if m.split('.')[0] in prefixes))",
+    )
+    assert result.stdout.split() == []
+
+
+def test_server_import_time_budget():
+    result = _python("-X", "importtime", "-c", "import adls2_mcp_server.server")
+    lines = [line for line in result.stderr.splitlines() if line.rstrip().endswith("| adls2_mcp_server.server")]
+    assert lines, result.stderr[-2000:]
+    cumulative = int(lines[-1].split("|")[1])
+    assert cumulative < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,196 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from adls2_mcp_server import sync as sync_module
+from adls2_mcp_server.listing import PathEntry
+from adls2_mcp_server.scheduler import TransferJob
+from adls2_mcp_server.sync import MANIFEST_NAME, SyncManifest, plan_sync
+from fake_adls import FakeADLS, serve
+
+
+class _RemoteMD5:
+    """Content-MD5 lookup for plan_sync that records the paths it is asked about."""
+
+    def __init__(self, digests):
+        self.digests = digests
+        self.asked = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, path):
+        self.asked.append(path)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.digests.get(path)
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Names of the local files plan_sync hashes."""
+    names = []
+    file_md5 = sync_module.file_md5
+
+    def counting(path):
+        names.append(path.name)
+        return file_md5(path)
+
+    monkeypatch.setattr(sync_module, "file_md5", counting)
+    return names
+
+
+def _pair(root, name, data, etag="e1"):
+    path = root / name
+    path.write_bytes(data)
+    job = TransferJob(local_path=path, remote_path=f"r/{name}", size=len(data))
+    return job, PathEntry(name=f"r/{name}", size=len(data), etag=etag)
+
+
+def _plan(root, pairs, manifest, remote_md5, max_concurrency=4):
+    jobs = [job for job, _ in pairs]
+    remote = {entry.name: entry for _, entry in pairs if entry is not None}
+    return asyncio.run(plan_sync(jobs, root, remote, manifest, remote_md5, max_concurrency))
+
+
+def test_manifest_match_skips_without_hashing_or_requests(tmp_path, hashed):
+    job, entry = _pair(tmp_path, "a", b"data")
+    manifest = SyncManifest(tmp_path / MANIFEST_NAME, "fs/r")
+    manifest.record("a", job.local_path.stat(), '"e1"')
+    remote_md5 = _RemoteMD5({})
+
+    pending, skipped = _plan(tmp_path, [(job, entry)], manifest, remote_md5)
+
+    assert (pending, skipped) == ([], 1)
+    assert remote_md5.asked == []
+    assert hashed == []
+
+
+def test_md5_comparison_decides_when_the_manifest_does_not_match(tmp_path, hashed):
+    same, same_entry = _pair(tmp_path, "same", b"data", etag="new")
+    other, other_entry = _pair(tmp_path, "other", b"data")
+    unset, unset_entry = _pair(tmp_path, "unset", b"data")
+    manifest = SyncManifest(tmp_path / MANIFEST_NAME, "fs/r")
+    manifest.record("same", same.local_path.stat(), "old")
+    digest = hashlib.md5(b"data").digest()
+    remote_md5 = _RemoteMD5({"r/same": digest, "r/other": hashlib.md5(b"diff").digest()})
+
+    pending, skipped = _plan(
+        tmp_path, [(same, same_entry), (other, other_entry), (unset, unset_entry)], manifest, remote_md5
+    )
+
+    assert pending == [other, unset]
+    assert skipped == 1
+    assert sorted(remote_md5.asked) == ["r/other", "r/same", "r/unset"]
+    # A remote file without Content-MD5 cannot match, so it is not hashed
+    assert sorted(hashed) == ["other", "same"]
+    assert manifest.files["same"].etag == "new"
+    assert manifest.files["same"].md5 == digest.hex()
+    assert "other" not in manifest.files
+
+
+def test_recorded_md5_of_unchanged_local_file_is_reused(tmp_path, hashed):
+    job, entry = _pair(tmp_path, "a", b"data", etag="rewritten")
+    manifest = SyncManifest(tmp_path / MANIFEST_NAME, "fs/r")
+    digest = hashlib.md5(b"data").digest()
+    manifest.record("a", job.local_path.stat(), "e1", digest)
+
+    pending, skipped = _plan(tmp_path, [(job, entry)], manifest, _RemoteMD5({"r/a": digest}))
+
+    assert (pending, skipped) == ([], 1)
+    assert hashed == []
+    assert manifest.files["a"].etag == "rewritten"
+
+
+def test_missing_or_resized_files_are_transferred_without_comparison(tmp_path, hashed):
+    resized, resized_entry = _pair(tmp_path, "resized", b"data")
+    resized_entry.size = 5
+    remote_only, remote_only_entry = _pair(tmp_path, "remote_only", b"data")
+    os.remove(remote_only.local_path)
+    local_only, _ = _pair(tmp_path, "local_only", b"data")
+    directory, directory_entry = _pair(tmp_path, "directory", b"")
+    directory_entry.is_directory = True
+    pairs = [(resized, resized_entry), (remote_only, remote_only_entry), (local_only, None), (directory, directory_entry)]
+    remote_md5 = _RemoteMD5({})
+
+    pending, skipped = _plan(tmp_path, pairs, SyncManifest(tmp_path / MANIFEST_NAME, "fs/r"), remote_md5)
+
+    assert pending == [job for job, _ in pairs]
+    assert skipped == 0
+    assert remote_md5.asked == []
+    assert hashed == []
+
+
+def test_comparisons_are_bounded_by_max_concurrency(tmp_path):
+    pairs = [_pair(tmp_path, f"f{index}", b"%d" % index) for index in range(10)]
+    remote_md5 = _RemoteMD5({})
+
+    _plan(tmp_path, pairs, SyncManifest(tmp_path / MANIFEST_NAME, "fs/r"), remote_md5, max_concurrency=3)
+
+    assert len(remote_md5.asked) == 10
+    assert remote_md5.peak == 3
+
+
+def test_manifest_round_trip_and_remote_mismatch(tmp_path):
+    (tmp_path / "a").write_bytes(b"data")
+    manifest = SyncManifest(tmp_path / MANIFEST_NAME, "fs/r")
+    manifest.record("a", (tmp_path / "a").stat(), '"e1"', b"\x01\x02")
+    manifest.record("b", (tmp_path / "a").stat(), "e2")
+    manifest.retain(["a"])
+    manifest.save()
+
+    loaded = SyncManifest.load(tmp_path / MANIFEST_NAME, "fs/r")
+    assert loaded.files == {"a": manifest.files["a"]}
+    assert loaded.files["a"].etag == "e1"
+    assert SyncManifest.load(tmp_path / MANIFEST_NAME, "fs/other").files == {}
+    (tmp_path / MANIFEST_NAME).write_text("{broken")
+    assert SyncManifest.load(tmp_path / MANIFEST_NAME, "fs/r").files == {}
+
+
+def test_upload_sync_skips_unchanged_files(make_client, tmp_path):
+    source = tmp_path / "uploads" / "src"
+    (source / "sub").mkdir(parents=True)
+    for name in ("a", "b", "sub/c"):
+        (source / name).write_bytes(name.encode() * 100)
+    fake = FakeADLS()
+    fake.filesystems["fs"] = {}
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            reports = [await client.upload_directory("src", "fs", "dest", sync=True)]
+            reports.append(await client.upload_directory("src", "fs", "dest", sync=True))
+            (source / "b").write_bytes(b"changed")
+            reports.append(await client.upload_directory("src", "fs", "dest", sync=True))
+            # Without the manifest, the Content-MD5 stored at upload decides
+            (source / MANIFEST_NAME).unlink()
+            reports.append(await client.upload_directory("src", "fs", "dest", sync=True))
+            return reports
+
+    reports = asyncio.run(main())
+    assert [(report.files_transferred, report.files_skipped) for report in reports] == [(3, 0), (0, 3), (1, 2), (0, 3)]
+    assert fake.filesystems["fs"]["dest/b"].data == b"changed"
+    assert (source / MANIFEST_NAME).exists()
+
+
+def test_download_sync_skips_unchanged_files(make_client, tmp_path):
+    fake = FakeADLS()
+    for name in ("a", "sub/b"):
+        fake.add_file("fs", f"src/{name}", name.encode() * 100)
+    target = tmp_path / "downloads" / "dest"
+
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            reports = [await client.download_directory("fs", "src", "dest", sync=True)]
+            reports.append(await client.download_directory("fs", "src", "dest", sync=True))
+            node = fake.filesystems["fs"]["src/a"]
+            node.data = b"A" * 100
+            node.touch()
+            reports.append(await client.download_directory("fs", "src", "dest", sync=True))
+            return reports
+
+    reports = asyncio.run(main())
+    assert [(report.files_transferred, report.files_skipped) for report in reports] == [(2, 0), (0, 2), (1, 1)]
+    assert (target / "a").read_bytes() == b"A" * 100
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from azure.core.pipeline import AsyncPipeline
+from azure.core.pipeline.transport import AsyncHttpTransport, HttpRequest
+
+from adls2_mcp_server.throttle import AdaptiveConcurrency, RequestStats, ThrottledTransport, ThrottlingRetryPolicy
+
+
+class _Response:
+    def __init__(self, request, status_code, headers=None):
+        self.request = request
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _StubTransport(AsyncHttpTransport):
+    """Answers with the given (status, headers) pairs in turn, noting when each request arrived."""
+
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self.sent_at = []
+
+    async def send(self, request, **kwargs):
+        self.sent_at.append(time.monotonic())
+        status, headers = self._responses.pop(0)
+        return _Response(request, status, headers)
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def _send(stub, stats, backoff=30.0):
+    transport = ThrottledTransport(stub, AdaptiveConcurrency(8), stats)
+    pipeline = AsyncPipeline(transport, [ThrottlingRetryPolicy(stats, retry_total=3, backoff=backoff)])
+
+    async def main():
+        response = await pipeline.run(HttpRequest("GET", "https://fake.dfs.core.windows.net/fs/f"))
+        return response.http_response.status_code
+
+    return asyncio.run(main())
+
+
+def test_429_is_retried_after_retry_after():
+    stats = RequestStats()
+    stub = _StubTransport((429, {"Retry-After": "0.3"}), (200, {}))
+    assert _send(stub, stats) == 200
+    assert len(stub.sent_at) == 2
+    assert 0.3 <= stub.sent_at[1] - stub.sent_at[0] < 2
+    assert stats.requests == 2
+    assert stats.throttled == 1
+    assert stats.retries == 1
+    assert stats.retries_exhausted == 0
+
+
+def test_503_retry_after_ms_is_honoured():
+    stats = RequestStats()
+    stub = _StubTransport((503, {"x-ms-retry-after-ms": "200"}), (200, {}))
+    assert _send(stub, stats) == 200
+    assert 0.2 <= stub.sent_at[1] - stub.sent_at[0] < 2
+    assert stats.throttled == 1
+    assert stats.retries == 1
+
+
+def test_other_4xx_is_final():
+    stats = RequestStats()
+    stub = _StubTransport((409, {}), (200, {}))
+    assert _send(stub, stats) == 409
+    assert len(stub.sent_at) == 1
+    assert stats.retries == 0
+
+
+def test_429_gives_up_after_retry_total():
+    stats = RequestStats()
+    stub = _StubTransport(*[(429, {"Retry-After": "0"})] * 4)
+    assert _send(stub, stats, backoff=0.01) == 429
+    assert stats.throttled == 4
+    assert stats.retries == 3
+    assert stats.retries_exhausted == 1
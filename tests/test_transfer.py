@@ -0,0 +1,316 @@
+import asyncio
+import base64
+import hashlib
+import os
+import time
+
+import pytest
+from aiohttp import web
+
+from adls2_mcp_server.transfer import MAX_CHUNK_SIZE, TransferJournal, TransferLimiter, resolve_transfer_options
+from fake_adls import FakeADLS, serve
+
+
+def _upload(make_client, fake, name, **options):
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            return await client.upload_file(name, "fs", f"dest/{name}", **options)
+
+    return asyncio.run(main())
+
+
+def test_upload_appends_chunks_in_parallel_and_commits_once(make_client, tmp_path):
+    data = os.urandom(10_500)
+    (tmp_path / "uploads" / "f.bin").write_bytes(data)
+    fake = FakeADLS(latency=0.02)
+
+    result = _upload(make_client, fake, "f.bin", chunk_size=1000, max_concurrency=3)
+
+    node = fake.filesystems["fs"]["dest/f.bin"]
+    assert result.size == len(data)
+    assert result.etag == node.etag
+    assert node.data == data
+    assert fake.peak == 3
+    # create, 11 appends and the flush
+    assert fake.requests == 13
+    assert node.headers["Content-MD5"] == base64.b64encode(hashlib.md5(data).digest()).decode()
+    assert not list((tmp_path / "uploads").glob("*.adls2-journal"))
+
+
+def test_upload_of_empty_file(make_client, tmp_path):
+    (tmp_path / "uploads" / "empty").write_bytes(b"")
+    fake = FakeADLS()
+
+    result = _upload(make_client, fake, "empty", chunk_size=1000)
+
+    assert result.size == 0
+    assert fake.filesystems["fs"]["dest/empty"].data == b""
+
+
+def test_failed_append_fails_the_upload(make_client, tmp_path):
+    (tmp_path / "uploads" / "f.bin").write_bytes(os.urandom(5000))
+    fake = FakeADLS()
+    fake.filesystems["fs"] = {}
+
+    async def main():
+        async with serve(fake) as url, make_client(url, retry_total=0) as client:
+            fake.fail["PATCH"] = 1
+            return await client.upload_file("f.bin", "fs", "dest/f.bin", chunk_size=1000)
+
+    assert asyncio.run(main()) is None
+    assert fake.filesystems["fs"]["dest/f.bin"].data == b""
+
+
+@pytest.mark.parametrize("chunk_size, max_concurrency", [(0, 0), (None, None)])
+def test_transfer_options_default(chunk_size, max_concurrency):
+    assert resolve_transfer_options(chunk_size, max_concurrency) == (8 * 1024 * 1024, 4)
+
+
+@pytest.mark.parametrize("chunk_size, max_concurrency", [(-1, 1), (MAX_CHUNK_SIZE + 1, 1), (1, -1)])
+def test_transfer_options_out_of_range(chunk_size, max_concurrency):
+    with pytest.raises(ValueError):
+        resolve_transfer_options(chunk_size, max_concurrency)
+
+
+def _download(make_client, fake, source, name, **options):
+    async def main():
+        async with serve(fake) as url, make_client(url) as client:
+            return await client.download_file("fs", source, name, **options)
+
+    return asyncio.run(main())
+
+
+def test_download_fetches_ranges_in_parallel(make_client, tmp_path):
+    data = os.urandom(10_500)
+    fake = FakeADLS(latency=0.02)
+    node = fake.add_file("fs", "src/f.bin", data)
+
+    result = _download(make_client, fake, "src/f.bin", "f.bin", chunk_size=1000, max_concurrency=3)
+
+    assert result.size == len(data)
+    assert result.etag == node.etag
+    assert (tmp_path / "downloads" / "f.bin").read_bytes() == data
+    assert fake.peak == 3
+    # properties, then 11 ranged reads
+    assert fake.requests == 12
+    assert sorted(path.name for path in (tmp_path / "downloads").iterdir()) == ["f.bin"]
+
+
+def test_download_of_file_modified_midway_fails(make_client, tmp_path):
+    fake = FakeADLS()
+    node = fake.add_file("fs", "src/f.bin", os.urandom(5000))
+    get = fake._get
+
+    def get_then_modify(request, current):
+        response = get(request, current)
+        node.touch()
+        return response
+
+    fake._get = get_then_modify
+    assert _download(make_client, fake, "src/f.bin", "f.bin", chunk_size=1000, max_concurrency=1) is None
+    assert not (tmp_path / "downloads" / "f.bin").exists()
+
+
+def test_download_of_missing_file_fails(make_client, tmp_path):
+    assert _download(make_client, FakeADLS(), "src/missing", "f.bin") is None
+    assert not list((tmp_path / "downloads").iterdir())
+
+
+class _Interrupter:
+    """Records the appends or ranged reads sent to the fake, failing those past the first limit."""
+
+    def __init__(self, fake, kind, limit=None):
+        self.kind = kind
+        self.limit = limit
+        self.seen = []
+        fake.intercept = self
+
+    def __call__(self, request):
+        if self.kind == "append" and request.query.get("action") == "append":
+            self.seen.append(int(request.query["position"]))
+        elif self.kind == "read" and "x-ms-range" in request.headers:
+            self.seen.append(request.headers["x-ms-range"])
+        else:
+            return None
+        if self.limit is not None and len(self.seen) > self.limit:
+            return web.Response(status=503)
+        return None
+
+
+def _transfer_twice(make_client, fake, transfer, between):
+    """Run a transfer that is interrupted, then again after calling between."""
+    async def main():
+        async with serve(fake) as url, make_client(url, retry_total=0) as client:
+            assert await transfer(client) is None
+            between()
+            return await transfer(client)
+
+    return asyncio.run(main())
+
+
+def _upload_chunks(client):
+    return client.upload_file("f.bin", "fs", "dest/f.bin", chunk_size=1000, max_concurrency=1)
+
+
+def _download_chunks(client):
+    return client.download_file("fs", "src/f.bin", "f.bin", chunk_size=1000, max_concurrency=1)
+
+
+@pytest.mark.parametrize("modified", [False, True])
+def test_interrupted_upload_resumes_unless_destination_changed(make_client, tmp_path, modified):
+    data = os.urandom(10_000)
+    (tmp_path / "uploads" / "f.bin").write_bytes(data)
+    fake = FakeADLS()
+    _Interrupter(fake, "append", limit=4)
+    resumed = []
+
+    def between():
+        assert (tmp_path / "uploads" / "f.bin.adls2-journal").exists()
+        if modified:
+            fake.filesystems["fs"]["dest/f.bin"].touch()
+        resumed.append(_Interrupter(fake, "append"))
+
+    result = _transfer_twice(make_client, fake, _upload_chunks, between)
+    assert result.size == len(data)
+    assert fake.filesystems["fs"]["dest/f.bin"].data == data
+    assert resumed[0].seen == list(range(0 if modified else 4000, 10_000, 1000))
+    assert not (tmp_path / "uploads" / "f.bin.adls2-journal").exists()
+
+
+@pytest.mark.parametrize("modified", [False, True])
+def test_interrupted_download_resumes_unless_source_changed(make_client, tmp_path, modified):
+    fake = FakeADLS()
+    node = fake.add_file("fs", "src/f.bin", os.urandom(10_000))
+    _Interrupter(fake, "read", limit=4)
+    resumed = []
+
+    def between():
+        assert (tmp_path / "downloads" / "f.bin.partial").exists()
+        if modified:
+            node.data = os.urandom(10_000)
+            node.touch()
+        resumed.append(_Interrupter(fake, "read"))
+
+    result = _transfer_twice(make_client, fake, _download_chunks, between)
+    assert result.size == 10_000
+    assert (tmp_path / "downloads" / "f.bin").read_bytes() == node.data
+    first = 0 if modified else 4000
+    assert resumed[0].seen == [f"bytes={offset}-{offset + 999}" for offset in range(first, 10_000, 1000)]
+    assert sorted(path.name for path in (tmp_path / "downloads").iterdir()) == ["f.bin"]
+
+
+def test_journal_merges_completed_ranges_and_survives_reload(tmp_path):
+    journal = TransferJournal(tmp_path / "j", "src", "dest", "etag", 10_000, 1000)
+    for index in (0, 1, 5, 3, 2, 7):
+        journal.mark_done(index)
+    journal.save()
+
+    loaded = TransferJournal.load(tmp_path / "j")
+    assert loaded.completed == [[0, 4], [5, 6], [7, 8]]
+    assert [index for index in range(10) if loaded.is_done(index)] == [0, 1, 2, 3, 5, 7]
+    assert loaded.matches("src", "dest", "etag", 10_000, 1000)
+    assert not loaded.matches("src", "dest", "changed", 10_000, 1000)
+    assert not loaded.matches("src", "dest", "etag", 10_000, 2000)
+
+
+def test_unreadable_journal_is_ignored(tmp_path):
+    (tmp_path / "j").write_text("{not json")
+    assert TransferJournal.load(tmp_path / "j") is None
+    assert TransferJournal.load(tmp_path / "missing") is None
+
+
+def test_limiter_admits_reservations_in_order_within_the_cap():
+    async def main():
+        limiter = TransferLimiter(100)
+        admitted = []
+
+        async def reserve(name, nbytes):
+            await limiter.acquire(nbytes)
+            admitted.append(name)
+
+        await reserve("first", 60)
+        waiting = [asyncio.create_task(reserve(name, nbytes)) for name, nbytes in (("second", 60), ("small", 30))]
+        await asyncio.sleep(0.01)
+        # The small reservation would fit, but waits behind the one before it
+        assert admitted == ["first"]
+        limiter.release(60)
+        await asyncio.gather(*waiting)
+        return admitted, limiter.in_flight
+
+    assert asyncio.run(main()) == (["first", "second", "small"], 90)
+
+
+def test_limiter_admits_an_oversized_reservation_on_its_own():
+    async def main():
+        limiter = TransferLimiter(100)
+        await limiter.acquire(500)
+        later = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0.01)
+        assert not later.done()
+        limiter.release(500)
+        await later
+        return limiter.in_flight
+
+    assert asyncio.run(main()) == 1
+
+
+def test_cancelled_reservation_gives_way_to_the_next():
+    async def main():
+        limiter = TransferLimiter(100)
+        await limiter.acquire(100)
+        cancelled = asyncio.create_task(limiter.acquire(80))
+        after = asyncio.create_task(limiter.acquire(20))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        limiter.release(100)
+        await after
+        return cancelled.cancelled(), limiter.in_flight
+
+    assert asyncio.run(main()) == (True, 20)
+
+
+def test_cancelled_head_of_the_queue_lets_smaller_reservations_through():
+    async def main():
+        limiter = TransferLimiter(100)
+        await limiter.acquire(50)
+        blocked = asyncio.create_task(limiter.acquire(80))
+        behind = asyncio.create_task(limiter.acquire(20))
+        await asyncio.sleep(0.01)
+        assert not behind.done()
+        blocked.cancel()
+        await behind
+        return limiter.in_flight
+
+    assert asyncio.run(main()) == 70
+
+
+def test_limiter_paces_reservations_to_the_bandwidth_cap():
+    async def main():
+        limiter = TransferLimiter(10 ** 9, max_bandwidth=1_000_000)
+        started = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire(20_000)
+            limiter.release(20_000)
+        return time.monotonic() - started
+
+    # The first reservation goes at once, each next one 20 ms after it
+    assert 0.075 <= asyncio.run(main()) < 0.5
+
+
+def test_upload_chunks_in_flight_are_capped_by_the_limiter(make_client, tmp_path):
+    data = os.urandom(10_000)
+    (tmp_path / "uploads" / "f.bin").write_bytes(data)
+    fake = FakeADLS(latency=0.02)
+
+    result = _upload(make_client, fake, "f.bin", chunk_size=1000, max_concurrency=8)
+    assert result.size == len(data)
+    assert fake.peak == 8
+
+    fake = FakeADLS(latency=0.02)
+    async def main():
+        async with serve(fake) as url, make_client(url, transfer_max_inflight_bytes=2000) as client:
+            return await client.upload_file("f.bin", "fs", "dest/f.bin", chunk_size=1000, max_concurrency=8)
+
+    assert asyncio.run(main()).size == len(data)
+    assert fake.filesystems["fs"]["dest/f.bin"].data == data
+    assert fake.peak == 2
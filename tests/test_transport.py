@@ -0,0 +1,67 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from azure.core.pipeline.transport import HttpRequest
+
+from adls2_mcp_server.transport import PooledAioHttpTransport, SharedTransport
+
+
+async def _serve(peers):
+    async def handle(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.Response(body=b"ok")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+def test_pooled_transport_opens_tuned_session_and_reuses_connections():
+    # PooledAioHttpTransport builds the session the way AioHttpTransport.open
+    # does, through azure-core private attributes; this fails if they change.
+    peers = set()
+
+    async def main():
+        runner, url = await _serve(peers)
+        transport = PooledAioHttpTransport(pool_size=7, pool_size_per_host=3, keepalive_timeout=12.5)
+        try:
+            await transport.open()
+            session = transport.session
+            assert isinstance(session, aiohttp.ClientSession)
+            assert session.connector.limit == 7
+            assert session.connector.limit_per_host == 3
+            assert session.connector._keepalive_timeout == 12.5
+            assert isinstance(session.cookie_jar, aiohttp.DummyCookieJar)
+            assert not session.auto_decompress
+
+            for index in range(5):
+                response = await transport.send(HttpRequest("GET", f"{url}/f{index}"))
+                assert response.status_code == 200
+                assert response.body() == b"ok"
+
+            await transport.open()
+            assert transport.session is session
+        finally:
+            await transport.close()
+            await runner.cleanup()
+        assert transport.session is None
+        assert session.closed
+
+    asyncio.run(main())
+    assert len(peers) == 1
+
+
+def test_shared_transport_leaves_the_pool_open():
+    async def main():
+        transport = PooledAioHttpTransport()
+        async with SharedTransport(transport):
+            pass
+        assert not transport.session.closed
+        await transport.close()
+
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from adls2_mcp_server.listing import PathEntry, PathFilter, PathListing, walk_tree
+
+MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _FakeFileSystem:
+    """FileSystemClient stand-in listing a synthetic year/month/day tree in pre-order."""
+
+    def __init__(self):
+        self.children = {}
+        self.listings = 0
+        self.in_flight = 0
+        self.peak = 0
+        for year in ("2023", "2024"):
+            self._add("raw", f"raw/{year}", True)
+            for month in range(1, 5):
+                month_path = f"raw/{year}/{month:02}"
+                self._add(f"raw/{year}", month_path, True)
+                for day in range(1, 4):
+                    day_path = f"{month_path}/{day:02}"
+                    self._add(month_path, day_path, True)
+                    for part in range(3):
+                        self._add(day_path, f"{day_path}/part-{part}.csv", False, size=100 * part)
+                self._add(month_path, f"{month_path}/_SUCCESS", False)
+        self._add("raw", "raw/README.md", False, size=7)
+
+    def _add(self, parent, name, is_directory, size=0):
+        self.children.setdefault(parent, []).append(
+            SimpleNamespace(
+                name=name, is_directory=is_directory, content_length=size, last_modified=MODIFIED, etag=f"0x{len(name)}"
+            )
+        )
+
+    def _preorder(self, path):
+        for child in self.children.get(path, []):
+            yield child
+            if child.is_directory:
+                yield from self._preorder(child.name)
+
+    async def get_paths(self, path=None, recursive=True):
+        self.listings += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            for child in list(self._preorder(path) if recursive else self.children.get(path, [])):
+                yield child
+        finally:
+            self.in_flight -= 1
+
+
+async def _serial(fake, directory, path_filter=None):
+    return [
+        child.name
+        async for child in fake.get_paths(path=directory, recursive=True)
+        if path_filter is None or path_filter.matches(PathEntry.from_properties(child))
+    ]
+
+
+@pytest.mark.parametrize("max_concurrency, fanout_depth", [(1, 1), (2, 2), (8, 2), (8, 3), (64, 5)])
+def test_matches_serial_listing_in_order(max_concurrency, fanout_depth):
+    fake = _FakeFileSystem()
+
+    async def main():
+        walked = await walk_tree(fake, "raw", max_concurrency, fanout_depth)
+        return [entry.name for entry in walked], await _serial(fake, "raw")
+
+    walked, serial = asyncio.run(main())
+    assert len(serial) == 115
+    assert walked == serial
+
+
+def test_fan_out_is_bounded():
+    fake = _FakeFileSystem()
+    entries = asyncio.run(walk_tree(fake, "raw", max_concurrency=3, fanout_depth=2))
+    assert len(entries) == 115
+    assert fake.listings == 1 + 2 + 8
+    assert fake.peak <= 3
+
+
+def test_path_filter_still_walks_filtered_directories():
+    fake = _FakeFileSystem()
+    path_filter = PathFilter(pattern="part-*.csv", min_size=100)
+
+    async def main():
+        walked = await walk_tree(fake, "raw/", 4, 2, path_filter=path_filter)
+        return [entry.name for entry in walked], await _serial(fake, "raw", path_filter)
+
+    walked, serial = asyncio.run(main())
+    assert len(walked) == 2 * 4 * 3 * 2
+    assert walked == serial
+    assert all(name.endswith(("part-1.csv", "part-2.csv")) for name in walked)
+
+
+def test_columns_align_with_paths():
+    fake = _FakeFileSystem()
+    listing = PathListing(entries=asyncio.run(walk_tree(fake, "raw/2023/01")))
+    columns = listing.columns()
+    assert listing.paths[:2] == ["raw/2023/01/01", "raw/2023/01/01/part-0.csv"]
+    assert set(columns) == {"is_directory", "size", "last_modified", "etag"}
+    assert all(len(column) == len(listing.paths) for column in columns.values())
+    assert columns["is_directory"][:3] == [True, False, False]
+    assert columns["size"][:4] == [0, 0, 100, 200]
+    assert columns["last_modified"][0] == MODIFIED.isoformat()
+    assert columns["etag"][1] == f"0x{len('raw/2023/01/01/part-0.csv')}"